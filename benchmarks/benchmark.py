@@ -0,0 +1,374 @@
+"""
+Pomiary wydajności algorytmów z repozytorium.
+
+Dla każdego algorytmu mierzony jest czas działania dla kilku rozmiarów danych wejściowych i kilku rozkładów danych
+(uniform - jednostajny, clustered - skupiska, degenerate - przypadki zdegenerowane, np. punkty współliniowe).
+Na podstawie pomiarów wyznaczany jest empiryczny wykładnik złożoności k (czas ~ n**k). Wyniki są zapisywane w formacie
+JSON, a po podaniu wyników bazowych (--baseline) skrypt kończy się błędem, jeśli któryś z czasów wzrósł o więcej
+niż --threshold albo któregoś pomiaru nie da się porównać z wynikami bazowymi.
+
+Przykład:
+    python benchmarks/benchmark.py --output wyniki.json
+    python benchmarks/benchmark.py --baseline wyniki.json --threshold 0.25
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ('closest_pair_of_points', 'kd_tree', 'interval_tree', 'traveling-salesman', 'vertex-cover',
+                  'triangulation'):
+    sys.path.insert(0, os.path.join(REPOSITORY_ROOT, directory))
+
+import closest_pair_of_points  # noqa: E402
+import interval_tree  # noqa: E402
+import kd_tree  # noqa: E402
+import traveling_salesman  # noqa: E402
+import triangulation  # noqa: E402
+import vertex_cover  # noqa: E402
+
+DISTRIBUTIONS = ('uniform', 'clustered', 'degenerate')
+# Pomiary krótsze niż MIN_COMPARED_TIME [s] są zbyt zaszumione, by porównywać je z wynikami bazowymi, dlatego
+# szybkie funkcje są wywoływane w pętli tyle razy, by jeden mierzony blok wywołań trwał co najmniej tyle
+MIN_COMPARED_TIME = 0.02
+# Regresją jest wzrost czasu o więcej niż threshold i jednocześnie wzrost czasu bloku wywołań o więcej niż
+# MIN_SLOWDOWN [s]
+MIN_SLOWDOWN = 0.005
+# Liczba ponownych pomiarów potwierdzających regresję
+CONFIRM_ROUNDS = 3
+
+
+class Benchmark:
+    def __init__(self, name: str, sizes: list, make_input, run):
+        """
+        :param name: Nazwa pomiaru
+        :param sizes: Rozmiary danych wejściowych
+        :param make_input: Funkcja (n, rozkład, generator liczb losowych) -> dane wejściowe
+        :param run: Mierzona funkcja, wywoływana z danymi wejściowymi
+        """
+        self.name = name
+        self.sizes = sizes
+        self.make_input = make_input
+        self.run = run
+
+
+def generate_points(n: int, distribution: str, rng) -> np.ndarray:
+    """
+    :return: Tablica (n, 2) współrzędnych całkowitych z przedziału [0, 10**6]
+    """
+    if distribution == 'uniform':
+        points = rng.integers(0, 10 ** 6, size=(n, 2))
+    elif distribution == 'clustered':
+        centers = rng.integers(0, 10 ** 6, size=(max(n // 100, 1), 2))
+        points = centers[rng.integers(0, len(centers), size=n)] + rng.normal(0, 1000, size=(n, 2)).astype(int)
+    elif distribution == 'degenerate':
+        xs = rng.integers(0, 10 ** 6 // 2, size=n)
+        points = np.stack([xs, 2 * xs], axis=1)
+    else:
+        raise ValueError(f'Nieznany rozkład: {distribution}')
+    return np.clip(points, 0, 10 ** 6)
+
+
+def point_list(n: int, distribution: str, rng) -> list:
+    return [tuple(p) for p in generate_points(n, distribution, rng).tolist()]
+
+
+def make_query_areas(n: int, distribution: str, rng):
+    points = point_list(n, distribution, rng)
+    corners = generate_points(100, distribution, rng)
+    areas = [kd_tree.Area(x_min=x, x_max=x + 10 ** 5, y_min=y, y_max=y + 10 ** 5) for x, y in corners.tolist()]
+    return kd_tree.kdtree(*kd_tree.sort_points_by_axes(points)), areas
+
+
+def make_intervals(n: int, distribution: str, rng):
+    points = generate_points(n, distribution, rng)
+    # Przypadek zdegenerowany - wszystkie przedziały zawierają wspólny punkt
+    if distribution == 'degenerate':
+        intervals = [(x // 2, 10 ** 6 - y // 4) for x, y in points.tolist()]
+    else:
+        intervals = [(x, x + y // 100) for x, y in points.tolist()]
+    queries = generate_points(100, distribution, rng)[:, 0].tolist()
+    return intervals, queries
+
+
+def build_interval_tree(data):
+    intervals, _ = data
+    return interval_tree.create_interval_tree(*interval_tree.sort_points_by_axes(intervals))
+
+
+def make_interval_queries(n: int, distribution: str, rng):
+    data = make_intervals(n, distribution, rng)
+    return build_interval_tree(data), data[1]
+
+
+def run_interval_queries(data):
+    root, queries = data
+    for query_point in queries:
+        interval_tree.query_internal_tree(root, query_point)
+
+
+def make_tsp_graph(n: int, distribution: str, rng):
+    points = generate_points(n, distribution, rng)
+    differences = points[:, None, :] - points[None, :, :]
+    distances = np.rint(np.hypot(differences[..., 0], differences[..., 1])).astype(int)
+    return traveling_salesman.Graph(set(range(n)), distances.tolist())
+
+
+def make_vertex_cover_graph(n: int, distribution: str, rng):
+    if distribution == 'uniform':
+        edges = rng.integers(0, n, size=(2 * n, 2))
+    elif distribution == 'clustered':
+        clusters = rng.integers(0, max(n // 20, 1), size=2 * n)
+        edges = clusters[:, None] * 20 + rng.integers(0, 20, size=(2 * n, 2))
+    else:
+        # Graf zdegenerowany - gwiazda
+        edges = np.stack([np.zeros(2 * n, dtype=int), rng.integers(1, n, size=2 * n)], axis=1)
+    edges = [tuple(e) for e in edges.tolist() if e[0] != e[1]]
+    return vertex_cover.Graph(edges=edges)
+
+
+def make_monotone_polygon(n: int, distribution: str, rng):
+    xs = np.unique(generate_points(2 * n, distribution, rng)[:, 0])[:n].tolist()
+    heights = rng.integers(1, 10 ** 4, size=len(xs))
+    if distribution == 'degenerate':
+        # Wierzchołki prawie współliniowe
+        heights = np.ones(len(xs), dtype=int)
+    upper_chain, lower_chain = set(), {triangulation.Point(xs[0], 0), triangulation.Point(xs[-1], 0)}
+    for x, height, is_upper in zip(xs[1:-1], heights.tolist(), rng.random(len(xs)) < 0.5):
+        if is_upper:
+            upper_chain.add(triangulation.Point(x, height))
+        else:
+            lower_chain.add(triangulation.Point(x, -height))
+    return triangulation.Polygon(upper_chain, lower_chain)
+
+
+BENCHMARKS = [
+    Benchmark('find_closest_points', [1000, 2000, 4000, 8000],
+              point_list, lambda points: closest_pair_of_points.find_closest_points(
+                  closest_pair_of_points.sort_points_by_axes(points))),
+    Benchmark('find_closest_points_naive', [100, 200, 400, 800],
+              point_list, closest_pair_of_points.find_closest_points_naive),
+    Benchmark('kdtree_build', [1000, 2000, 4000, 8000],
+              point_list, lambda points: kd_tree.kdtree(*kd_tree.sort_points_by_axes(points))),
+    Benchmark('query_kdtree', [1000, 2000, 4000, 8000],
+              make_query_areas, lambda data: [kd_tree.query_kdtree(data[0], area) for area in data[1]]),
+    Benchmark('interval_tree_build', [1000, 2000, 4000, 8000],
+              make_intervals, build_interval_tree),
+    Benchmark('interval_tree_query', [1000, 2000, 4000, 8000],
+              make_interval_queries, run_interval_queries),
+    Benchmark('traveling_salesman', [5, 6, 7, 8],
+              make_tsp_graph, traveling_salesman.traveling_salesman),
+    Benchmark('approx_vertex_cover', [100, 200, 400, 800],
+              make_vertex_cover_graph, vertex_cover.approx_vertex_cover),
+    Benchmark('linear_vertex_cover', [1000, 2000, 4000, 8000],
+              make_vertex_cover_graph, vertex_cover.linear_vertex_cover),
+    Benchmark('triangulate_polygon', [1000, 2000, 4000, 8000],
+              make_monotone_polygon, triangulation.triangulate_polygon),
+]
+
+
+def _time_loops(benchmark: Benchmark, data, loops: int, seed: int) -> float:
+    # Część algorytmów korzysta z modułu random
+    random.seed(seed)
+    # Jak w module timeit - odśmiecanie zależne od śmieci pozostawionych przez wcześniejsze pomiary nie zaburza czasu
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            benchmark.run(data)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def measure(benchmark: Benchmark, size: int, distribution: str, repeat: int, seed: int) -> tuple:
+    """
+    Liczba wywołań w bloku jest dobierana tak, by blok trwał co najmniej 2 * MIN_COMPARED_TIME.
+    :return: Krotka (najkrótszy z repeat czasów bloku wywołań podzielony przez liczbę wywołań [s], liczba wywołań
+             w bloku)
+    """
+    rng = np.random.default_rng(seed)
+    data = benchmark.make_input(size, distribution, rng)
+    loops = 1
+    while True:
+        seconds = _time_loops(benchmark, data, loops, seed)
+        if seconds >= 2 * MIN_COMPARED_TIME:
+            break
+        # Zapas 1.5 na zakłócenia pomiaru, który wyznacza liczbę wywołań
+        loops = max(2 * loops, math.ceil(1.5 * loops * 2 * MIN_COMPARED_TIME / max(seconds, 1e-7)))
+    times = [_time_loops(benchmark, data, loops, seed) for _ in range(repeat)]
+    return min(times) / loops, loops
+
+
+def fit_exponent(sizes: list, times: list) -> float:
+    """
+    Empiryczny wykładnik złożoności - współczynnik kierunkowy prostej dopasowanej do punktów (log n, log t).
+    """
+    if len(sizes) < 2 or min(times) <= 0:
+        return math.nan
+    return float(np.polyfit(np.log(sizes), np.log(times), 1)[0])
+
+
+def run_benchmarks(names: list, distributions: list, scale: float, repeat: int, seed: int) -> dict:
+    results, exponents = [], {}
+    for benchmark in (b for b in BENCHMARKS if b.name in names):
+        for distribution in distributions:
+            sizes = [max(int(size * scale), 2) for size in benchmark.sizes]
+            if benchmark.name == 'traveling_salesman':
+                # Złożoność wykładnicza - rozmiarów nie skalujemy
+                sizes = benchmark.sizes
+            times = []
+            for size in sizes:
+                seconds, loops = measure(benchmark, size, distribution, repeat, seed)
+                times.append(seconds)
+                results.append({'benchmark': benchmark.name, 'distribution': distribution, 'size': size,
+                                'seconds': seconds, 'loops': loops})
+                print(f'{benchmark.name:28} {distribution:11} n={size:<8} {seconds:.6f} s (x{loops})',
+                      file=sys.stderr)
+            exponents[f'{benchmark.name}/{distribution}'] = fit_exponent(sizes, times)
+
+    return {
+        'meta': {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+                 'repeat': repeat, 'seed': seed, 'scale': scale},
+        'results': results,
+        'exponents': exponents,
+    }
+
+
+def _compared_baseline_times(results: dict, baseline: dict) -> dict:
+    """
+    :return: Słownik (pomiar, rozkład, rozmiar) -> czas bazowy dla pomiarów porównywanych z wynikami bazowymi -
+             tych, których blok wywołań trwał w wynikach bazowych co najmniej MIN_COMPARED_TIME (wyniki bazowe
+             zapisane przed wprowadzeniem bloków wywołań nie zawierają liczby wywołań)
+    """
+    baseline_results = {(r['benchmark'], r['distribution'], r['size']): r for r in baseline['results']}
+    compared = {}
+    for result in results['results']:
+        key = (result['benchmark'], result['distribution'], result['size'])
+        baseline_result = baseline_results.get(key)
+        if baseline_result and baseline_result['seconds'] * baseline_result.get('loops', 1) >= MIN_COMPARED_TIME:
+            compared[key] = baseline_result['seconds']
+    return compared
+
+
+def uncompared_groups(results: dict, baseline: dict) -> list:
+    """
+    :return: Lista par (pomiar, rozkład), dla których żaden rozmiar nie jest porównywany z wynikami bazowymi -
+             regresja takiego pomiaru nie mogłaby zostać wykryta
+    """
+    compared = {(benchmark_name, distribution) for benchmark_name, distribution, _ in
+                _compared_baseline_times(results, baseline)}
+    groups = dict.fromkeys((result['benchmark'], result['distribution']) for result in results['results'])
+    return [group for group in groups if group not in compared]
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    :return: Lista pomiarów, których czas przekracza czas bazowy o więcej niż threshold (np. 0.25 - o 25%),
+             a czas bloku wywołań wzrósł o więcej niż MIN_SLOWDOWN
+    """
+    baseline_times = _compared_baseline_times(results, baseline)
+    regressions = []
+    for result in results['results']:
+        baseline_time = baseline_times.get((result['benchmark'], result['distribution'], result['size']))
+        if baseline_time is None:
+            continue
+        slowdown = (result['seconds'] - baseline_time) * result.get('loops', 1)
+        if result['seconds'] > baseline_time * (1 + threshold) and slowdown > MIN_SLOWDOWN:
+            regressions.append(dict(result, baseline_seconds=baseline_time))
+    return regressions
+
+
+def persistent_regressions(regressions: list, results: dict, baseline: dict) -> list:
+    """
+    :return: Regresje pomiarów i rozkładów, dla których spowolnienie wystąpiło dla co najmniej dwóch porównywanych
+             rozmiarów (lub dla jedynego porównywanego rozmiaru)
+    """
+    compared, regressed = {}, {}
+    for benchmark_name, distribution, _ in _compared_baseline_times(results, baseline):
+        compared[benchmark_name, distribution] = compared.get((benchmark_name, distribution), 0) + 1
+    for regression in regressions:
+        group = (regression['benchmark'], regression['distribution'])
+        regressed[group] = regressed.get(group, 0) + 1
+    return [regression for regression in regressions
+            if regressed[regression['benchmark'], regression['distribution']] >=
+            min(2, compared[regression['benchmark'], regression['distribution']])]
+
+
+def confirm_regressions(regressions: list, threshold: float, repeat: int, seed: int) -> list:
+    """
+    Ponowne pomiary (CONFIRM_ROUNDS razy, z dwukrotnie większą liczbą powtórzeń) pomiarów uznanych za regresje.
+    Czasem pomiaru staje się najkrótszy ze wszystkich czasów, więc pozostają tylko te regresje, dla których
+    spowolnienie powtórzyło się w każdym pomiarze - pojedyncze zakłócenia nie powodują błędu.
+    """
+    benchmarks = {benchmark.name: benchmark for benchmark in BENCHMARKS}
+    confirmed = []
+    for regression in regressions:
+        seconds, loops = regression['seconds'], regression.get('loops', 1)
+        baseline_time = regression['baseline_seconds']
+        for _ in range(CONFIRM_ROUNDS):
+            if seconds <= baseline_time * (1 + threshold) or (seconds - baseline_time) * loops <= MIN_SLOWDOWN:
+                break
+            seconds = min(seconds, measure(benchmarks[regression['benchmark']], regression['size'],
+                                           regression['distribution'], 2 * repeat, seed)[0])
+        if seconds > baseline_time * (1 + threshold) and (seconds - baseline_time) * loops > MIN_SLOWDOWN:
+            confirmed.append(dict(regression, seconds=seconds))
+    return confirmed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Pomiary wydajności algorytmów z repozytorium.')
+    parser.add_argument('--benchmarks', nargs='+', choices=[b.name for b in BENCHMARKS],
+                        default=[b.name for b in BENCHMARKS], help='Wykonywane pomiary (domyślnie wszystkie)')
+    parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS),
+                        help='Rozkłady danych wejściowych (domyślnie wszystkie)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Mnożnik rozmiarów danych wejściowych')
+    parser.add_argument('--repeat', type=int, default=3, help='Liczba powtórzeń pomiaru (wynik to najkrótszy czas)')
+    parser.add_argument('--seed', type=int, default=0, help='Ziarno generatora danych wejściowych')
+    parser.add_argument('--output', help='Plik, do którego zostaną zapisane wyniki (domyślnie standardowe wyjście)')
+    parser.add_argument('--baseline', help='Plik z wynikami bazowymi, z którymi porównywane są pomiary')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Dopuszczalny względny wzrost czasu względem wyników bazowych')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = run_benchmarks(args.benchmarks, args.distributions, args.scale, args.repeat, args.seed)
+
+    for name, exponent in results['exponents'].items():
+        print(f'{name:40} wykładnik: {exponent:.2f}', file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        uncompared = uncompared_groups(results, baseline)
+        for benchmark_name, distribution in uncompared:
+            print(f'BRAK PORÓWNANIA {benchmark_name} {distribution}: brak wyników bazowych trwających co najmniej '
+                  f'{MIN_COMPARED_TIME} s - należy wygenerować wyniki bazowe ponownie', file=sys.stderr)
+        regressions = find_regressions(results, baseline, args.threshold)
+        regressions = confirm_regressions(regressions, args.threshold, args.repeat, args.seed)
+        regressions = persistent_regressions(regressions, results, baseline)
+        for regression in regressions:
+            print(f'REGRESJA {regression["benchmark"]} {regression["distribution"]} n={regression["size"]}: '
+                  f'{regression["seconds"]:.6f} s (bazowo {regression["baseline_seconds"]:.6f} s)', file=sys.stderr)
+        if regressions or uncompared:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
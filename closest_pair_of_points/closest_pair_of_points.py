@@ -1,5 +1,10 @@
 import argparse
 import math
+import sys
+import time
+import warnings
+
+import numpy as np
 
 
 def distance(point_a, point_b):
@@ -18,7 +23,7 @@ def find_closest_points_naive(points):
         for j in range(i + 1, len(points)):
             point_a, point_b = points[i], points[j]
             dist = distance(point_a, point_b)
-            if not min_distance or dist < min_distance:
+            if min_distance is None or dist < min_distance:
                 min_distance = dist
                 closest_points = (point_a, point_b)
     return min_distance, closest_points
@@ -96,7 +101,7 @@ def find_closest_points(sorted_points):
             right_middle_points_v_index += 1
 
         # Porównujemy punkt z czteroma sąsiadami po przeciwległej stronie linii podziału
-        for neighbour_point in [p for p in neighbour_points if p][neighbour_v_index:neighbour_v_index + 4]:
+        for neighbour_point in neighbour_points[neighbour_v_index:neighbour_v_index + 4]:
             dist = distance(point, neighbour_point)
             if dist < closest_distance:
                 closest_distance = dist
@@ -105,29 +110,301 @@ def find_closest_points(sorted_points):
     return closest_distance, closest_points
 
 
+# Liczba kolejnych (wg x) punktów tworzących liść, w którym porównujemy wszystkie pary punktów
+LEAF_SIZE = 8
+# Liczba kolejnych (wg y) punktów pasa, z którymi porównujemy każdy punkt pasa
+STRIP_NEIGHBOURS = 7
+
+
+def _closest_pair_in_shifts(xs, ys, groups, shifts: int):
+    """
+    Porównuje każdy punkt (xs[i], ys[i]) z punktami i + 1, ..., i + shifts należącymi do tej samej grupy.
+    :return: Krotka (kwadrat najmniejszej odległości, pozycja pierwszego punktu pary, pozycja drugiego punktu pary)
+    """
+    best_squared_distance, best_pair = math.inf, None
+    for shift in range(1, min(shifts, len(xs) - 1) + 1):
+        squared_distances = (xs[shift:] - xs[:-shift]) ** 2 + (ys[shift:] - ys[:-shift]) ** 2
+        squared_distances[groups[shift:] != groups[:-shift]] = math.inf
+        position = np.argmin(squared_distances)
+        if squared_distances[position] < best_squared_distance:
+            best_squared_distance = squared_distances[position]
+            best_pair = (position, position + shift)
+    return best_squared_distance, best_pair
+
+
+def find_closest_points_vectorized(points):
+    """
+    Znajduje parę najbliższych punktów w czasie O(n log n), wykonując obliczenia na tablicach NumPy.
+    Algorytm "dziel i zwyciężaj" jest realizowany od dołu: punkty są raz sortowane wg x i dzielone na bloki
+    LEAF_SIZE kolejnych punktów, w których porównywane są wszystkie pary. Następnie na każdym poziomie łączymy
+    sąsiednie bloki, sprawdzając jednocześnie pasy wokół wszystkich linii podziału danego poziomu.
+    Szerokość pasa to najmniejszy dotychczas znaleziony dystans (wspólny dla wszystkich bloków) - nie przekracza
+    on najmniejszego dystansu wewnątrz żadnego bloku, więc w pasie posortowanym wg y wystarczy porównać każdy punkt
+    z STRIP_NEIGHBOURS kolejnymi.
+    :param points: Tablica (n, 2) współrzędnych punktów
+    :return: Dwuelementowa krotka zawierająca najkrótszy dystans między punktami oraz parę najbliższych punktów.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 2 or len(points) < 2:
+        raise ValueError('Podaj tablicę co najmniej dwóch punktów o wymiarach (n, 2)')
+
+    points_count = len(points)
+    order = np.argsort(points[:, 0])
+    xs, ys = points[order, 0], points[order, 1]
+
+    best_squared_distance, best_pair = _closest_pair_in_shifts(xs, ys, np.arange(points_count) // LEAF_SIZE,
+                                                               LEAF_SIZE - 1)
+
+    block_size = 2 * LEAF_SIZE
+    while block_size // 2 < points_count and best_squared_distance > 0:
+        # Linia podziału bloku przechodzi przez ostatni punkt jego lewej połowy. Punkty są posortowane wg x,
+        # więc pas wokół linii to ciągły fragment bloku wyznaczany wyszukiwaniem binarnym.
+        block_starts = np.arange(0, points_count - block_size // 2, block_size)
+        block_ends = np.minimum(block_starts + block_size, points_count)
+        dividing_lines = xs[block_starts + block_size // 2 - 1]
+        width = math.sqrt(best_squared_distance)
+        strip_starts = np.maximum(np.searchsorted(xs, dividing_lines - width, side='right'), block_starts)
+        strip_ends = np.minimum(np.searchsorted(xs, dividing_lines + width, side='left'), block_ends)
+        strip_lengths = np.maximum(strip_ends - strip_starts, 0)
+
+        strip_blocks = np.repeat(np.arange(len(block_starts)), strip_lengths)
+        strip = np.arange(strip_lengths.sum()) - np.repeat(np.cumsum(strip_lengths) - strip_lengths, strip_lengths)
+        strip += np.repeat(strip_starts, strip_lengths)
+        strip_order = np.lexsort((ys[strip], strip_blocks))
+        strip, strip_blocks = strip[strip_order], strip_blocks[strip_order]
+
+        squared_distance, pair = _closest_pair_in_shifts(xs[strip], ys[strip], strip_blocks, STRIP_NEIGHBOURS)
+        if squared_distance < best_squared_distance:
+            best_squared_distance, best_pair = squared_distance, (strip[pair[0]], strip[pair[1]])
+        block_size *= 2
+
+    point_a, point_b = (tuple(points[order[position]].tolist()) for position in best_pair)
+    return math.sqrt(best_squared_distance), (point_a, point_b)
+
+
+class OnlineClosestPair:
+    """
+    Para najbliższych punktów zbioru, do którego punkty są dodawane pojedynczo (metoda Rabina / Khullera-Matiasa).
+    Punkty są przechowywane w siatce kwadratów o boku równym aktualnemu najmniejszemu dystansowi, więc każdy kwadrat
+    zawiera co najwyżej 4 punkty, a nowy punkt wystarczy porównać z punktami 9 sąsiednich kwadratów.
+    Siatka jest przebudowywana w czasie O(n) tylko wtedy, gdy najmniejszy dystans maleje. Jeśli punkty napływają
+    w losowej kolejności, i-ty punkt zmniejsza dystans z prawdopodobieństwem co najwyżej 2 / i, więc oczekiwany
+    zamortyzowany koszt dodania punktu wynosi O(1).
+    """
+    def __init__(self, points: list=None):
+        self.points = []
+        self.min_distance = None
+        self.closest_points = None
+        self._grid = {}
+        for point in points or []:
+            self.add(point)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cell(self, point):
+        return math.floor(point[0] / self.min_distance), math.floor(point[1] / self.min_distance)
+
+    def _rebuild_grid(self):
+        self._grid = {}
+        # Przy zerowym dystansie (powtórzony punkt) wynik już się nie zmieni, więc siatka nie jest potrzebna
+        if self.min_distance:
+            for point in self.points:
+                self._grid.setdefault(self._cell(point), []).append(point)
+
+    def add(self, point):
+        """
+        Dodaje punkt do zbioru.
+        :param point: Dwuelementowa krotka ze współrzędnymi punktu.
+        :return: Dwuelementowa krotka zawierająca najkrótszy dystans między punktami oraz parę najbliższych punktów.
+        """
+        self.points.append(point)
+        if self.min_distance is None:
+            if len(self.points) == 2:
+                self.min_distance, self.closest_points = find_closest_points_naive(self.points)
+                self._rebuild_grid()
+            return self.min_distance, self.closest_points
+        if not self.min_distance:
+            return self.min_distance, self.closest_points
+
+        cell_x, cell_y = self._cell(point)
+        min_distance, closest_points = self.min_distance, None
+        for neighbour_x in (cell_x - 1, cell_x, cell_x + 1):
+            for neighbour_y in (cell_y - 1, cell_y, cell_y + 1):
+                for neighbour_point in self._grid.get((neighbour_x, neighbour_y), ()):
+                    dist = distance(point, neighbour_point)
+                    if dist < min_distance:
+                        min_distance, closest_points = dist, (neighbour_point, point)
+
+        if closest_points:
+            self.min_distance, self.closest_points = min_distance, closest_points
+            self._rebuild_grid()
+        else:
+            self._grid.setdefault((cell_x, cell_y), []).append(point)
+        return self.min_distance, self.closest_points
+
+
+# Domyślny rozmiar porcji danych wczytywanych z pliku [B]
+CHUNK_SIZE = 1 << 24
+INPUT_FORMATS = ('csv', 'whitespace', 'binary')
+# Bajty rozdzielające liczby w formatach tekstowych
+TEXT_SEPARATORS = {
+    'csv': (b',', b' ', b'\t', b'\r', b'\n'),
+    'whitespace': (b' ', b'\t', b'\r', b'\n'),
+}
+
+
+def _number(s):
+    try:
+        return int(s)
+    except ValueError:
+        return float(s)
+
+
 def arg_point(s):
     try:
         s = s.replace('(', '')
         s = s.replace(')', '')
-        x, y = map(int, s.split(','))
+        x, y = map(_number, s.split(','))
         return x, y
     except:
         raise argparse.ArgumentTypeError('Podaj listę punktów w formacie (x1,y1) (x2,y2) ... (xn,yn)')
 
 
+def arg_chunk_size(s):
+    try:
+        chunk_size = int(s)
+    except ValueError:
+        chunk_size = 0
+    if chunk_size <= 0:
+        raise argparse.ArgumentTypeError('Rozmiar porcji musi być dodatnią liczbą całkowitą')
+    return chunk_size
+
+
+def _parse_text_chunk(chunk: bytes, input_format: str) -> np.ndarray:
+    text = chunk.decode('ascii')
+    if input_format == 'csv':
+        text = text.replace(',', ' ')
+    try:
+        with warnings.catch_warnings():
+            # Starsze wersje NumPy zgłaszają niepoprawne dane jedynie ostrzeżeniem
+            warnings.simplefilter('error', DeprecationWarning)
+            return np.fromstring(text, dtype=np.float64, sep=' ')
+    except (ValueError, DeprecationWarning):
+        raise ValueError('Niepoprawne dane wejściowe - oczekiwano liczb w formacie ' + input_format)
+
+
+def _read_text_points(stream, input_format: str, chunk_size: int) -> list:
+    parts = []
+    remainder = b''
+    separators = TEXT_SEPARATORS[input_format]
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        # Porcja jest przetwarzana do ostatniego separatora liczb, reszta trafia do następnej porcji. Dzięki temu
+        # reszta jest krótka również dla danych bez znaków nowego wiersza
+        chunk = remainder + chunk
+        end = max(chunk.rfind(separator) for separator in separators) + 1
+        remainder = chunk[end:]
+        if end:
+            parts.append(_parse_text_chunk(chunk[:end], input_format))
+    if remainder.strip():
+        parts.append(_parse_text_chunk(remainder, input_format))
+    return parts
+
+
+def _read_binary_points(stream, chunk_size: int) -> list:
+    parts = []
+    remainder = b''
+    chunk_size -= chunk_size % 8
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        chunk = remainder + chunk
+        end = len(chunk) - len(chunk) % 8
+        remainder = chunk[end:]
+        parts.append(np.frombuffer(chunk[:end], dtype='<f8').astype(np.float64))
+    if remainder:
+        raise ValueError('Długość danych binarnych nie jest wielokrotnością 8 bajtów')
+    return parts
+
+
+def read_points(stream, input_format: str = 'whitespace', chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Wczytuje punkty ze strumienia binarnego porcjami bezpośrednio do tablicy NumPy.
+    :param stream: Strumień binarny (np. plik otwarty w trybie 'rb' lub sys.stdin.buffer)
+    :param input_format: 'csv' - wiersze x,y; 'whitespace' - współrzędne rozdzielone białymi znakami;
+                         'binary' - kolejne pary liczb float64 zapisane w porządku little-endian
+    :param chunk_size: Rozmiar wczytywanej porcji danych [B], dla formatu binarnego co najmniej 8 (jedna liczba)
+    :return: Tablica (n, 2) współrzędnych punktów
+    """
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f'Nieznany format danych: {input_format}')
+    if chunk_size < (8 if input_format == 'binary' else 1):
+        raise ValueError(f'Niepoprawny rozmiar porcji danych: {chunk_size} B'
+                         + (' (format binarny wymaga co najmniej 8 B)' if input_format == 'binary' else ''))
+    if input_format == 'binary':
+        parts = _read_binary_points(stream, chunk_size)
+    else:
+        parts = _read_text_points(stream, input_format, chunk_size)
+
+    values = np.concatenate(parts) if parts else np.empty(0, dtype=np.float64)
+    if len(values) % 2:
+        raise ValueError('Nieparzysta liczba współrzędnych - każdy punkt musi mieć dwie współrzędne')
+    return values.reshape(-1, 2)
+
+
+def load_points(path: str, input_format: str = 'whitespace', chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Wczytuje punkty z pliku (lub ze standardowego wejścia, gdy path == '-'), zob. read_points.
+    """
+    if path == '-':
+        return read_points(sys.stdin.buffer, input_format, chunk_size)
+    with open(path, 'rb') as stream:
+        return read_points(stream, input_format, chunk_size)
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description='Wyznacza parę najbliższych punktów w podanym zbiorze.')
-    parser.add_argument('points', metavar='point', type=arg_point, nargs='+',
+    parser.add_argument('points', metavar='point', type=arg_point, nargs='*',
                         help='Lista punktów należących do zbioru. \n'
                              'Podaj listę punktów w formacie'
                              ' (x1,y1) (x2,y2) ... (xn,yn)')
-    return parser.parse_args()
+    parser.add_argument('-i', '--input', metavar='PLIK',
+                        help='Plik z punktami zbioru ("-" - standardowe wejście), zamiast listy punktów')
+    parser.add_argument('-f', '--format', choices=INPUT_FORMATS, default='whitespace',
+                        help='Format pliku z punktami (domyślnie: whitespace)')
+    parser.add_argument('--chunk-size', type=arg_chunk_size, default=CHUNK_SIZE,
+                        help='Rozmiar porcji wczytywanych danych w bajtach (dla formatu binary co najmniej 8)')
+    args = parser.parse_args()
+    if bool(args.points) == bool(args.input):
+        parser.error('Podaj listę punktów albo plik z punktami (--input)')
+    return args
 
 
 def main():
     args = parse_args()
-    points = args.points
-    print(find_closest_points(sort_points_by_axes(points)))
+
+    start = time.perf_counter()
+    try:
+        points = load_points(args.input, args.format, args.chunk_size) if args.input else args.points
+    except (OSError, ValueError) as error:
+        sys.exit(f'Błąd wczytywania punktów: {error}')
+    load_time = time.perf_counter() - start
+    if len(points) < 2:
+        sys.exit(f'Błąd: zbiór musi zawierać co najmniej 2 punkty (wczytano {len(points)})')
+
+    start = time.perf_counter()
+    if args.input:
+        result = find_closest_points_vectorized(points)
+    else:
+        result = find_closest_points(sort_points_by_axes(points))
+    solve_time = time.perf_counter() - start
+
+    print(result)
+    print(f'Punkty: {len(points)}, wczytywanie: {load_time:.3f} s, obliczenia: {solve_time:.3f} s', file=sys.stderr)
 
 
 if __name__ == '__main__':
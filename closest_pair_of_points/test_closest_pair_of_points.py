@@ -1,6 +1,10 @@
+import io
+
+import numpy as np
 import pytest
 
-from closest_pair_of_points import find_closest_points_naive, find_closest_points, sort_points_by_axes
+from closest_pair_of_points import (find_closest_points_naive, find_closest_points, sort_points_by_axes,
+                                    find_closest_points_vectorized, OnlineClosestPair, distance, read_points, main)
 
 
 # Zbiory testowe, pierwszy i drugi element zbioru to para najbliższych punktów
@@ -33,3 +37,102 @@ def test_find_closest_points(points_with_closest_pair):
     sorted_points = sort_points_by_axes(points)
     _, found_closest_pair = find_closest_points(sorted_points)
     assert set(found_closest_pair) == closest_pair
+
+
+def test_find_closest_points_vectorized(points_with_closest_pair):
+    closest_pair, points = points_with_closest_pair
+    _, found_closest_pair = find_closest_points_vectorized(np.array(points))
+    assert set(found_closest_pair) == closest_pair
+
+
+@pytest.mark.parametrize('distribution', ['uniform', 'grid', 'collinear'])
+def test_find_closest_points_vectorized_matches_naive(distribution):
+    rng = np.random.default_rng(0)
+    for points_count in (2, 3, 17, 100, 257):
+        if distribution == 'uniform':
+            points = rng.random((points_count, 2))
+        elif distribution == 'grid':
+            points = rng.integers(0, 30, size=(points_count, 2)).astype(float)
+        else:
+            points = np.stack([np.full(points_count, 3.0), rng.random(points_count)], axis=1)
+        min_distance, _ = find_closest_points_vectorized(points)
+        naive_min_distance, _ = find_closest_points_naive([tuple(p) for p in points.tolist()])
+        assert min_distance == pytest.approx(naive_min_distance)
+
+
+def test_online_closest_pair(points_with_closest_pair):
+    closest_pair, points = points_with_closest_pair
+    online_closest_pair = OnlineClosestPair()
+    for point in points:
+        online_closest_pair.add(point)
+    assert set(online_closest_pair.closest_points) == closest_pair
+
+
+def test_online_closest_pair_after_each_point():
+    rng = np.random.default_rng(1)
+    points = [tuple(p) for p in rng.integers(0, 200, size=(150, 2)).tolist()]
+    online_closest_pair = OnlineClosestPair()
+    assert online_closest_pair.add(points[0]) == (None, None)
+    for i in range(1, len(points)):
+        min_distance, closest_points = online_closest_pair.add(points[i])
+        assert min_distance == pytest.approx(find_closest_points_naive(points[:i + 1])[0])
+        assert distance(*closest_points) == pytest.approx(min_distance)
+
+
+@pytest.mark.parametrize('input_format, data', [
+    ('csv', b'1,2\n3.5,-4\n5e1,6'),
+    ('whitespace', b'1 2\n3.5\t-4\n  5e1 6\n'),
+    ('binary', np.array([1, 2, 3.5, -4, 50, 6], dtype='<f8').tobytes()),
+])
+def test_read_points(input_format, data):
+    for chunk_size in (8, 16, 1 << 20):
+        points = read_points(io.BytesIO(data), input_format, chunk_size=chunk_size)
+        assert points.tolist() == [[1, 2], [3.5, -4], [50, 6]]
+
+
+@pytest.mark.parametrize('input_format, data', [
+    ('csv', b'1,2\n3,x\n'),
+    ('whitespace', b'1 2 3\n'),
+    ('binary', b'\x00' * 12),
+])
+def test_read_points_invalid_data(input_format, data):
+    with pytest.raises(ValueError):
+        read_points(io.BytesIO(data), input_format)
+
+
+def test_read_points_without_newlines():
+    values = np.arange(2000, dtype=np.float64) / 8
+    data = ' '.join(str(v) for v in values).encode()
+    # Porcje są dzielone na ostatnim białym znaku, a nie tylko na końcu wiersza
+    for chunk_size in (5, 64):
+        assert np.array_equal(read_points(io.BytesIO(data), 'whitespace', chunk_size=chunk_size).ravel(), values)
+
+
+def test_main_rejects_single_point(tmpdir, monkeypatch):
+    path = tmpdir.join('points.txt')
+    path.write('1 2\n')
+    monkeypatch.setattr('sys.argv', ['closest_pair_of_points.py', '--input', str(path)])
+    with pytest.raises(SystemExit) as error:
+        main()
+    assert 'co najmniej 2 punkty' in str(error.value)
+
+
+@pytest.mark.parametrize('input_format, chunk_size', [('binary', 4), ('binary', 0), ('whitespace', 0), ('csv', -1)])
+def test_read_points_rejects_invalid_chunk_size(input_format, chunk_size):
+    data = np.array([1, 2, 3, 4], dtype='<f8').tobytes() if input_format == 'binary' else b'1 2\n3 4\n'
+    with pytest.raises(ValueError):
+        read_points(io.BytesIO(data), input_format, chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize('arguments', [
+    ['--chunk-size', '0'],
+    ['--chunk-size', 'x'],
+    ['-f', 'binary', '--chunk-size', '4'],
+])
+def test_main_rejects_invalid_chunk_size(tmpdir, monkeypatch, arguments):
+    path = tmpdir.join('points.bin')
+    path.write_binary(np.array([1, 2, 3, 4], dtype='<f8').tobytes())
+    monkeypatch.setattr('sys.argv', ['closest_pair_of_points.py', '--input', str(path)] + arguments)
+    with pytest.raises(SystemExit) as error:
+        main()
+    assert error.value.code != 0
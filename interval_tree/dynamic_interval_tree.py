@@ -0,0 +1,241 @@
+import math
+import random
+import time
+
+from interval_tree import create_interval_tree, sort_points_by_axes, query_internal_tree
+
+
+class TreapNode:
+    def __init__(self, key: tuple, end: float):
+        self.key = key
+        self.end = end
+        self.priority = random.random()
+        self.left_child = None
+        self.right_child = None
+        # Augmentacja: liczba węzłów i największy prawy koniec przedziału w poddrzewie
+        self.size = 1
+        self.max_end = end
+
+    def __repr__(self):
+        return f'TreapNode({self.key})'
+
+
+def _update(node: TreapNode):
+    node.size = 1
+    node.max_end = node.end
+    for child in (node.left_child, node.right_child):
+        if child:
+            node.size += child.size
+            node.max_end = max(node.max_end, child.max_end)
+
+
+def _split(node: TreapNode, key: tuple):
+    """
+    Podział drzewca na drzewce o kluczach mniejszych od key oraz nie mniejszych od key.
+    """
+    if not node:
+        return None, None
+    if node.key < key:
+        node.right_child, right = _split(node.right_child, key)
+        _update(node)
+        return node, right
+    left, node.left_child = _split(node.left_child, key)
+    _update(node)
+    return left, node
+
+
+def _merge(left: TreapNode, right: TreapNode) -> TreapNode:
+    """
+    Scalenie drzewców, w których wszystkie klucze left są mniejsze od kluczy right.
+    """
+    if not left or not right:
+        return left if left else right
+    if left.priority > right.priority:
+        left.right_child = _merge(left.right_child, right)
+        _update(left)
+        return left
+    right.left_child = _merge(left, right.left_child)
+    _update(right)
+    return right
+
+
+def _insert(root: TreapNode, node: TreapNode) -> TreapNode:
+    left, right = _split(root, node.key)
+    return _merge(_merge(left, node), right)
+
+
+def _delete(root: TreapNode, key: tuple) -> TreapNode:
+    if root.key == key:
+        return _merge(root.left_child, root.right_child)
+    if key < root.key:
+        root.left_child = _delete(root.left_child, key)
+    else:
+        root.right_child = _delete(root.right_child, key)
+    _update(root)
+    return root
+
+
+def _count_less(root: TreapNode, key: tuple) -> int:
+    """
+    :return: Liczba kluczy drzewca mniejszych od key
+    """
+    count = 0
+    node = root
+    while node:
+        if node.key < key:
+            count += 1 + (node.left_child.size if node.left_child else 0)
+            node = node.right_child
+        else:
+            node = node.left_child
+    return count
+
+
+class DynamicIntervalTree:
+    """
+    Dynamiczne drzewo przedziałów - drzewiec (treap) uporządkowany wg lewych końców przedziałów, w którym każdy węzeł
+    przechowuje największy prawy koniec przedziału w swoim poddrzewie. Oczekiwana wysokość drzewca to O(log n), więc
+    wstawianie i usuwanie mają oczekiwaną złożoność O(log n), a wyszukiwanie przedziałów O(log n + k) w przypadku
+    typowych danych. Drugi drzewiec, uporządkowany wg prawych końców, pozwala zliczać przedziały w czasie O(log n).
+    """
+    def __init__(self, intervals=None):
+        self._root = None
+        self._ends_root = None
+        self._intervals = {}
+        self._next_id = 0
+        for interval in intervals or []:
+            self.insert(interval)
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def __repr__(self):
+        return f'DynamicIntervalTree(intervals={len(self)})'
+
+    def interval(self, interval_id: int) -> tuple:
+        return self._intervals[interval_id]
+
+    def insert(self, interval: tuple) -> int:
+        """
+        Wstawienie przedziału. Oczekiwana złożoność obliczeniowa: O(log n).
+        :param interval: Krotka (lewy koniec, prawy koniec)
+        :return: Identyfikator przedziału używany przez delete
+        """
+        start, end = interval
+        if start > end:
+            raise ValueError(f'Niepoprawny przedział: {interval}')
+        interval_id = self._next_id
+        self._next_id += 1
+        self._intervals[interval_id] = interval
+        self._root = _insert(self._root, TreapNode((start, end, interval_id), end))
+        self._ends_root = _insert(self._ends_root, TreapNode((end, interval_id), end))
+        return interval_id
+
+    def delete(self, interval_id: int):
+        """
+        Usunięcie przedziału o podanym identyfikatorze. Oczekiwana złożoność obliczeniowa: O(log n).
+        """
+        start, end = self._intervals.pop(interval_id)
+        self._root = _delete(self._root, (start, end, interval_id))
+        self._ends_root = _delete(self._ends_root, (end, interval_id))
+
+    def iter_overlap(self, query_start: float, query_end: float):
+        """
+        Wyszukiwanie przedziałów mających część wspólną z przedziałem [query_start, query_end].
+        :return: Generator przedziałów
+        """
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            # Żaden przedział poddrzewa nie kończy się w query_start lub później
+            if not node or node.max_end < query_start:
+                continue
+            stack.append(node.left_child)
+            # Przedziały węzła i prawego poddrzewa zaczynają się za prawym końcem zapytania
+            if node.key[0] > query_end:
+                continue
+            if node.end >= query_start:
+                yield node.key[:2]
+            stack.append(node.right_child)
+
+    def query(self, query_point: float) -> list:
+        """
+        Wyszukiwanie przedziałów zawierających punkt query_point.
+        :return: Lista przedziałów
+        """
+        return list(self.iter_overlap(query_point, query_point))
+
+    def batch_query(self, query_points: list) -> list:
+        """
+        :return: Lista list przedziałów zawierających kolejne punkty zapytań
+        """
+        return [self.query(query_point) for query_point in query_points]
+
+    def count(self, query_start: float, query_end: float = None) -> int:
+        """
+        Zliczanie przedziałów zawierających punkt query_start lub, jeśli podano query_end, przecinających przedział
+        [query_start, query_end]. Przedziały zaczynające się najpóźniej w query_end, poza kończącymi się przed
+        query_start, to dokładnie przedziały przecinające zapytanie. Oczekiwana złożoność obliczeniowa: O(log n).
+        :return: Liczba przedziałów
+        """
+        if query_end is None:
+            query_end = query_start
+        started = _count_less(self._root, (query_end, math.inf, math.inf))
+        finished = _count_less(self._ends_root, (query_start, -math.inf))
+        return started - finished
+
+
+def benchmark_updates(intervals_count: int = 20000, updates_count: int = 50, seed: int = 0):
+    """
+    Porównanie czasu aktualizacji drzewa dynamicznego z przebudową statycznego drzewa przedziałów po każdej zmianie.
+    Każda aktualizacja to usunięcie losowego przedziału, wstawienie nowego i jedno zapytanie.
+    :return: Słownik z liczbą aktualizacji na sekundę dla poszczególnych metod
+    """
+    generator = random.Random(seed)
+
+    def random_interval():
+        start = generator.randint(0, 10 ** 6)
+        return start, start + generator.randint(0, 10 ** 4)
+
+    intervals = [random_interval() for _ in range(intervals_count)]
+    changes = [(generator.randrange(intervals_count), random_interval(), generator.randint(0, 10 ** 6))
+               for _ in range(updates_count)]
+
+    tree = DynamicIntervalTree()
+    ids = [tree.insert(interval) for interval in intervals]
+    start = time.perf_counter()
+    for position, interval, query_point in changes:
+        tree.delete(ids[position])
+        ids[position] = tree.insert(interval)
+        tree.query(query_point)
+    dynamic_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for position, interval, query_point in changes:
+        intervals[position] = interval
+        root = create_interval_tree(*sort_points_by_axes(intervals))
+        query_internal_tree(root, query_point)
+    rebuild_time = time.perf_counter() - start
+
+    return {
+        'dynamic': updates_count / dynamic_time,
+        'rebuild': updates_count / rebuild_time,
+    }
+
+
+def main():
+    tree = DynamicIntervalTree([(1, 3), (2, 8), (5, 7), (6, 12), (10, 11)])
+    interval_id = tree.insert((4, 9))
+    print(tree)
+    print('Results: {}'.format(tree.query(6)))
+    tree.delete(interval_id)
+    print('Results: {}'.format(tree.query(6)))
+    print('Overlapping [8, 10]: {}'.format(list(tree.iter_overlap(8, 10))))
+    print('Count: {}'.format(tree.count(6)))
+
+    results = benchmark_updates()
+    for method in ('dynamic', 'rebuild'):
+        print(f'{method}: {results[method]:.0f} aktualizacji/s')
+
+
+if __name__ == '__main__':
+    main()
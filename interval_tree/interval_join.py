@@ -0,0 +1,170 @@
+import time
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+# Tablice współdzielone przez proces roboczy puli, ustawiane w _attach_shared_arrays
+_worker_arrays = None
+_worker_memory = None
+
+# Końce przedziałów obu zbiorów posortowane wg lewych końców oraz permutacje sortujące
+JOIN_FIELDS = ('starts_a', 'ends_a', 'order_a', 'starts_b', 'ends_b', 'order_b')
+
+
+def _expand_ranges(starts: np.ndarray, ends: np.ndarray):
+    """
+    :return: Krotka (numer przedziału, pozycja) dla wszystkich pozycji z przedziałów [starts[i], ends[i])
+    """
+    lengths = ends - starts
+    owners = np.repeat(np.arange(len(starts)), lengths)
+    first_slots = np.cumsum(lengths) - lengths
+    return owners, np.arange(lengths.sum()) - first_slots[owners] + starts[owners]
+
+
+def _sorted_arrays(starts_a, ends_a, starts_b, ends_b) -> dict:
+    arrays = {}
+    for suffix, starts, ends in (('a', starts_a, ends_a), ('b', starts_b, ends_b)):
+        starts, ends = np.asarray(starts), np.asarray(ends)
+        if starts.ndim != 1 or starts.shape != ends.shape:
+            raise ValueError('Tablice końców przedziałów muszą być jednowymiarowe i tej samej długości')
+        if (starts > ends).any():
+            raise ValueError('Lewy koniec przedziału nie może być większy od prawego')
+        order = np.argsort(starts, kind='stable')
+        arrays[f'starts_{suffix}'], arrays[f'ends_{suffix}'] = starts[order], ends[order]
+        arrays[f'order_{suffix}'] = order
+    return arrays
+
+
+def _probe_ranges(arrays: dict, rule: int, first: int, last: int):
+    """
+    Przedziały [a, b] i [c, d] przecinają się wtedy i tylko wtedy, gdy a <= c <= b (reguła 0) albo c < a <= d
+    (reguła 1) - reguły są rozłączne, więc każda para jest wyznaczana dokładnie raz. Dla przedziałów first:last
+    zbioru A (reguła 0) lub B (reguła 1), w kolejności lewych końców, wyznacza zakresy pasujących przedziałów
+    drugiego zbioru w kolejności lewych końców.
+    :return: Krotka (początki zakresów, końce zakresów)
+    """
+    if rule == 0:
+        lower = np.searchsorted(arrays['starts_b'], arrays['starts_a'][first:last], side='left')
+        upper = np.searchsorted(arrays['starts_b'], arrays['ends_a'][first:last], side='right')
+    else:
+        lower = np.searchsorted(arrays['starts_a'], arrays['starts_b'][first:last], side='right')
+        upper = np.searchsorted(arrays['starts_a'], arrays['ends_b'][first:last], side='right')
+    return lower, upper
+
+
+def _join_task(arrays: dict, task: tuple):
+    rule, first, last = task
+    owners, positions = _expand_ranges(*_probe_ranges(arrays, rule, first, last))
+    if rule == 0:
+        return arrays['order_a'][first + owners], arrays['order_b'][positions]
+    return arrays['order_a'][positions], arrays['order_b'][first + owners]
+
+
+def _plan_tasks(arrays: dict, chunk_size: int):
+    """
+    Podział złączenia na zadania (reguła, first, last) obejmujące co najwyżej chunk_size przedziałów i - o ile
+    pojedynczy przedział nie ma więcej par - co najwyżej chunk_size par wynikowych.
+    """
+    for rule, probes_count in ((0, len(arrays['starts_a'])), (1, len(arrays['starts_b']))):
+        for block_first in range(0, probes_count, chunk_size):
+            block_last = min(block_first + chunk_size, probes_count)
+            lower, upper = _probe_ranges(arrays, rule, block_first, block_last)
+            cumulative = np.cumsum(upper - lower)
+            if not cumulative[-1]:
+                continue
+            limits = np.arange(chunk_size, cumulative[-1], chunk_size)
+            bounds = np.unique(np.r_[0, np.searchsorted(cumulative, limits, side='right'), block_last - block_first])
+            for first, last in zip(bounds[:-1], bounds[1:]):
+                if cumulative[last - 1] > (cumulative[first - 1] if first else 0):
+                    yield rule, block_first + int(first), block_first + int(last)
+
+
+def _share_arrays(arrays: dict):
+    """
+    Kopiuje tablice do jednego bloku pamięci współdzielonej.
+    :return: Krotka (blok pamięci współdzielonej, opis tablic [(nazwa, typ, kształt, przesunięcie)])
+    """
+    layout = []
+    offset = 0
+    for field in JOIN_FIELDS:
+        array = arrays[field]
+        layout.append((field, array.dtype.str, array.shape, offset))
+        offset += -(-array.nbytes // 64) * 64
+    memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for field, dtype, shape, offset in layout:
+        np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)[...] = arrays[field]
+    return memory, layout
+
+
+def _attach_shared_arrays(memory_name: str, layout: list):
+    global _worker_arrays, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_arrays = {field: np.ndarray(shape, dtype=dtype, buffer=_worker_memory.buf, offset=offset)
+                      for field, dtype, shape, offset in layout}
+
+
+def _join_task_in_worker(task: tuple):
+    return _join_task(_worker_arrays, task)
+
+
+def iter_interval_join(starts_a, ends_a, starts_b, ends_b, processes: int = 1, chunk_size: int = 1 << 20):
+    """
+    Złączenie dwóch zbiorów przedziałów - wyznaczenie wszystkich par przedziałów (jeden z A, drugi z B) mających część
+    wspólną. Oba zbiory są sortowane wg lewych końców, a pary pasujące do przedziału jednego zbioru tworzą ciągły
+    zakres drugiego zbioru wyznaczany wyszukiwaniem binarnym. Złożoność obliczeniowa: O((n + m) log(n + m) + k),
+    gdzie k to liczba par. Przy processes > 1 zadania są wykonywane przez pulę procesów, które czytają posortowane
+    tablice z pamięci współdzielonej.
+    :param starts_a: Tablica lewych końców przedziałów zbioru A
+    :param ends_a: Tablica prawych końców przedziałów zbioru A
+    :param starts_b: Tablica lewych końców przedziałów zbioru B
+    :param ends_b: Tablica prawych końców przedziałów zbioru B
+    :param processes: Liczba procesów roboczych
+    :param chunk_size: Docelowa liczba par w jednej porcji wyników
+    :return: Generator porcji wyników - krotek (indeksy przedziałów A, indeksy przedziałów B), w których
+             i-te elementy tworzą parę przecinających się przedziałów
+    """
+    arrays = _sorted_arrays(starts_a, ends_a, starts_b, ends_b)
+    tasks = _plan_tasks(arrays, chunk_size)
+
+    if processes <= 1:
+        for task in tasks:
+            yield _join_task(arrays, task)
+        return
+
+    memory, layout = _share_arrays(arrays)
+    try:
+        with Pool(processes, initializer=_attach_shared_arrays, initargs=(memory.name, layout)) as pool:
+            yield from pool.imap(_join_task_in_worker, tasks)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def interval_join(starts_a, ends_a, starts_b, ends_b, processes: int = 1) -> tuple:
+    """
+    :return: Krotka (indeksy przedziałów A, indeksy przedziałów B) wszystkich par przecinających się przedziałów
+    """
+    chunks = list(iter_interval_join(starts_a, ends_a, starts_b, ends_b, processes=processes))
+    if not chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate([a for a, _ in chunks]), np.concatenate([b for _, b in chunks])
+
+
+def main():
+    bookings = [(1, 3), (2, 8), (5, 7), (10, 11)]
+    maintenance_windows = [(3, 5), (9, 9), (11, 14)]
+    indices_a, indices_b = interval_join(*np.array(bookings).T, *np.array(maintenance_windows).T)
+    print([(bookings[a], maintenance_windows[b]) for a, b in zip(indices_a, indices_b)])
+
+    rng = np.random.default_rng(0)
+    n = 10 ** 6
+    starts_a, starts_b = rng.integers(0, 10 ** 9, size=n), rng.integers(0, 10 ** 9, size=n)
+    ends_a, ends_b = starts_a + rng.integers(0, 10 ** 4, size=n), starts_b + rng.integers(0, 10 ** 4, size=n)
+    for processes in (1, 4):
+        start = time.perf_counter()
+        pairs = sum(len(a) for a, _ in iter_interval_join(starts_a, ends_a, starts_b, ends_b, processes=processes))
+        print(f'Procesy: {processes}, pary: {pairs}, czas: {time.perf_counter() - start:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
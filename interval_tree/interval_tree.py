@@ -1,3 +1,8 @@
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+
 class Node:
     def __init__(self, left_child=None, right_child=None, point=None):
         self.left_child = left_child
@@ -30,6 +35,11 @@ class IntervalNode(Node):
         self.median = median
         self.median_points_left = median_points_left if median_points_left else []
         self.median_points_right = median_points_right if median_points_right else []
+        # Posortowane końce przedziałów węzła (do wyszukiwania binarnego) oraz liczba przedziałów w poddrzewie
+        self.median_starts = [interval[0] for interval in self.median_points_left]
+        self.median_ends = [interval[1] for interval in self.median_points_right]
+        self.subtree_count = len(self.median_points_left) + sum(child.subtree_count
+                                                                for child in (left_child, right_child) if child)
 
 
 def sort_points_by_axes(points: list):
@@ -96,7 +106,8 @@ def query_internal_tree(root: IntervalNode, query_point: float) -> set:
                 break
         result = result.union(query_internal_tree(root.left_child, query_point))
     else:
-        for r_interval in root.median_points_right:
+        # Przedziały są posortowane rosnąco wg prawych końców, więc pasujące przedziały znajdują się na końcu listy
+        for r_interval in reversed(root.median_points_right):
             if r_interval[0] <= query_point <= r_interval[1]:
                 result.add(r_interval)
             else:
@@ -106,6 +117,376 @@ def query_internal_tree(root: IntervalNode, query_point: float) -> set:
     return result
 
 
+def iter_query_interval_tree(root: IntervalNode, query_point: float):
+    """
+    Iteracyjne wyszukiwanie przedziałów zawierających punkt query_point. W przeciwieństwie do query_internal_tree
+    nie tworzy zbiorów pośrednich i zwraca każde wystąpienie powtórzonego przedziału.
+    :param root: Korzeń drzewa przedziałów
+    :param query_point: Punkt zapytania
+    :return: Generator przedziałów zawierających query_point
+    """
+    node = root
+    while node:
+        # Wszystkie przedziały węzła zawierają medianę, więc wystarcza sprawdzenie jednego końca
+        if query_point <= node.median:
+            for interval in node.median_points_left:
+                if interval[0] > query_point:
+                    break
+                yield interval
+            node = node.left_child
+        else:
+            for interval in reversed(node.median_points_right):
+                if interval[1] < query_point:
+                    break
+                yield interval
+            node = node.right_child
+
+
+def iter_batch_query_interval_tree(root: IntervalNode, query_points: list):
+    """
+    Wyszukiwanie przedziałów zawierających każdy z punktów query_points w jednym przejściu drzewa.
+    Punkty zapytań są dzielone w węzłach względem mediany, a w obrębie węzła posortowane zapytania przesuwają
+    wskaźnik po liście przedziałów węzła, zamiast przeglądać ją od początku dla każdego zapytania.
+    Złożoność obliczeniowa: O(q log q + m + k), gdzie m to liczba odwiedzonych węzłów, a k - liczba wyników
+    (dla posortowanych zapytań sortowanie ma koszt liniowy).
+    :param root: Korzeń drzewa przedziałów
+    :param query_points: Lista punktów zapytań
+    :return: Generator par (indeks punktu w query_points, przedział zawierający ten punkt), uporządkowanych wg węzłów
+    """
+    order = sorted(range(len(query_points)), key=query_points.__getitem__)
+    sorted_points = [query_points[i] for i in order]
+
+    stack = [(root, 0, len(sorted_points))]
+    while stack:
+        node, first, last = stack.pop()
+        if not node or first == last:
+            continue
+        split = bisect_right(sorted_points, node.median, first, last)
+
+        # Zapytania nie większe od mediany - pasujące przedziały tworzą rosnący prefiks listy median_points_left
+        left_intervals = node.median_points_left
+        matched = 0
+        for position in range(first, split):
+            query_point = sorted_points[position]
+            while matched < len(left_intervals) and left_intervals[matched][0] <= query_point:
+                matched += 1
+            for i in range(matched):
+                yield order[position], left_intervals[i]
+
+        # Zapytania większe od mediany - pasujące przedziały tworzą malejący sufiks listy median_points_right
+        right_intervals = node.median_points_right
+        unmatched = 0
+        for position in range(split, last):
+            query_point = sorted_points[position]
+            while unmatched < len(right_intervals) and right_intervals[unmatched][1] < query_point:
+                unmatched += 1
+            for i in range(len(right_intervals) - 1, unmatched - 1, -1):
+                yield order[position], right_intervals[i]
+
+        stack.append((node.right_child, split, last))
+        stack.append((node.left_child, first, split))
+
+
+def batch_query_interval_tree(root: IntervalNode, query_points: list) -> list:
+    """
+    :return: Lista, której i-ty element to lista przedziałów zawierających query_points[i]
+    """
+    results = [[] for _ in query_points]
+    for index, interval in iter_batch_query_interval_tree(root, query_points):
+        results[index].append(interval)
+    return results
+
+
+def iter_overlap_interval_tree(root: IntervalNode, query_start: float, query_end: float):
+    """
+    Wyszukiwanie przedziałów mających część wspólną z przedziałem [query_start, query_end].
+    Złożoność obliczeniowa: O(log n + k), gdzie k to liczba wyników - każdy węzeł, którego mediana należy do
+    przedziału zapytania, zawiera co najmniej jeden wynik, a pozostałe odwiedzone węzły leżą na dwóch ścieżkach.
+    :param root: Korzeń drzewa przedziałów
+    :param query_start: Lewy koniec przedziału zapytania
+    :param query_end: Prawy koniec przedziału zapytania
+    :return: Generator przedziałów przecinających przedział zapytania
+    """
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if not node:
+            continue
+        if query_end < node.median:
+            # Przedziały węzła kończą się za medianą, więc wystarcza warunek interval[0] <= query_end
+            for interval in node.median_points_left:
+                if interval[0] > query_end:
+                    break
+                yield interval
+            stack.append(node.left_child)
+        elif query_start > node.median:
+            for interval in reversed(node.median_points_right):
+                if interval[1] < query_start:
+                    break
+                yield interval
+            stack.append(node.right_child)
+        else:
+            yield from node.median_points_left
+            stack.append(node.right_child)
+            stack.append(node.left_child)
+
+
+def _subtree_count(node: IntervalNode) -> int:
+    return node.subtree_count if node else 0
+
+
+def count_interval_tree(root: IntervalNode, query_start: float, query_end: float = None) -> int:
+    """
+    Zliczanie przedziałów zawierających punkt query_start lub, jeśli podano query_end, przecinających przedział
+    [query_start, query_end], bez wyznaczania tych przedziałów. Złożoność obliczeniowa: O(log^2 n) - odwiedzane są
+    węzły co najwyżej trzech ścieżek, a w każdym z nich wykonywane jest wyszukiwanie binarne.
+    :param root: Korzeń drzewa przedziałów
+    :param query_start: Punkt zapytania albo lewy koniec przedziału zapytania
+    :param query_end: Prawy koniec przedziału zapytania
+    :return: Liczba przedziałów
+    """
+    if query_end is None:
+        query_end = query_start
+    count = 0
+
+    # Schodzimy w dół drzewa, dopóki mediana węzła nie należy do przedziału zapytania
+    node = root
+    while node:
+        if query_end < node.median:
+            count += bisect_right(node.median_starts, query_end)
+            node = node.left_child
+        elif query_start > node.median:
+            count += len(node.median_ends) - bisect_left(node.median_ends, query_start)
+            node = node.right_child
+        else:
+            break
+    if not node:
+        return count
+    count += len(node.median_starts)
+
+    # Przedziały lewego poddrzewa kończą się przed medianą - przecinają zapytanie, jeśli kończą się w query_start
+    # lub później. Jeśli query_start <= mediana węzła, warunek ten spełniają wszystkie przedziały prawego poddrzewa.
+    left = node.left_child
+    while left:
+        if query_start <= left.median:
+            count += len(left.median_starts) + _subtree_count(left.right_child)
+            left = left.left_child
+        else:
+            count += len(left.median_ends) - bisect_left(left.median_ends, query_start)
+            left = left.right_child
+
+    # Symetrycznie przedziały prawego poddrzewa przecinają zapytanie, jeśli zaczynają się najpóźniej w query_end
+    right = node.right_child
+    while right:
+        if query_end >= right.median:
+            count += len(right.median_starts) + _subtree_count(right.left_child)
+            right = right.right_child
+        else:
+            count += bisect_right(right.median_starts, query_end)
+            right = right.left_child
+
+    return count
+
+
+class ArrayIntervalTree:
+    """
+    Drzewo przedziałów zapisane w ciągłych tablicach NumPy, bez obiektów IntervalNode i krotek.
+    Węzeł i ma medianę median[i] i dzieci left_child[i], right_child[i] (-1, jeśli dziecka nie ma); węzły kolejnych
+    poziomów drzewa są zapisane po sobie, a korzeń ma numer 0. Przedziały węzła zajmują pozycje
+    node_offset[i]:node_offset[i] + node_count[i] tablic by_start (indeksy przedziałów posortowane wg lewych końców)
+    i by_end (posortowane wg prawych końców), a node_starts i node_ends to odpowiadające im końce przedziałów.
+    Przy indeksach i końcach 64-bitowych drzewo zajmuje ok. 32 bajty na przedział.
+    """
+    ARRAY_FIELDS = ('median', 'left_child', 'right_child', 'node_offset', 'node_count', 'subtree_count', 'by_start',
+                    'node_starts', 'by_end', 'node_ends')
+
+    def __init__(self, median, left_child, right_child, node_offset, node_count, subtree_count, by_start, node_starts,
+                 by_end, node_ends):
+        self.median = median
+        self.left_child = left_child
+        self.right_child = right_child
+        self.node_offset = node_offset
+        self.node_count = node_count
+        self.subtree_count = subtree_count
+        self.by_start = by_start
+        self.node_starts = node_starts
+        self.by_end = by_end
+        self.node_ends = node_ends
+
+    def __len__(self):
+        return len(self.by_start)
+
+    def __repr__(self):
+        return f'ArrayIntervalTree(intervals={len(self)}, nodes={len(self.median)})'
+
+
+def array_interval_tree(starts, ends) -> ArrayIntervalTree:
+    """
+    Budowa drzewa przedziałów w postaci tablicowej. Drzewo jest budowane poziomami - dla wszystkich węzłów poziomu
+    jednocześnie wyznaczane są mediany, przedziały zawierające medianę swojego węzła oraz przedziały przekazywane
+    do dzieci. Mediana to lewy koniec środkowego przedziału węzła, więc każde dziecko dostaje co najwyżej połowę
+    przedziałów, a drzewo ma O(log n) poziomów. Złożoność obliczeniowa: O(n log n), pamięciowa: O(n).
+    :param starts: Tablica lewych końców przedziałów
+    :param ends: Tablica prawych końców przedziałów
+    :return: Drzewo ArrayIntervalTree
+    """
+    starts = np.asarray(starts)
+    ends = np.asarray(ends)
+    if starts.ndim != 1 or starts.shape != ends.shape:
+        raise ValueError('Tablice końców przedziałów muszą być jednowymiarowe i tej samej długości')
+    if np.any(starts > ends):
+        raise ValueError('Lewy koniec przedziału nie może być większy od prawego')
+
+    # Przedziały aktywne (jeszcze nieprzypisane do węzłów) są uporządkowane wg węzła, a w obrębie węzła wg lewych
+    # końców; sizes to liczby przedziałów aktywnych kolejnych węzłów bieżącego poziomu
+    active = np.argsort(starts, kind='stable')
+    active_starts, active_ends = starts[active], ends[active]
+    sizes = np.array([len(active)]) if len(active) else np.empty(0, dtype=np.int64)
+    levels, by_start, by_end = [], [], []
+    nodes_count = stored = 0
+    while len(sizes):
+        groups_count = len(sizes)
+        first = np.r_[0, np.cumsum(sizes)[:-1]]
+        median = active_starts[first + sizes // 2]
+        interval_median = np.repeat(median, sizes)
+
+        to_right = active_starts > interval_median
+        here = ~to_right & (active_ends >= interval_median)
+        node_count = np.add.reduceat(here, first, dtype=np.int64)
+        node_offset = stored + np.r_[0, np.cumsum(node_count)[:-1]]
+        stored += int(node_count.sum())
+        here_active = active[here]
+        by_start.append(here_active)
+        by_end.append(here_active[np.lexsort((active_ends[here], np.repeat(np.arange(groups_count), node_count)))])
+
+        # Pozostałe przedziały trafiają do lewego (kończą się przed medianą) lub prawego dziecka (zaczynają się za
+        # medianą). W obrębie węzła przedziały są posortowane wg lewych końców, więc przedziały lewego dziecka
+        # poprzedzają przedziały prawego i nowa kolejność nie wymaga sortowania.
+        to_left = ~to_right & ~here
+        child_sizes = np.stack([np.add.reduceat(to_left, first, dtype=np.int64),
+                                np.add.reduceat(to_right, first, dtype=np.int64)], axis=1).ravel()
+        has_child = child_sizes > 0
+        child_ids = np.full(2 * groups_count, -1, dtype=np.int64)
+        child_ids[has_child] = nodes_count + groups_count + np.arange(np.count_nonzero(has_child))
+        levels.append((median, child_ids[0::2], child_ids[1::2], node_offset, node_count))
+        nodes_count += groups_count
+
+        moving = ~here
+        active, active_starts, active_ends = active[moving], active_starts[moving], active_ends[moving]
+        sizes = child_sizes[has_child]
+
+    if levels:
+        median, left_child, right_child, node_offset, node_count = map(np.concatenate, zip(*levels))
+    else:
+        median = np.empty(0, dtype=starts.dtype)
+        left_child, right_child, node_offset, node_count = (np.empty(0, dtype=np.int64) for _ in range(4))
+
+    # Dzieci leżą na późniejszych poziomach, więc liczności poddrzew wyznaczamy od ostatniego poziomu
+    subtree_count = node_count.copy()
+    level_end = len(median)
+    for level in reversed(levels):
+        nodes = np.arange(level_end - len(level[0]), level_end)
+        for children in (left_child[nodes], right_child[nodes]):
+            has_child = children >= 0
+            subtree_count[nodes[has_child]] += subtree_count[children[has_child]]
+        level_end = nodes[0] if len(nodes) else level_end
+
+    by_start = np.concatenate(by_start) if by_start else np.empty(0, dtype=np.int64)
+    by_end = np.concatenate(by_end) if by_end else np.empty(0, dtype=np.int64)
+    return ArrayIntervalTree(median=median, left_child=left_child, right_child=right_child, node_offset=node_offset,
+                             node_count=node_count, subtree_count=subtree_count, by_start=by_start,
+                             node_starts=starts[by_start], by_end=by_end, node_ends=ends[by_end])
+
+
+def _node_slice(tree: ArrayIntervalTree, node: int):
+    first = int(tree.node_offset[node])
+    return first, first + int(tree.node_count[node])
+
+
+def overlap_array_interval_tree(tree: ArrayIntervalTree, query_start: float, query_end: float) -> np.ndarray:
+    """
+    Wyszukiwanie przedziałów mających część wspólną z przedziałem [query_start, query_end].
+    :return: Tablica indeksów przedziałów w tablicach wejściowych array_interval_tree
+    """
+    found = []
+    stack = [0] if len(tree.median) else []
+    while stack:
+        node = stack.pop()
+        if node < 0:
+            continue
+        first, last = _node_slice(tree, node)
+        median = tree.median[node]
+        if query_end < median:
+            found.append(tree.by_start[first:first + np.searchsorted(tree.node_starts[first:last], query_end, 'right')])
+            stack.append(int(tree.left_child[node]))
+        elif query_start > median:
+            found.append(tree.by_end[first + np.searchsorted(tree.node_ends[first:last], query_start, 'left'):last])
+            stack.append(int(tree.right_child[node]))
+        else:
+            found.append(tree.by_start[first:last])
+            stack.append(int(tree.right_child[node]))
+            stack.append(int(tree.left_child[node]))
+    return np.concatenate(found) if found else np.empty(0, dtype=tree.by_start.dtype)
+
+
+def query_array_interval_tree(tree: ArrayIntervalTree, query_point: float) -> np.ndarray:
+    """
+    Wyszukiwanie przedziałów zawierających punkt query_point. Złożoność obliczeniowa: O(log^2 n + k).
+    :return: Tablica indeksów przedziałów w tablicach wejściowych array_interval_tree
+    """
+    return overlap_array_interval_tree(tree, query_point, query_point)
+
+
+def count_array_interval_tree(tree: ArrayIntervalTree, query_start: float, query_end: float = None) -> int:
+    """
+    Odpowiednik count_interval_tree dla drzewa tablicowego. Złożoność obliczeniowa: O(log^2 n).
+    :return: Liczba przedziałów zawierających punkt query_start lub przecinających przedział [query_start, query_end]
+    """
+    if query_end is None:
+        query_end = query_start
+    count = 0
+
+    node = 0 if len(tree.median) else -1
+    while node >= 0:
+        first, last = _node_slice(tree, node)
+        if query_end < tree.median[node]:
+            count += int(np.searchsorted(tree.node_starts[first:last], query_end, 'right'))
+            node = int(tree.left_child[node])
+        elif query_start > tree.median[node]:
+            count += last - first - int(np.searchsorted(tree.node_ends[first:last], query_start, 'left'))
+            node = int(tree.right_child[node])
+        else:
+            break
+    if node < 0:
+        return count
+    count += int(tree.node_count[node])
+
+    def subtree_count(child):
+        return int(tree.subtree_count[child]) if child >= 0 else 0
+
+    left = int(tree.left_child[node])
+    while left >= 0:
+        first, last = _node_slice(tree, left)
+        if query_start <= tree.median[left]:
+            count += last - first + subtree_count(tree.right_child[left])
+            left = int(tree.left_child[left])
+        else:
+            count += last - first - int(np.searchsorted(tree.node_ends[first:last], query_start, 'left'))
+            left = int(tree.right_child[left])
+
+    right = int(tree.right_child[node])
+    while right >= 0:
+        first, last = _node_slice(tree, right)
+        if query_end >= tree.median[right]:
+            count += last - first + subtree_count(tree.left_child[right])
+            right = int(tree.right_child[right])
+        else:
+            count += int(np.searchsorted(tree.node_starts[first:last], query_end, 'right'))
+            right = int(tree.left_child[right])
+
+    return count
+
+
 def main():
     # intervals = [(0, 1), (1, 5), (2, 20), (3, 4), (10, 12), (11, 18)]
     intervals = [(2, 4), (6, 12), (2, 4), (6, 12), (2, 8), (10, 12),
@@ -115,6 +496,14 @@ def main():
     interval_tree_root = create_interval_tree(intervals_left, intervals_right)
     print(interval_tree_root)
     print('Result: {}'.format(query_internal_tree(interval_tree_root, 3)))
+    print('Result: {}'.format(list(iter_query_interval_tree(interval_tree_root, 3))))
+    print('Results: {}'.format(batch_query_interval_tree(interval_tree_root, [3, 7, 11])))
+    print('Overlapping [5, 9]: {}'.format(list(iter_overlap_interval_tree(interval_tree_root, 5, 9))))
+    print('Count: {}'.format(count_interval_tree(interval_tree_root, 3)))
+
+    array_tree = array_interval_tree(*np.array(intervals).T)
+    print(array_tree)
+    print('Result: {}'.format([intervals[i] for i in query_array_interval_tree(array_tree, 3)]))
 
 if __name__ == '__main__':
     main()
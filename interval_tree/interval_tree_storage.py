@@ -0,0 +1,92 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from interval_tree import ArrayIntervalTree, array_interval_tree, query_array_interval_tree
+
+# Format pliku (little-endian):
+#   MAGIC (8 bajtów) | wersja (uint32) | długość nagłówka (uint32) | nagłówek JSON | tablice wyrównane do ALIGNMENT
+# Nagłówek zawiera nazwę, typ, kształt i przesunięcie (od początku pliku) każdej tablicy drzewa.
+MAGIC = b'GGAITV\x00\x00'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct('<8sII')
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def save_array_interval_tree(tree: ArrayIntervalTree, path: str):
+    """
+    Zapis drzewa tablicowego do pliku, który można później odwzorować w pamięci funkcją load_array_interval_tree.
+    :param tree: Drzewo ArrayIntervalTree
+    :param path: Ścieżka pliku
+    """
+    arrays = [(field, np.ascontiguousarray(getattr(tree, field))) for field in ArrayIntervalTree.ARRAY_FIELDS]
+    arrays = [(field, array.astype(array.dtype.newbyteorder('<'), copy=False)) for field, array in arrays]
+
+    # Przesunięcia tablic zależą od długości nagłówka, a nagłówek od przesunięć - zakładamy zapas miejsca
+    header = {'arrays': []}
+    reserved_header_size = len(json.dumps(header)) + 128 * len(arrays)
+    offset = _aligned(_PREAMBLE.size + reserved_header_size)
+    for field, array in arrays:
+        header['arrays'].append({'name': field, 'dtype': array.dtype.str, 'shape': array.shape, 'offset': offset})
+        offset = _aligned(offset + array.nbytes)
+    header_bytes = json.dumps(header).encode('utf-8')
+    assert len(header_bytes) <= reserved_header_size
+
+    with open(path, 'wb') as file:
+        file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for (_, array), description in zip(arrays, header['arrays']):
+            file.seek(description['offset'])
+            file.write(array.tobytes())
+        file.truncate(offset)
+
+
+def load_array_interval_tree(path: str) -> ArrayIntervalTree:
+    """
+    Odczyt drzewa zapisanego przez save_array_interval_tree bez kopiowania danych - tablice drzewa są widokami
+    odwzorowanego w pamięci pliku (tylko do odczytu), więc indeks może być większy od dostępnej pamięci operacyjnej.
+    :param path: Ścieżka pliku
+    :return: Drzewo ArrayIntervalTree
+    """
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, header_size = _PREAMBLE.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f'{path} nie jest plikiem drzewa przedziałów')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Nieobsługiwana wersja formatu: {version} (obsługiwana: {FORMAT_VERSION})')
+    header = json.loads(bytes(mapped[_PREAMBLE.size:_PREAMBLE.size + header_size]).decode('utf-8'))
+
+    arrays = {}
+    for description in header['arrays']:
+        dtype = np.dtype(description['dtype'])
+        shape = tuple(description['shape'])
+        count = int(np.prod(shape))
+        arrays[description['name']] = np.frombuffer(mapped, dtype=dtype, count=count,
+                                                    offset=description['offset']).reshape(shape)
+    return ArrayIntervalTree(**arrays)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 10 ** 9, size=1000000)
+    tree = array_interval_tree(starts, starts + rng.integers(0, 10 ** 4, size=len(starts)))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'interval_tree.bin')
+        save_array_interval_tree(tree, path)
+        loaded_tree = load_array_interval_tree(path)
+        print(loaded_tree)
+        print(query_array_interval_tree(loaded_tree, 5 * 10 ** 8))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+import random
+
+import numpy as np
+import pytest
+
+from dynamic_interval_tree import DynamicIntervalTree
+from interval_tree import (create_interval_tree, sort_points_by_axes, query_internal_tree, iter_query_interval_tree,
+                           batch_query_interval_tree, iter_overlap_interval_tree, count_interval_tree,
+                           array_interval_tree, overlap_array_interval_tree, query_array_interval_tree,
+                           count_array_interval_tree)
+from interval_join import interval_join, iter_interval_join
+from interval_tree_storage import save_array_interval_tree, load_array_interval_tree
+
+
+def random_intervals(count: int, seed: int, max_start: int = 50, max_length: int = 15) -> list:
+    generator = random.Random(seed)
+    intervals = []
+    for _ in range(count):
+        start = generator.randint(0, max_start)
+        intervals.append((start, start + generator.randint(0, max_length)))
+    return intervals
+
+
+def brute_force_query(intervals: list, query_point: float) -> list:
+    return sorted(interval for interval in intervals if interval[0] <= query_point <= interval[1])
+
+
+def brute_force_overlap(intervals: list, query_start: float, query_end: float) -> list:
+    return sorted(interval for interval in intervals if interval[0] <= query_end and query_start <= interval[1])
+
+
+def test_query_internal_tree_point_right_of_median():
+    # Mediana korzenia to 1, a przedziały korzenia posortowane wg prawych końców to (0, 3), (1, 5) - przedział (1, 5)
+    # zawiera punkt 4, choć (0, 3) go nie zawiera
+    intervals = [(1, 5), (2, 10), (0, 3)]
+    root = create_interval_tree(*sort_points_by_axes(intervals))
+    assert query_internal_tree(root, 4) == {(1, 5), (2, 10)}
+    assert sorted(iter_query_interval_tree(root, 4)) == [(1, 5), (2, 10)]
+    assert sorted(batch_query_interval_tree(root, [4])[0]) == [(1, 5), (2, 10)]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_query_interval_tree_random_intervals(seed):
+    intervals = random_intervals(200, seed)
+    root = create_interval_tree(*sort_points_by_axes(intervals))
+    query_points = list(range(-2, 70)) + [0.5, 10.5, 64.5]
+
+    for query_point in query_points:
+        expected = brute_force_query(intervals, query_point)
+        assert query_internal_tree(root, query_point) == set(expected)
+        # Powtórzone przedziały są zwracane tyle razy, ile razy występują
+        assert sorted(iter_query_interval_tree(root, query_point)) == expected
+
+    results = batch_query_interval_tree(root, query_points)
+    assert [sorted(result) for result in results] == [brute_force_query(intervals, q) for q in query_points]
+
+
+def test_query_empty_interval_tree():
+    root = create_interval_tree(*sort_points_by_axes([]))
+    assert query_internal_tree(root, 1) == set()
+    assert list(iter_query_interval_tree(root, 1)) == []
+    assert batch_query_interval_tree(root, [1, 2]) == [[], []]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_overlap_and_count_interval_tree(seed):
+    intervals = random_intervals(200, seed)
+    root = create_interval_tree(*sort_points_by_axes(intervals))
+    generator = random.Random(seed)
+
+    for query_point in range(-2, 70):
+        assert count_interval_tree(root, query_point) == len(brute_force_query(intervals, query_point))
+    for _ in range(100):
+        query_start = generator.randint(-5, 70)
+        query_end = query_start + generator.randint(0, 20)
+        expected = brute_force_overlap(intervals, query_start, query_end)
+        assert sorted(iter_overlap_interval_tree(root, query_start, query_end)) == expected
+        assert count_interval_tree(root, query_start, query_end) == len(expected)
+
+
+def test_count_interval_tree_subtree_counts():
+    intervals = random_intervals(500, 11, max_start=1000, max_length=30)
+    root = create_interval_tree(*sort_points_by_axes(intervals))
+    assert root.subtree_count == len(intervals)
+    assert count_interval_tree(root, -10, 2000) == len(intervals)
+    assert count_interval_tree(None, 0, 1) == 0
+
+
+def test_dynamic_interval_tree_random_updates():
+    generator = random.Random(0)
+    tree = DynamicIntervalTree()
+    intervals = {}
+    for _ in range(2000):
+        if intervals and generator.random() < 0.4:
+            interval_id = generator.choice(list(intervals))
+            tree.delete(interval_id)
+            del intervals[interval_id]
+        else:
+            start = generator.randint(0, 100)
+            interval = (start, start + generator.randint(0, 20))
+            intervals[tree.insert(interval)] = interval
+        assert len(tree) == len(intervals)
+
+        query_start = generator.randint(-5, 125)
+        query_end = query_start + generator.randint(0, 10)
+        expected = brute_force_overlap(list(intervals.values()), query_start, query_end)
+        assert sorted(tree.iter_overlap(query_start, query_end)) == expected
+        assert tree.count(query_start, query_end) == len(expected)
+        assert sorted(tree.query(query_start)) == brute_force_query(list(intervals.values()), query_start)
+        assert tree.count(query_start) == len(brute_force_query(list(intervals.values()), query_start))
+
+    assert all(tree.interval(interval_id) == interval for interval_id, interval in intervals.items())
+    with pytest.raises(KeyError):
+        tree.delete(-1)
+    with pytest.raises(ValueError):
+        tree.insert((2, 1))
+
+
+def check_array_interval_tree(tree, intervals: list, seed: int):
+    generator = random.Random(seed)
+    for query_point in range(-2, 70):
+        expected = brute_force_query(intervals, query_point)
+        assert sorted(intervals[i] for i in query_array_interval_tree(tree, query_point)) == expected
+        assert count_array_interval_tree(tree, query_point) == len(expected)
+    for _ in range(100):
+        query_start = generator.randint(-5, 70)
+        query_end = query_start + generator.randint(0, 20)
+        expected = brute_force_overlap(intervals, query_start, query_end)
+        found = overlap_array_interval_tree(tree, query_start, query_end)
+        assert sorted(intervals[i] for i in found) == expected
+        assert len(set(found.tolist())) == len(found)
+        assert count_array_interval_tree(tree, query_start, query_end) == len(expected)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_array_interval_tree(seed):
+    intervals = random_intervals(300, seed)
+    tree = array_interval_tree(*np.array(intervals).T)
+    assert len(tree) == len(intervals)
+    check_array_interval_tree(tree, intervals, seed)
+
+
+def test_empty_array_interval_tree():
+    tree = array_interval_tree(np.empty(0), np.empty(0))
+    assert len(query_array_interval_tree(tree, 1)) == 0
+    assert count_array_interval_tree(tree, 0, 5) == 0
+
+
+def test_save_and_load_array_interval_tree(tmpdir):
+    intervals = random_intervals(300, 42)
+    tree = array_interval_tree(*np.array(intervals).T)
+    path = str(tmpdir.join('tree.bin'))
+    save_array_interval_tree(tree, path)
+    loaded_tree = load_array_interval_tree(path)
+
+    for field in tree.ARRAY_FIELDS:
+        assert np.array_equal(getattr(loaded_tree, field), getattr(tree, field))
+    check_array_interval_tree(loaded_tree, intervals, 42)
+
+
+def test_load_array_interval_tree_rejects_other_files(tmpdir):
+    path = tmpdir.join('not_a_tree.bin')
+    path.write_binary(b'x' * 64)
+    with pytest.raises(ValueError):
+        load_array_interval_tree(str(path))
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_interval_join(processes):
+    intervals_a, intervals_b = random_intervals(300, 1), random_intervals(200, 2)
+    indices_a, indices_b = interval_join(*np.array(intervals_a).T, *np.array(intervals_b).T, processes=processes)
+    expected = sorted((a, b) for a, (start_a, end_a) in enumerate(intervals_a)
+                      for b, (start_b, end_b) in enumerate(intervals_b) if start_a <= end_b and start_b <= end_a)
+    assert sorted(zip(indices_a.tolist(), indices_b.tolist())) == expected
+
+
+def test_interval_join_small_chunks():
+    intervals_a, intervals_b = random_intervals(100, 3), random_intervals(100, 4)
+    chunks = list(iter_interval_join(*np.array(intervals_a).T, *np.array(intervals_b).T, chunk_size=16))
+    assert all(len(a) == len(b) for a, b in chunks)
+    pairs = sorted((a, b) for chunk_a, chunk_b in chunks for a, b in zip(chunk_a.tolist(), chunk_b.tolist()))
+    indices_a, indices_b = interval_join(*np.array(intervals_a).T, *np.array(intervals_b).T)
+    assert pairs == sorted(zip(indices_a.tolist(), indices_b.tolist()))
+
+
+def test_interval_join_rejects_inverted_intervals():
+    with pytest.raises(ValueError):
+        interval_join(np.array([0, 5]), np.array([1, 4]), np.array([0]), np.array([1]))
@@ -0,0 +1,145 @@
+import math
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from kd_tree import Area, ArrayKDTree, array_kdtree
+
+# Drzewo współdzielone przez proces roboczy puli, ustawiane w _attach_shared_tree
+_worker_tree = None
+_worker_memory = None
+
+
+def areas_to_boxes(areas: list) -> np.ndarray:
+    """
+    :param areas: Lista obszarów Area
+    :return: Tablica (q, 2, d) - boxes[i, 0] to dolne, a boxes[i, 1] górne ograniczenia i-tego obszaru
+    """
+    return np.array([(a.mins, a.maxs) for a in areas], dtype=np.float64)
+
+
+def _expand_ranges(starts: np.ndarray, ends: np.ndarray):
+    """
+    :return: Krotka (numer przedziału, pozycja) dla wszystkich pozycji z przedziałów [starts[i], ends[i])
+    """
+    lengths = ends - starts
+    owners = np.repeat(np.arange(len(starts)), lengths)
+    first_slots = np.cumsum(lengths) - lengths
+    return owners, np.arange(lengths.sum()) - first_slots[owners] + starts[owners]
+
+
+def _query_boxes(tree: ArrayKDTree, boxes: np.ndarray):
+    # Wszystkie zapytania przechodzą przez drzewo jednocześnie - front przeszukiwania to pary (zapytanie, węzeł)
+    lower, upper = boxes[:, 0], boxes[:, 1]
+    queries = np.arange(len(boxes))
+    nodes = np.zeros(len(boxes), dtype=np.int64)
+    found_queries, found_positions = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+
+    while len(nodes):
+        node_min, node_max = tree.bbox_min[nodes], tree.bbox_max[nodes]
+        query_lower, query_upper = lower[queries], upper[queries]
+        intersecting = ~((node_min > query_upper).any(axis=1) | (node_max < query_lower).any(axis=1))
+        inside = intersecting & (node_min >= query_lower).all(axis=1) & (node_max <= query_upper).all(axis=1)
+        leaf = intersecting & ~inside & (tree.split_axis[nodes] < 0)
+
+        owners, positions = _expand_ranges(tree.node_start[nodes[inside]], tree.node_end[nodes[inside]])
+        found_queries.append(queries[inside][owners])
+        found_positions.append(positions)
+
+        owners, positions = _expand_ranges(tree.node_start[nodes[leaf]], tree.node_end[nodes[leaf]])
+        owners = queries[leaf][owners]
+        points = tree.points[positions]
+        within = ((points >= lower[owners]) & (points <= upper[owners])).all(axis=1)
+        found_queries.append(owners[within])
+        found_positions.append(positions[within])
+
+        split = intersecting & ~inside & ~leaf
+        queries = np.repeat(queries[split], 2)
+        nodes = (2 * np.repeat(nodes[split], 2) + 1) + np.tile([0, 1], np.count_nonzero(split))
+
+    found_queries = np.concatenate(found_queries)
+    order = np.argsort(found_queries, kind='stable')
+    counts = np.bincount(found_queries, minlength=len(boxes))
+    return counts, tree.indices[np.concatenate(found_positions)[order]]
+
+
+def _share_tree(tree: ArrayKDTree):
+    """
+    Kopiuje tablice drzewa do jednego bloku pamięci współdzielonej.
+    :return: Krotka (blok pamięci współdzielonej, opis tablic [(nazwa, typ, kształt, przesunięcie)])
+    """
+    layout = []
+    offset = 0
+    for field in ArrayKDTree.ARRAY_FIELDS:
+        array = getattr(tree, field)
+        layout.append((field, array.dtype.str, array.shape, offset))
+        offset += -(-array.nbytes // 64) * 64
+    memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for field, dtype, shape, offset in layout:
+        np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)[...] = getattr(tree, field)
+    return memory, layout
+
+
+def _tree_from_buffer(buffer, layout: list, leaf_size: int) -> ArrayKDTree:
+    arrays = {field: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+              for field, dtype, shape, offset in layout}
+    return ArrayKDTree(leaf_size=leaf_size, **arrays)
+
+
+def _attach_shared_tree(memory_name: str, layout: list, leaf_size: int):
+    global _worker_tree, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_tree = _tree_from_buffer(_worker_memory.buf, layout, leaf_size)
+
+
+def _query_boxes_in_worker(boxes: np.ndarray):
+    return _query_boxes(_worker_tree, boxes)
+
+
+def query_kdtree_batch(tree: ArrayKDTree, boxes, processes: int = 1, chunk_size: int = 1024):
+    """
+    Wykonuje wiele zapytań obszarowych na jednym drzewie tablicowym.
+    Przy processes > 1 zapytania są dzielone na porcje wykonywane przez pulę procesów, które czytają drzewo
+    z pamięci współdzielonej, bez kopiowania go do każdego procesu.
+    :param tree: Drzewo ArrayKDTree
+    :param boxes: Tablica (q, 2, d) ograniczeń obszarów (jak w areas_to_boxes) lub lista obszarów Area
+    :param processes: Liczba procesów roboczych
+    :param chunk_size: Liczba zapytań w jednej porcji
+    :return: Wynik w formacie CSR - krotka (offsets, indices); punkty i-tego zapytania to
+             indices[offsets[i]:offsets[i + 1]] (indeksy w tablicy wejściowej drzewa)
+    """
+    if len(boxes) and isinstance(boxes[0], Area):
+        boxes = areas_to_boxes(boxes)
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 2, tree.dim)
+    chunks = np.array_split(boxes, max(math.ceil(len(boxes) / chunk_size), 1))
+
+    if processes <= 1:
+        results = [_query_boxes(tree, chunk) for chunk in chunks]
+    else:
+        memory, layout = _share_tree(tree)
+        try:
+            with Pool(processes, initializer=_attach_shared_tree,
+                      initargs=(memory.name, layout, tree.leaf_size)) as pool:
+                results = pool.map(_query_boxes_in_worker, chunks)
+        finally:
+            memory.close()
+            memory.unlink()
+
+    offsets = np.zeros(len(boxes) + 1, dtype=np.int64)
+    np.cumsum(np.concatenate([counts for counts, _ in results]), out=offsets[1:])
+    return offsets, np.concatenate([indices for _, indices in results])
+
+
+def main():
+    rng = np.random.default_rng(0)
+    points = rng.random((100000, 2))
+    tree = array_kdtree(points)
+    lower = rng.random((10000, 2)) * 0.99
+    boxes = np.stack([lower, lower + 0.01], axis=1)
+    offsets, indices = query_kdtree_batch(tree, boxes, processes=4)
+    print(f'Zapytania: {len(boxes)}, znalezione punkty: {len(indices)}')
+    print(f'Punkty pierwszego zapytania: {indices[offsets[0]:offsets[1]]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,231 @@
+import time
+
+import numpy as np
+
+from kd_tree import (Area, array_kdtree, query_array_kdtree, knn_array_kdtree, kdtree, sort_points_by_axes,
+                     _area_bounds)
+
+
+class DynamicKDTree:
+    """
+    Dynamiczne drzewo k-wymiarowe z operacjami wstawiania i usuwania (metoda logarytmiczna Bentleya-Saxe'a).
+    Punkty są przechowywane w statycznych drzewach ArrayKDTree o rozmiarach buffer_size * 2**i oraz w małym buforze.
+    Pełny bufor jest scalany z kolejnymi zajętymi poziomami w jedno drzewo, więc każdy punkt jest przebudowywany
+    O(log n) razy. Usunięte punkty są oznaczane i pomijane w zapytaniach, a gdy stanowią ponad połowę
+    przechowywanych punktów, cała struktura jest przebudowywana. Identyfikatory usuniętych punktów są używane
+    ponownie, gdy punkt zniknie ze wszystkich drzew, więc pamięć zależy od liczby przechowywanych punktów,
+    a nie od liczby wszystkich wstawień.
+    """
+    def __init__(self, dim: int = 2, buffer_size: int = 64, leaf_size: int = 16):
+        self.dim = dim
+        self.buffer_size = buffer_size
+        self.leaf_size = leaf_size
+        # levels[i] to None albo krotka (ArrayKDTree, identyfikatory punktów drzewa)
+        self.levels = []
+        self._buffer = []
+        # Pozycje identyfikatorów w buforze
+        self._buffer_position = {}
+        self._coordinates = np.empty((buffer_size, dim), dtype=np.float64)
+        self._alive = np.zeros(buffer_size, dtype=bool)
+        # Identyfikatory mniejsze od _next_id, nieużywane przez żaden punkt ani żadne drzewo
+        self._free_ids = []
+        self._next_id = 0
+        self._stored = 0
+        self._deleted = 0
+
+    def __len__(self):
+        return self._stored - self._deleted
+
+    def __repr__(self):
+        sizes = [len(level[1]) if level else 0 for level in self.levels]
+        return f'DynamicKDTree(points={len(self)}, buffer={len(self._buffer)}, levels={sizes})'
+
+    def point(self, point_id: int) -> np.ndarray:
+        return self._coordinates[point_id]
+
+    def insert(self, point) -> int:
+        """
+        Wstawienie punktu. Zamortyzowana złożoność obliczeniowa: O(log^2 n).
+        :param point: Współrzędne punktu
+        :return: Identyfikator punktu używany przez delete i zwracany przez zapytania
+        """
+        if self._free_ids:
+            point_id = self._free_ids.pop()
+        else:
+            point_id = self._next_id
+            self._next_id += 1
+        if point_id == len(self._coordinates):
+            self._coordinates = np.concatenate([self._coordinates, np.empty_like(self._coordinates)])
+            self._alive = np.concatenate([self._alive, np.zeros_like(self._alive)])
+        self._coordinates[point_id] = point
+        self._alive[point_id] = True
+        self._buffer_position[point_id] = len(self._buffer)
+        self._buffer.append(point_id)
+        self._stored += 1
+
+        if len(self._buffer) >= self.buffer_size:
+            self._merge_buffer()
+        return point_id
+
+    def delete(self, point_id: int):
+        """
+        Usunięcie punktu o podanym identyfikatorze.
+        """
+        if not 0 <= point_id < self._next_id or not self._alive[point_id]:
+            raise KeyError(point_id)
+        self._alive[point_id] = False
+        position = self._buffer_position.pop(point_id, None)
+        if position is not None:
+            # Ostatni punkt bufora zajmuje miejsce usuniętego
+            last_id = self._buffer.pop()
+            if last_id != point_id:
+                self._buffer[position] = last_id
+                self._buffer_position[last_id] = position
+            self._free_ids.append(point_id)
+            self._stored -= 1
+            return
+        self._deleted += 1
+        if self._deleted * 2 > self._stored:
+            self.rebuild()
+
+    def rebuild(self):
+        """
+        Przebudowa wszystkich poziomów w jedno drzewo z pominięciem usuniętych punktów.
+        """
+        ids = np.flatnonzero(self._alive[:self._next_id])
+        self._free_ids = np.flatnonzero(~self._alive[:self._next_id]).tolist()
+        self._buffer = []
+        self._buffer_position = {}
+        self.levels = []
+        self._stored = len(ids)
+        self._deleted = 0
+        if len(ids):
+            level = max(int(np.ceil(np.log2(max(len(ids) / self.buffer_size, 1)))), 0)
+            self.levels = [None] * level + [self._build_level(ids)]
+
+    def _build_level(self, ids: np.ndarray):
+        return array_kdtree(self._coordinates[ids], leaf_size=self.leaf_size), ids
+
+    def _merge_buffer(self):
+        parts = [np.array(self._buffer, dtype=np.int64)]
+        level = 0
+        while level < len(self.levels) and self.levels[level]:
+            parts.append(self.levels[level][1])
+            self.levels[level] = None
+            level += 1
+        if level == len(self.levels):
+            self.levels.append(None)
+
+        ids = np.concatenate(parts)
+        alive = self._alive[ids]
+        self._deleted -= np.count_nonzero(~alive)
+        self._stored -= np.count_nonzero(~alive)
+        self._free_ids.extend(ids[~alive].tolist())
+        ids = ids[alive]
+        self._buffer = []
+        self._buffer_position = {}
+        if len(ids):
+            self.levels[level] = self._build_level(ids)
+
+    def query(self, query_area: Area) -> np.ndarray:
+        """
+        Wyszukiwanie punktów należących do obszaru query_area.
+        :return: Tablica identyfikatorów punktów
+        """
+        found = []
+        for level in filter(None, self.levels):
+            tree, ids = level
+            found.append(ids[query_array_kdtree(tree, query_area)])
+        buffer_ids = np.array(self._buffer, dtype=np.int64)
+        if len(buffer_ids):
+            points = self._coordinates[buffer_ids]
+            lower, upper = _area_bounds(query_area)
+            found.append(buffer_ids[((points >= lower) & (points <= upper)).all(axis=1)])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        found = np.concatenate(found)
+        return found[self._alive[found]]
+
+    def query_knn(self, point, k: int):
+        """
+        Wyszukiwanie k najbliższych sąsiadów punktu.
+        :return: Krotka (odległości, identyfikatory punktów) posortowana rosnąco wg odległości
+        """
+        point = np.asarray(point, dtype=np.float64)
+        candidate_distances, candidate_ids = [], []
+        for level in filter(None, self.levels):
+            tree, ids = level
+            # Usunięte punkty mogą zasłaniać żywe, więc w razie potrzeby zwiększamy liczbę szukanych sąsiadów
+            level_k = k
+            while True:
+                distances, indices = knn_array_kdtree(tree, point, level_k)
+                alive = self._alive[ids[indices]]
+                if np.count_nonzero(alive) >= k or level_k >= len(ids):
+                    break
+                level_k *= 2
+            candidate_distances.append(distances[alive])
+            candidate_ids.append(ids[indices][alive])
+        buffer_ids = np.array(self._buffer, dtype=np.int64)
+        candidate_distances.append(np.sqrt(((self._coordinates[buffer_ids] - point) ** 2).sum(axis=1)))
+        candidate_ids.append(buffer_ids)
+
+        distances = np.concatenate(candidate_distances)
+        order = np.argsort(distances, kind='stable')[:k]
+        return distances[order], np.concatenate(candidate_ids)[order]
+
+
+def benchmark_updates(points_count: int = 100000, update_fraction: float = 0.02, rounds: int = 5, seed: int = 0):
+    """
+    Porównanie czasu aktualizacji drzewa dynamicznego z pełną przebudową drzew statycznych.
+    W każdej rundzie usuwana jest część update_fraction punktów i wstawiana taka sama liczba nowych.
+    :return: Słownik z czasami [s] jednej rundy dla poszczególnych metod
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.random((points_count, 2))
+    updates_count = int(points_count * update_fraction)
+
+    tree = DynamicKDTree(dim=2)
+    ids = [tree.insert(p) for p in points]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for position in rng.choice(len(ids), updates_count, replace=False):
+            tree.delete(ids[position])
+            ids[position] = tree.insert(rng.random(2))
+    dynamic_time = (time.perf_counter() - start) / rounds
+
+    array_rebuild_time = node_rebuild_time = 0
+    for _ in range(rounds):
+        points[rng.choice(points_count, updates_count, replace=False)] = rng.random((updates_count, 2))
+        start = time.perf_counter()
+        array_kdtree(points)
+        array_rebuild_time += (time.perf_counter() - start) / rounds
+
+        point_list = [tuple(p) for p in points.tolist()]
+        start = time.perf_counter()
+        kdtree(*sort_points_by_axes(point_list))
+        node_rebuild_time += (time.perf_counter() - start) / rounds
+
+    return {
+        'dynamic': dynamic_time,
+        'array_kdtree_rebuild': array_rebuild_time,
+        'kdtree_rebuild': node_rebuild_time,
+        'updates_per_round': 2 * updates_count,
+    }
+
+
+def main():
+    tree = DynamicKDTree(dim=2, buffer_size=4)
+    ids = [tree.insert(p) for p in [(2, 3), (5, 4), (9, 6), (4, 7), (8, 1), (7, 2)]]
+    tree.delete(ids[1])
+    print(tree)
+    print([tuple(tree.point(i).tolist()) for i in tree.query(Area(x_min=4, x_max=7, y_min=2, y_max=7))])
+
+    results = benchmark_updates()
+    updates = results['updates_per_round']
+    print(f'Aktualizacje na rundę: {updates}')
+    for method in ('dynamic', 'array_kdtree_rebuild', 'kdtree_rebuild'):
+        print(f'{method}: {results[method]:.4f} s/rundę, {updates / results[method]:.0f} aktualizacji/s')
+
+
+if __name__ == '__main__':
+    main()
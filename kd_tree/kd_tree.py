@@ -1,23 +1,79 @@
+import heapq
+import itertools
+
+import numpy as np
+
+
 class Area:
-    def __init__(self, x_min, x_max, y_min, y_max):
-        self.x_min = x_min
-        self.x_max = x_max
-        self.y_min = y_min
-        self.y_max = y_max
+    """
+    Prostopadłościan o krawędziach równoległych do osi układu współrzędnych. Obszar dwuwymiarowy można podać
+    przez x_min, x_max, y_min, y_max, a obszar o dowolnej liczbie wymiarów przez krotki mins i maxs.
+    """
+    __slots__ = ('mins', 'maxs', 'planar', 'x_min', 'x_max', 'y_min', 'y_max')
+
+    def __init__(self, x_min=None, x_max=None, y_min=None, y_max=None, mins: tuple=None, maxs: tuple=None):
+        # Obszary dwuwymiarowe (najczęstszy przypadek) są tworzone i sprawdzane bezpośrednimi operacjami
+        # na współrzędnych, bez pętli po osiach
+        if mins is None or maxs is None:
+            self.mins, self.maxs = (x_min, y_min), (x_max, y_max)
+            self.planar = True
+            self.x_min, self.x_max, self.y_min, self.y_max = x_min, x_max, y_min, y_max
+            return
+        assert len(mins) == len(maxs)
+        self.mins = tuple(mins)
+        self.maxs = tuple(maxs)
+        self.planar = len(self.mins) == 2
+        self.x_min, self.x_max = self.mins[0], self.maxs[0]
+        if len(self.mins) > 1:
+            self.y_min, self.y_max = self.mins[1], self.maxs[1]
 
     def __repr__(self):
-        return f'X: {self.x_min} - {self.x_max}, Y: {self.y_min} - {self.y_max}'
+        return ', '.join(f'{_axis_label(axis)}: {low} - {high}'
+                         for axis, (low, high) in enumerate(zip(self.mins, self.maxs)))
+
+    @property
+    def dim(self):
+        return len(self.mins)
 
     def is_intersecting(self, other_area):
-        return (self.x_min <= other_area.x_max and other_area.x_min <= self.x_max or
-                self.y_min <= other_area.y_max and other_area.y_min <= self.y_max)
+        if self.planar:
+            return (self.x_min <= other_area.x_max and other_area.x_min <= self.x_max and
+                    self.y_min <= other_area.y_max and other_area.y_min <= self.y_max)
+        mins, maxs, other_mins, other_maxs = self.mins, self.maxs, other_area.mins, other_area.maxs
+        for axis in range(len(mins)):
+            if mins[axis] > other_maxs[axis] or other_mins[axis] > maxs[axis]:
+                return False
+        return True
 
     def is_subarea(self, other_area):
-        return (self.x_min >= other_area.x_min and self.x_max <= other_area.x_max and
-                self.y_min >= other_area.y_min and self.y_max <= other_area.y_max)
+        if self.planar:
+            return (self.x_min >= other_area.x_min and self.x_max <= other_area.x_max and
+                    self.y_min >= other_area.y_min and self.y_max <= other_area.y_max)
+        mins, maxs, other_mins, other_maxs = self.mins, self.maxs, other_area.mins, other_area.maxs
+        for axis in range(len(mins)):
+            if mins[axis] < other_mins[axis] or maxs[axis] > other_maxs[axis]:
+                return False
+        return True
 
     def is_point_within_area(self, point: tuple):
-        return self.x_min <= point[0] <= self.x_max and self.y_min <= point[1] <= self.y_max
+        if self.planar:
+            return self.x_min <= point[0] <= self.x_max and self.y_min <= point[1] <= self.y_max
+        mins, maxs = self.mins, self.maxs
+        for axis in range(len(mins)):
+            if not mins[axis] <= point[axis] <= maxs[axis]:
+                return False
+        return True
+
+    def squared_distance_to_point(self, point: tuple):
+        if self.planar:
+            dx = max(self.x_min - point[0], 0, point[0] - self.x_max)
+            dy = max(self.y_min - point[1], 0, point[1] - self.y_max)
+            return dx * dx + dy * dy
+        return sum(max(low - p, 0, p - high) ** 2 for low, p, high in zip(self.mins, point, self.maxs))
+
+
+def _axis_label(axis: int):
+    return 'XYZ'[axis] if axis < 3 else f'X{axis + 1}'
 
 
 class Node:
@@ -27,6 +83,11 @@ class Node:
         self.area = area
         self.left_child = left_child
         self.right_child = right_child
+        # Liczba punktów (liści) w poddrzewie
+        if point is not None:
+            self.count = 1
+        else:
+            self.count = (left_child.count if left_child else 0) + (right_child.count if right_child else 0)
 
     def __str__(self, level=0):
         if self.point:
@@ -63,79 +124,137 @@ def inorder_traversal_leaves(node: Node):
 
 def sort_points_by_axes(points: list):
     """
-    Sortowanie listy punktów wg współrzędnych x i y. Złożoność obliczeniowa: O(n log n).
+    Sortowanie listy punktów wg kolejnych współrzędnych. Złożoność obliczeniowa: O(d * n log n).
     :param points: Lista krotek zawierających współrzędne punktów - [(x1, y1), (x2, y2),..., (xn, yn)]
-    :return: Krotka zawierająca listę punktów posortowanych leksykograficznie wg współrzędnej x oraz
-             listę punktów posortowanych wg współrzędnej y - ([punkty posortowane wg x], [punkty posortowane wg y])
+    :return: Krotka d list: punkty posortowane leksykograficznie (czyli wg współrzędnej x), a następnie punkty
+             posortowane wg kolejnych współrzędnych - ([punkty posortowane wg x], [punkty posortowane wg y], ...)
     """
-    points_sorted_by_x = sorted(points, key=lambda point: (point[0], point[1]))
-    points_sorted_by_y = sorted(points, key=lambda point: point[1])
-    return points_sorted_by_x, points_sorted_by_y
+    dim = len(points[0]) if points else 2
+    points_sorted_by_x = sorted(points, key=tuple)
+    points_sorted_by_other_axes = [sorted(points, key=lambda point: point[axis]) for axis in range(1, dim)]
+    return (points_sorted_by_x, *points_sorted_by_other_axes)
+
 
+# Poddrzewa o co najwyżej tylu punktach są budowane na listach zamiast tablic NumPy
+_SMALL_SUBTREE_SIZE = 64
 
-def split_points_list(points_x: list, points_y: list, split_axis: int):
-    assert split_axis == 0 or split_axis == 1
-    if split_axis == 0:
-        other_axis = 1
+
+def _orders_from_sorted_points(points: list, points_sorted_by_axes: tuple) -> np.ndarray:
+    """
+    :return: Tablica (d, n), której wiersz a zawiera indeksy punktów z listy points w kolejności listy
+             points_sorted_by_axes[a] (powtórzone punkty otrzymują kolejne indeksy)
+    """
+    indices_by_point = {}
+    for index, point in enumerate(points):
+        indices_by_point.setdefault(tuple(point), []).append(index)
+
+    orders = np.empty((len(points_sorted_by_axes), len(points)), dtype=np.int64)
+    orders[0] = np.arange(len(points))
+    for axis, sorted_points in enumerate(points_sorted_by_axes[1:], start=1):
+        used = dict.fromkeys(indices_by_point, 0)
+        for position, point in enumerate(sorted_points):
+            key = tuple(point)
+            orders[axis, position] = indices_by_point[key][used[key]]
+            used[key] += 1
+    return orders
+
+
+def _kdtree_from_order_lists(points: list, ranks: dict, orders: list, depth: int) -> Node:
+    # Wariant _kdtree_from_orders dla małych poddrzew, w których narzut operacji NumPy przeważa nad ich zyskiem.
+    # ranks[a][i] - pozycja punktu i w porządku osi a
+    planar = len(orders) == 2
+    if len(orders[0]) == 1:
+        point = points[orders[0][0]]
+        area = Area(point[0], point[0], point[1], point[1]) if planar else Area(mins=point, maxs=point)
+        return Node(point=point, area=area)
+
+    axis = depth % len(orders)
+    median = len(orders[axis]) // 2
+    splitting_index = orders[axis][median]
+    axis_ranks = ranks[axis]
+    splitting_rank = axis_ranks[splitting_index]
+    # Porządek osi podziału wystarczy przeciąć w połowie, pozostałe porządki są filtrowane wg pozycji na tej osi
+    left_orders = [order[:median] if a == axis else [i for i in order if axis_ranks[i] < splitting_rank]
+                   for a, order in enumerate(orders)]
+    right_orders = [order[median:] if a == axis else [i for i in order if axis_ranks[i] >= splitting_rank]
+                    for a, order in enumerate(orders)]
+
+    if planar:
+        x_order, y_order = orders
+        area = Area(points[x_order[0]][0], points[x_order[-1]][0], points[y_order[0]][1], points[y_order[-1]][1])
     else:
-        other_axis = 0
-
-    points_sorted_by_split_axis = [points_x, points_y][split_axis]
-    points_sorted_by_other_axis = [points_x, points_y][other_axis]
-    median = len(points_sorted_by_split_axis) // 2
-    splitting_point = points_sorted_by_split_axis[median]
-    splitting_line = splitting_point[split_axis]
-    left_axis_points, right_axis_points = points_sorted_by_split_axis[:median], points_sorted_by_split_axis[median:]
-    left_other_points = [p for p in points_sorted_by_other_axis if p[split_axis] < splitting_point[split_axis]
-                         or (p[split_axis] == splitting_point[split_axis]
-                             and p[other_axis] < splitting_point[other_axis])]
-    right_other_points = [p for p in points_sorted_by_other_axis if p[split_axis] > splitting_point[split_axis]
-                          or (p[split_axis] == splitting_point[split_axis]
-                              and p[other_axis] >= splitting_point[other_axis])]
-
-    return splitting_line, left_axis_points, right_axis_points, left_other_points, right_other_points
-
-
-def kdtree(points_x: list, points_y: list, depth=0):
-    if not points_x or not points_y:
-        return None
+        area = Area(mins=[points[order[0]][a] for a, order in enumerate(orders)],
+                    maxs=[points[order[-1]][a] for a, order in enumerate(orders)])
+    return Node(split_line=points[splitting_index][axis],
+                area=area,
+                left_child=_kdtree_from_order_lists(points, ranks, left_orders, depth + 1),
+                right_child=_kdtree_from_order_lists(points, ranks, right_orders, depth + 1))
+
+
+def _kdtree_from_orders(points: list, ranks: np.ndarray, orders: np.ndarray, depth: int) -> Node:
+    # orders[a] - indeksy punktów poddrzewa posortowane wg osi a, ranks[a, i] - pozycja punktu i w porządku osi a
+    dim, count = orders.shape
+    if count <= _SMALL_SUBTREE_SIZE:
+        subtree_indices = orders[0]
+        subtree_ranks = [dict(zip(subtree_indices.tolist(), axis_ranks))
+                         for axis_ranks in ranks[:, subtree_indices].tolist()]
+        return _kdtree_from_order_lists(points, subtree_ranks, orders.tolist(), depth)
+
+    # Wyznaczamy oś podziału - kolejne osie na kolejnych poziomach drzewa
+    axis = depth % dim
+    median = count // 2
+    splitting_point = points[orders[axis, median]]
+
+    # Punkty poprzedzające punkt środkowy w porządku osi podziału trafiają do lewego poddrzewa. Podział zachowuje
+    # uporządkowanie każdego wiersza, a każdy wiersz ma dokładnie median takich punktów.
+    is_left = ranks[axis][orders] < ranks[axis, orders[axis, median]]
+    left_orders = orders[is_left].reshape(dim, median)
+    right_orders = orders[~is_left].reshape(dim, count - median)
+
+    if dim == 2:
+        (x_first, y_first), (x_last, y_last) = orders[:, 0].tolist(), orders[:, -1].tolist()
+        area = Area(points[x_first][0], points[x_last][0], points[y_first][1], points[y_last][1])
+    else:
+        area = Area(mins=[points[i][a] for a, i in enumerate(orders[:, 0].tolist())],
+                    maxs=[points[i][a] for a, i in enumerate(orders[:, -1].tolist())])
+    return Node(split_line=splitting_point[axis],
+                area=area,
+                left_child=_kdtree_from_orders(points, ranks, left_orders, depth + 1),
+                right_child=_kdtree_from_orders(points, ranks, right_orders, depth + 1))
 
-    assert len(points_x) == len(points_y)
 
-    if len(points_x) == len(points_y) == 1:
-        return Node(point=points_x[0],
-                    area=Area(points_x[0][0], points_x[0][0], points_x[0][1], points_x[0][1]),
-                    left_child=None,
-                    right_child=None)
+def kdtree(*points_sorted_by_axes: list, depth: int = 0):
+    """
+    Budowa drzewa k-wymiarowego. Złożoność obliczeniowa: O(d * n log n), pamięciowa (poza węzłami): O(d * n).
+    Parametr depth należy podawać jako nazwany. Dla zgodności z wcześniejszą, dwuwymiarową wersją funkcji
+    wywołanie kdtree(points_x, points_y, depth) z głębokością jako trzecim argumentem pozycyjnym również działa.
+    :param points_sorted_by_axes: Listy punktów posortowanych wg kolejnych osi (wynik sort_points_by_axes)
+    :param depth: Głębokość korzenia, wyznacza pierwszą oś podziału
+    :return: Korzeń drzewa
+    """
+    if len(points_sorted_by_axes) == 3 and isinstance(points_sorted_by_axes[2], int):
+        *points_sorted_by_axes, depth = points_sorted_by_axes
+    if not points_sorted_by_axes or not points_sorted_by_axes[0]:
+        return None
 
+    points = points_sorted_by_axes[0]
     # Zakładamy, że wszystkie punkty mają tyle samo wymiarów co pierwszy
-    dim = len(points_x[0])
+    dim = len(points[0])
     assert dim > 0
+    assert len(points_sorted_by_axes) == dim
+    assert all(len(sorted_points) == len(points) for sorted_points in points_sorted_by_axes)
 
-    # Wyznaczamy oś podziału (axis == 0 - poziomo, axis === 1 - pionowo)
-    axis = depth % dim
-
-    # Wyznaczamy indeks środkowego punktu oraz dzielimy zbiór na pół wg osi podziału
-    if axis == 0:
-        splitting_line, left_points_x, right_points_x, left_points_y, right_points_y = split_points_list(points_x,
-                                                                                                         points_y,
-                                                                                                         axis)
-    else:
-        splitting_line, left_points_y, right_points_y, left_points_x, right_points_x = split_points_list(points_x,
-                                                                                                         points_y,
-                                                                                                         axis)
-
-    assert len(left_points_x) == len(left_points_y)
-    assert len(right_points_x) == len(right_points_y)
-
-    # Zwracamy węzeł i rekurencyjnie wyznaczamy poddrzewa
-    return Node(split_line=splitting_line,
-                area=Area(points_x[0][0], points_x[-1][0], points_y[0][1], points_y[-1][1]),
-                left_child=kdtree(left_points_x, left_points_y, depth + 1),
-                right_child=kdtree(right_points_x, right_points_y, depth + 1))
+    # Zamiast kopiować listy punktów, na każdym poziomie dzielimy tablice indeksów uporządkowanych wg kolejnych osi
+    orders = _orders_from_sorted_points(points, points_sorted_by_axes)
+    ranks = np.empty_like(orders)
+    np.put_along_axis(ranks, orders, np.arange(len(points)), axis=1)
+    return _kdtree_from_orders(points, ranks, orders, depth)
 
 
 def query_kdtree(node: Node, query_area: Area) -> set:
+    if isinstance(node, ArrayKDTree):
+        positions = _query_positions(node, *_area_bounds(query_area))
+        return {_point_leaf(tuple(point)) for point in node.points[positions].tolist()}
     if not node:
         return set()
     if node.is_leaf() and query_area.is_point_within_area(node.point):
@@ -146,12 +265,387 @@ def query_kdtree(node: Node, query_area: Area) -> set:
     return query_kdtree(node.left_child, query_area).union(query_kdtree(node.right_child, query_area))
 
 
+class ArrayKDTree:
+    """
+    Drzewo k-wymiarowe zapisane w ciągłych tablicach NumPy, bez obiektów Node i Area.
+    Węzeł i ma dzieci 2i + 1 oraz 2i + 2 i obejmuje punkty points[node_start[i]:node_end[i]].
+    Punkty są przechowywane w kolejności drzewa, a indices[j] to indeks punktu points[j] w tablicy wejściowej.
+    Liczba punktów węzła to node_end[i] - node_start[i], a suma ich wag to node_weight[i]. Sumy są liczone
+    osobno dla każdego węzła (a nie jako różnice jednej sumy prefiksowej), więc błąd zaokrągleń sumy zależy
+    od wag w węźle, a nie od wartości sumy prefiksowej.
+    """
+    ARRAY_FIELDS = ('points', 'indices', 'node_start', 'node_end', 'split_axis', 'split_value', 'bbox_min',
+                    'bbox_max', 'weights', 'node_weight')
+
+    def __init__(self, points, indices, node_start, node_end, split_axis, split_value, bbox_min, bbox_max,
+                 weights, node_weight, leaf_size: int):
+        self.points = points
+        self.indices = indices
+        self.node_start = node_start
+        self.node_end = node_end
+        self.split_axis = split_axis
+        self.split_value = split_value
+        self.bbox_min = bbox_min
+        self.bbox_max = bbox_max
+        self.weights = weights
+        self.node_weight = node_weight
+        self.leaf_size = leaf_size
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        return f'ArrayKDTree(points={len(self)}, dim={self.dim}, nodes={len(self.node_start)})'
+
+    @property
+    def dim(self):
+        return self.points.shape[1]
+
+    def is_leaf(self, node: int):
+        return self.split_axis[node] < 0
+
+
+def array_kdtree(points, leaf_size: int = 16, weights=None) -> ArrayKDTree:
+    """
+    Budowa drzewa k-wymiarowego w postaci tablicowej. Złożoność obliczeniowa: O(n log n), pamięciowa: O(d * n).
+    :param points: Tablica (n, d) współrzędnych punktów
+    :param leaf_size: Maksymalna liczba punktów w liściu
+    :param weights: Opcjonalne wagi punktów (domyślnie 1) sumowane przez sum_in_area, tablica długości n
+    :return: Drzewo ArrayKDTree
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or not len(points):
+        raise ValueError('Podaj niepustą tablicę punktów o wymiarach (n, d)')
+    assert leaf_size >= 1
+
+    points_count, dim = points.shape
+    if weights is None:
+        weights = np.ones(points_count)
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (points_count,):
+        raise ValueError(f'Tablica wag ma kształt {weights.shape}, a powinna mieć ({points_count},)')
+
+    # Wysokość drzewa - największy węzeł na poziomie h zawiera ceil(n / 2**h) punktów
+    height = 0
+    while -(-points_count // 2 ** height) > leaf_size:
+        height += 1
+    nodes_count = 2 ** (height + 1) - 1
+
+    node_start = np.zeros(nodes_count, dtype=np.int64)
+    node_end = np.zeros(nodes_count, dtype=np.int64)
+    split_axis = np.full(nodes_count, -1, dtype=np.int8)
+    split_value = np.full(nodes_count, np.nan)
+    permutation = np.arange(points_count, dtype=np.int64)
+    node_end[0] = points_count
+
+    # Węzły w kolejności kopcowej są przetwarzane poziomami, więc przedział rodzica jest ustalony przed dziećmi
+    for node in range(nodes_count):
+        start, end = int(node_start[node]), int(node_end[node])
+        if end - start <= leaf_size:
+            continue
+        axis = ((node + 1).bit_length() - 1) % dim
+        median = (end - start) // 2
+        segment = permutation[start:end]
+        permutation[start:end] = segment[np.argpartition(points[segment, axis], median)]
+        split_axis[node] = axis
+        split_value[node] = points[permutation[start + median], axis]
+        node_start[2 * node + 1], node_end[2 * node + 1] = start, start + median
+        node_start[2 * node + 2], node_end[2 * node + 2] = start + median, end
+
+    ordered_points = np.ascontiguousarray(points[permutation])
+    ordered_weights = np.ascontiguousarray(weights[permutation])
+
+    # Prostokąty ograniczające liści wyznaczamy jednym przebiegiem, a węzłów wewnętrznych - od dołu poziomami
+    bbox_min = np.full((nodes_count, dim), np.inf)
+    bbox_max = np.full((nodes_count, dim), -np.inf)
+    leaves = np.flatnonzero((split_axis < 0) & (node_end > node_start))
+    leaves = leaves[np.argsort(node_start[leaves])]
+    bbox_min[leaves] = np.minimum.reduceat(ordered_points, node_start[leaves], axis=0)
+    bbox_max[leaves] = np.maximum.reduceat(ordered_points, node_start[leaves], axis=0)
+    node_weight = np.zeros(nodes_count)
+    node_weight[leaves] = np.add.reduceat(ordered_weights, node_start[leaves])
+    for level in reversed(range(height)):
+        level_nodes = np.arange(2 ** level - 1, 2 ** (level + 1) - 1)
+        level_nodes = level_nodes[split_axis[level_nodes] >= 0]
+        bbox_min[level_nodes] = np.minimum(bbox_min[2 * level_nodes + 1], bbox_min[2 * level_nodes + 2])
+        bbox_max[level_nodes] = np.maximum(bbox_max[2 * level_nodes + 1], bbox_max[2 * level_nodes + 2])
+        node_weight[level_nodes] = node_weight[2 * level_nodes + 1] + node_weight[2 * level_nodes + 2]
+
+    return ArrayKDTree(points=ordered_points, indices=permutation, node_start=node_start, node_end=node_end,
+                       split_axis=split_axis, split_value=split_value, bbox_min=bbox_min, bbox_max=bbox_max,
+                       weights=ordered_weights, node_weight=node_weight, leaf_size=leaf_size)
+
+
+def _area_bounds(area: Area):
+    return np.array(area.mins, dtype=np.float64), np.array(area.maxs, dtype=np.float64)
+
+
+def _point_leaf(point: tuple) -> Node:
+    return Node(point=point, area=Area(mins=point, maxs=point))
+
+
+def _query_positions(tree: ArrayKDTree, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    found = []
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        node_min, node_max = tree.bbox_min[node], tree.bbox_max[node]
+        if (node_min > upper).any() or (node_max < lower).any():
+            continue
+        start, end = tree.node_start[node], tree.node_end[node]
+        if (node_min >= lower).all() and (node_max <= upper).all():
+            found.append(np.arange(start, end))
+        elif tree.is_leaf(node):
+            points = tree.points[start:end]
+            found.append(start + np.flatnonzero(((points >= lower) & (points <= upper)).all(axis=1)))
+        else:
+            stack.append(2 * node + 2)
+            stack.append(2 * node + 1)
+
+    if not found:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(found)
+
+
+def query_array_kdtree(tree: ArrayKDTree, query_area: Area) -> np.ndarray:
+    """
+    Wyszukiwanie punktów drzewa tablicowego należących do obszaru query_area.
+    :param tree: Drzewo ArrayKDTree
+    :param query_area: Obszar zapytania
+    :return: Tablica indeksów (w tablicy wejściowej) punktów należących do obszaru
+    """
+    return tree.indices[_query_positions(tree, *_area_bounds(query_area))]
+
+
+def _aggregate_in_box(tree: ArrayKDTree, lower: np.ndarray, upper: np.ndarray, weighted: bool):
+    # Węzły w całości zawarte w obszarze są zliczane w O(1), bez odwiedzania ich poddrzew
+    total = 0
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        node_min, node_max = tree.bbox_min[node], tree.bbox_max[node]
+        if (node_min > upper).any() or (node_max < lower).any():
+            continue
+        start, end = tree.node_start[node], tree.node_end[node]
+        if (node_min >= lower).all() and (node_max <= upper).all():
+            total += tree.node_weight[node] if weighted else end - start
+        elif tree.is_leaf(node):
+            points = tree.points[start:end]
+            within = ((points >= lower) & (points <= upper)).all(axis=1)
+            total += tree.weights[start:end][within].sum() if weighted else np.count_nonzero(within)
+        else:
+            stack.append(2 * node + 2)
+            stack.append(2 * node + 1)
+    return total
+
+
+def _count_nodes(node: Node, query_area: Area) -> int:
+    if not node or not node.area.is_intersecting(query_area):
+        return 0
+    if node.is_leaf():
+        return 1 if query_area.is_point_within_area(node.point) else 0
+    if node.area.is_subarea(query_area):
+        return node.count
+    return _count_nodes(node.left_child, query_area) + _count_nodes(node.right_child, query_area)
+
+
+def count_in_area(tree, query_area: Area) -> int:
+    """
+    Zliczanie punktów należących do obszaru bez wyznaczania zbioru wynikowego. Poddrzewa zawarte w obszarze
+    są zliczane na podstawie zapamiętanej liczby punktów, więc odwiedzanych jest O(sqrt(n)) węzłów.
+    :param tree: Korzeń drzewa (Node) lub drzewo ArrayKDTree
+    :param query_area: Obszar zapytania
+    :return: Liczba punktów w obszarze
+    """
+    if isinstance(tree, ArrayKDTree):
+        return int(_aggregate_in_box(tree, *_area_bounds(query_area), weighted=False))
+    return _count_nodes(tree, query_area)
+
+
+def sum_in_area(tree: ArrayKDTree, query_area: Area) -> float:
+    """
+    Suma wag punktów należących do obszaru (wagi podane w array_kdtree).
+    :param tree: Drzewo ArrayKDTree
+    :param query_area: Obszar zapytania
+    :return: Suma wag punktów w obszarze
+    """
+    return float(_aggregate_in_box(tree, *_area_bounds(query_area), weighted=True))
+
+
+def _squared_distance(point_a, point_b):
+    return sum((a - b) ** 2 for a, b in zip(point_a, point_b))
+
+
+def _knn_nodes(node: Node, point: tuple, k: int, heap: list, counter):
+    if not node:
+        return
+    # Kopiec przechowuje k najbliższych punktów z ujemnym kwadratem odległości, więc heap[0] to najdalszy z nich
+    if len(heap) == k and node.area.squared_distance_to_point(point) >= -heap[0][0]:
+        return
+    if node.is_leaf():
+        item = (-_squared_distance(node.point, point), next(counter), node.point)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+        return
+    children = [c for c in (node.left_child, node.right_child) if c]
+    for child in sorted(children, key=lambda c: c.area.squared_distance_to_point(point)):
+        _knn_nodes(child, point, k, heap, counter)
+
+
+def _radius_nodes(node: Node, point: tuple, squared_radius: float, found: list):
+    if not node or node.area.squared_distance_to_point(point) > squared_radius:
+        return
+    if node.is_leaf():
+        found.append((_squared_distance(node.point, point), node.point))
+        return
+    _radius_nodes(node.left_child, point, squared_radius, found)
+    _radius_nodes(node.right_child, point, squared_radius, found)
+
+
+def _squared_distances_to_boxes(tree: ArrayKDTree, nodes, point: np.ndarray) -> np.ndarray:
+    gaps = np.maximum(np.maximum(tree.bbox_min[nodes] - point, point - tree.bbox_max[nodes]), 0)
+    return (gaps * gaps).sum(axis=-1)
+
+
+def _knn_positions(tree: ArrayKDTree, point, k: int):
+    point = np.asarray(point, dtype=np.float64)
+    heap = []
+    worst = np.inf
+    stack = [(0.0, 0)]
+    while stack:
+        lower_bound, node = stack.pop()
+        if lower_bound >= worst:
+            continue
+        start, end = tree.node_start[node], tree.node_end[node]
+        if tree.is_leaf(node):
+            differences = tree.points[start:end] - point
+            squared_distances = np.einsum('ij,ij->i', differences, differences)
+            for position in np.flatnonzero(squared_distances < worst):
+                squared_distance = squared_distances[position]
+                if squared_distance >= worst:
+                    continue
+                if len(heap) < k:
+                    heapq.heappush(heap, (-squared_distance, start + position))
+                else:
+                    heapq.heapreplace(heap, (-squared_distance, start + position))
+                if len(heap) == k:
+                    worst = -heap[0][0]
+            continue
+        children = [2 * node + 1, 2 * node + 2]
+        left_bound, right_bound = _squared_distances_to_boxes(tree, children, point)
+        # Bliższe dziecko trafia na stos jako ostatnie, więc jest odwiedzane jako pierwsze
+        if left_bound <= right_bound:
+            stack.append((right_bound, children[1]))
+            stack.append((left_bound, children[0]))
+        else:
+            stack.append((left_bound, children[0]))
+            stack.append((right_bound, children[1]))
+
+    heap.sort(reverse=True)
+    squared_distances = np.array([-item[0] for item in heap], dtype=np.float64)
+    positions = np.array([item[1] for item in heap], dtype=np.int64)
+    return np.sqrt(squared_distances), positions
+
+
+def _radius_positions(tree: ArrayKDTree, point, radius: float):
+    point = np.asarray(point, dtype=np.float64)
+    squared_radius = radius * radius
+    found_distances, found_positions = [], []
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        if _squared_distances_to_boxes(tree, node, point) > squared_radius:
+            continue
+        start, end = tree.node_start[node], tree.node_end[node]
+        if tree.is_leaf(node):
+            differences = tree.points[start:end] - point
+            squared_distances = np.einsum('ij,ij->i', differences, differences)
+            within = np.flatnonzero(squared_distances <= squared_radius)
+            found_distances.append(squared_distances[within])
+            found_positions.append(start + within)
+        else:
+            stack.append(2 * node + 2)
+            stack.append(2 * node + 1)
+
+    if not found_positions:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
+    squared_distances = np.concatenate(found_distances)
+    order = np.argsort(squared_distances, kind='stable')
+    return np.sqrt(squared_distances[order]), np.concatenate(found_positions)[order]
+
+
+def knn_array_kdtree(tree: ArrayKDTree, point, k: int):
+    """
+    Wyszukiwanie k najbliższych sąsiadów punktu w drzewie tablicowym.
+    :param tree: Drzewo ArrayKDTree
+    :param point: Współrzędne punktu zapytania
+    :param k: Liczba sąsiadów
+    :return: Krotka (odległości, indeksy punktów w tablicy wejściowej) posortowana rosnąco wg odległości
+    """
+    distances, positions = _knn_positions(tree, point, k)
+    return distances, tree.indices[positions]
+
+
+def radius_array_kdtree(tree: ArrayKDTree, point, radius: float):
+    """
+    Wyszukiwanie punktów drzewa tablicowego leżących w odległości co najwyżej radius od punktu.
+    :return: Krotka (odległości, indeksy punktów w tablicy wejściowej) posortowana rosnąco wg odległości
+    """
+    distances, positions = _radius_positions(tree, point, radius)
+    return distances, tree.indices[positions]
+
+
+def query_knn(tree, point: tuple, k: int):
+    """
+    Wyszukiwanie k najbliższych sąsiadów punktu. Poddrzewa, których obszar leży dalej niż najdalszy z dotychczas
+    znalezionych k punktów, są pomijane.
+    :param tree: Korzeń drzewa (Node) lub drzewo ArrayKDTree
+    :param point: Współrzędne punktu zapytania
+    :param k: Liczba sąsiadów
+    :return: Krotka (odległości, punkty) posortowana rosnąco wg odległości
+    """
+    assert k >= 1
+    if isinstance(tree, ArrayKDTree):
+        distances, positions = _knn_positions(tree, point, k)
+        return distances, tree.points[positions]
+
+    heap = []
+    _knn_nodes(tree, point, k, heap, itertools.count())
+    heap.sort(reverse=True)
+    return [(-item[0]) ** 0.5 for item in heap], [item[2] for item in heap]
+
+
+def query_radius(tree, point: tuple, radius: float):
+    """
+    Wyszukiwanie punktów leżących w odległości co najwyżej radius od punktu.
+    :param tree: Korzeń drzewa (Node) lub drzewo ArrayKDTree
+    :param point: Współrzędne punktu zapytania
+    :param radius: Promień zapytania
+    :return: Krotka (odległości, punkty) posortowana rosnąco wg odległości
+    """
+    if isinstance(tree, ArrayKDTree):
+        distances, positions = _radius_positions(tree, point, radius)
+        return distances, tree.points[positions]
+
+    found = []
+    _radius_nodes(tree, point, radius * radius, found)
+    found.sort(key=lambda f: f[0])
+    return [f[0] ** 0.5 for f in found], [f[1] for f in found]
+
+
 def main():
     point_list = [(2, 3), (5, 4), (9, 6), (4, 7), (8, 1), (7, 2)]
     points_x, points_y = sort_points_by_axes(point_list)
     tree = kdtree(points_x, points_y)
     print(tree)
     print(query_kdtree(tree, Area(x_min=4, x_max=7, y_min=2, y_max=7)))
+    array_tree = array_kdtree(np.array(point_list), leaf_size=2)
+    print(query_kdtree(array_tree, Area(x_min=4, x_max=7, y_min=2, y_max=7)))
+    print(query_knn(tree, (6, 3), k=2))
+    print(query_radius(array_tree, (6, 3), radius=2))
+    print(count_in_area(tree, Area(x_min=4, x_max=7, y_min=2, y_max=7)))
 
 
 if __name__ == '__main__':
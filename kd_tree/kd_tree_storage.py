@@ -0,0 +1,93 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from kd_tree import Area, ArrayKDTree, array_kdtree, query_array_kdtree
+
+# Format pliku (little-endian):
+#   MAGIC (8 bajtów) | wersja (uint32) | długość nagłówka (uint32) | nagłówek JSON | tablice wyrównane do ALIGNMENT
+# Nagłówek zawiera leaf_size oraz nazwę, typ, kształt i przesunięcie (od początku pliku) każdej tablicy drzewa.
+MAGIC = b'GGAKDT\x00\x00'
+# Wersja 2: sumy wag węzłów (weights, node_weight) zamiast sumy prefiksowej wag (weight_prefix)
+FORMAT_VERSION = 2
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct('<8sII')
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def save_array_kdtree(tree: ArrayKDTree, path: str):
+    """
+    Zapis drzewa tablicowego do pliku, który można później odwzorować w pamięci funkcją load_array_kdtree.
+    :param tree: Drzewo ArrayKDTree
+    :param path: Ścieżka pliku
+    """
+    arrays = [(field, np.ascontiguousarray(getattr(tree, field))) for field in ArrayKDTree.ARRAY_FIELDS]
+    arrays = [(field, array.astype(array.dtype.newbyteorder('<'), copy=False)) for field, array in arrays]
+
+    # Przesunięcia tablic zależą od długości nagłówka, a nagłówek od przesunięć - zakładamy zapas miejsca
+    header = {'leaf_size': tree.leaf_size, 'arrays': []}
+    reserved_header_size = len(json.dumps(header)) + 128 * len(arrays)
+    offset = _aligned(_PREAMBLE.size + reserved_header_size)
+    for field, array in arrays:
+        header['arrays'].append({'name': field, 'dtype': array.dtype.str, 'shape': array.shape, 'offset': offset})
+        offset = _aligned(offset + array.nbytes)
+    header_bytes = json.dumps(header).encode('utf-8')
+    assert len(header_bytes) <= reserved_header_size
+
+    with open(path, 'wb') as file:
+        file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for (_, array), description in zip(arrays, header['arrays']):
+            file.seek(description['offset'])
+            file.write(array.tobytes())
+        file.truncate(offset)
+
+
+def load_array_kdtree(path: str) -> ArrayKDTree:
+    """
+    Odczyt drzewa zapisanego przez save_array_kdtree bez kopiowania danych. Tablice drzewa są widokami
+    odwzorowanego w pamięci pliku (tylko do odczytu), więc zapytania czytają bezpośrednio strony pliku,
+    a procesy otwierające ten sam plik współdzielą jedną kopię w pamięci podręcznej systemu.
+    :param path: Ścieżka pliku
+    :return: Drzewo ArrayKDTree
+    """
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, header_size = _PREAMBLE.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f'{path} nie jest plikiem drzewa k-wymiarowego')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Nieobsługiwana wersja formatu: {version} (obsługiwana: {FORMAT_VERSION})')
+    header = json.loads(bytes(mapped[_PREAMBLE.size:_PREAMBLE.size + header_size]).decode('utf-8'))
+
+    arrays = {}
+    for description in header['arrays']:
+        dtype = np.dtype(description['dtype'])
+        shape = tuple(description['shape'])
+        count = int(np.prod(shape))
+        arrays[description['name']] = np.frombuffer(mapped, dtype=dtype, count=count,
+                                                    offset=description['offset']).reshape(shape)
+    return ArrayKDTree(leaf_size=header['leaf_size'], **arrays)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    tree = array_kdtree(rng.random((100000, 2)))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'kd_tree.bin')
+        save_array_kdtree(tree, path)
+        loaded_tree = load_array_kdtree(path)
+        print(loaded_tree)
+        print(len(query_array_kdtree(loaded_tree, Area(x_min=0.1, x_max=0.2, y_min=0.1, y_max=0.2))))
+
+
+if __name__ == '__main__':
+    main()
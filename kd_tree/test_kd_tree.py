@@ -1,6 +1,11 @@
+import numpy as np
 import pytest
 
-from kd_tree import Area, kdtree, sort_points_by_axes, query_kdtree
+from kd_tree import (Area, kdtree, sort_points_by_axes, query_kdtree, array_kdtree, query_array_kdtree, query_knn,
+                     query_radius, knn_array_kdtree, count_in_area, sum_in_area)
+from batch_kd_tree import query_kdtree_batch
+from dynamic_kd_tree import DynamicKDTree
+from kd_tree_storage import save_array_kdtree, load_array_kdtree
 
 TEST_SETS = [
     {
@@ -41,3 +46,202 @@ def test_query_kdtree(points_with_query_areas):
     for query_area, query_result in zip(points_with_query_areas['query_areas'],
                                         points_with_query_areas['query_results']):
             assert {r.point for r in query_kdtree(tree, query_area)} == query_result
+
+
+def test_kdtree_positional_depth():
+    points_x, points_y = sort_points_by_axes(TEST_SETS[0]['points'])
+    tree = kdtree(points_x, points_y, 1)
+    assert tree.split_line == kdtree(points_x, points_y, depth=1).split_line
+    assert tree.split_line != kdtree(points_x, points_y).split_line
+
+
+@pytest.mark.parametrize('leaf_size', [1, 2, 16])
+def test_query_array_kdtree(points_with_query_areas, leaf_size):
+    tree = array_kdtree(np.array(points_with_query_areas['points']), leaf_size=leaf_size)
+
+    for query_area, query_result in zip(points_with_query_areas['query_areas'],
+                                        points_with_query_areas['query_results']):
+            assert {r.point for r in query_kdtree(tree, query_area)} == query_result
+
+
+def test_query_array_kdtree_random_points():
+    rng = np.random.default_rng(0)
+    points = rng.integers(0, 50, size=(1000, 2)).astype(float)
+    tree = array_kdtree(points, leaf_size=8)
+
+    for _ in range(20):
+        x_min, x_max = sorted(rng.integers(0, 50, size=2))
+        y_min, y_max = sorted(rng.integers(0, 50, size=2))
+        expected = np.flatnonzero((points[:, 0] >= x_min) & (points[:, 0] <= x_max) &
+                                  (points[:, 1] >= y_min) & (points[:, 1] <= y_max))
+        result = query_array_kdtree(tree, Area(x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max))
+        assert sorted(result) == list(expected)
+
+
+def test_query_knn(points_with_query_areas):
+    points = points_with_query_areas['points']
+    tree = kdtree(*sort_points_by_axes(points))
+    array_tree = array_kdtree(np.array(points), leaf_size=2)
+    query_point = (4, 4)
+    expected = sorted(((p[0] - 4) ** 2 + (p[1] - 4) ** 2) ** 0.5 for p in points)[:2]
+
+    distances, found_points = query_knn(tree, query_point, k=2)
+    assert distances == pytest.approx(expected)
+    assert len(found_points) == 2
+    distances, found_points = query_knn(array_tree, query_point, k=2)
+    assert list(distances) == pytest.approx(expected)
+
+
+def test_query_radius(points_with_query_areas):
+    points = points_with_query_areas['points']
+    tree = kdtree(*sort_points_by_axes(points))
+    array_tree = array_kdtree(np.array(points), leaf_size=2)
+    expected = {p for p in points if (p[0] - 5) ** 2 + (p[1] - 5) ** 2 <= 16}
+
+    assert set(query_radius(tree, (5, 5), radius=4)[1]) == expected
+    assert {tuple(p) for p in query_radius(array_tree, (5, 5), radius=4)[1].tolist()} == expected
+
+
+def test_knn_array_kdtree_random_points():
+    rng = np.random.default_rng(1)
+    points = rng.random((2000, 3))
+    tree = array_kdtree(points, leaf_size=8)
+
+    for query_point in rng.random((10, 3)):
+        distances, indices = knn_array_kdtree(tree, query_point, k=7)
+        brute_force_distances = np.sqrt(((points - query_point) ** 2).sum(axis=1))
+        assert np.allclose(distances, np.sort(brute_force_distances)[:7])
+        assert np.allclose(brute_force_distances[indices], distances)
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_query_kdtree_batch(processes):
+    rng = np.random.default_rng(2)
+    points = rng.random((3000, 2))
+    tree = array_kdtree(points, leaf_size=8)
+    lower = rng.random((50, 2)) * 0.8
+    boxes = np.stack([lower, lower + 0.2], axis=1)
+
+    offsets, indices = query_kdtree_batch(tree, boxes, processes=processes, chunk_size=16)
+    assert len(offsets) == len(boxes) + 1
+    for i, ((x_min, y_min), (x_max, y_max)) in enumerate(boxes):
+        expected = query_array_kdtree(tree, Area(x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max))
+        assert sorted(indices[offsets[i]:offsets[i + 1]]) == sorted(expected)
+
+
+def test_count_in_area(points_with_query_areas):
+    tree = kdtree(*sort_points_by_axes(points_with_query_areas['points']))
+    array_tree = array_kdtree(np.array(points_with_query_areas['points']), leaf_size=2)
+
+    for query_area, query_result in zip(points_with_query_areas['query_areas'],
+                                        points_with_query_areas['query_results']):
+        assert count_in_area(tree, query_area) == len(query_result)
+        assert count_in_area(array_tree, query_area) == len(query_result)
+
+
+def test_sum_in_area():
+    rng = np.random.default_rng(3)
+    points = rng.random((2000, 2))
+    weights = rng.random(2000)
+    tree = array_kdtree(points, leaf_size=8, weights=weights)
+    query_area = Area(x_min=0.2, x_max=0.7, y_min=0.1, y_max=0.5)
+    within = ((points[:, 0] >= 0.2) & (points[:, 0] <= 0.7) & (points[:, 1] >= 0.1) & (points[:, 1] <= 0.5))
+
+    assert count_in_area(tree, query_area) == np.count_nonzero(within)
+    assert sum_in_area(tree, query_area) == pytest.approx(weights[within].sum())
+
+
+def test_sum_in_area_mixed_magnitudes():
+    # Suma małych wag w obszarze nie może zginąć w błędzie zaokrągleń dużych wag spoza obszaru
+    points = np.array([(i, 0) for i in range(1000)], dtype=float)
+    weights = np.where(np.arange(1000) < 500, 1e16, 1.0)
+    tree = array_kdtree(points, leaf_size=4, weights=weights)
+    assert sum_in_area(tree, Area(x_min=600, x_max=609, y_min=0, y_max=0)) == 10.0
+
+
+def test_array_kdtree_rejects_wrong_number_of_weights():
+    with pytest.raises(ValueError):
+        array_kdtree(np.zeros((10, 2)), weights=np.ones(9))
+
+
+def test_dynamic_kdtree():
+    rng = np.random.default_rng(4)
+    tree = DynamicKDTree(dim=2, buffer_size=8, leaf_size=4)
+    points = {}
+    for _ in range(1500):
+        if points and rng.random() < 0.4:
+            point_id = list(points)[rng.integers(len(points))]
+            tree.delete(point_id)
+            del points[point_id]
+        else:
+            point = tuple(rng.random(2))
+            points[tree.insert(point)] = point
+    assert len(tree) == len(points)
+
+    query_area = Area(x_min=0.1, x_max=0.6, y_min=0.3, y_max=0.9)
+    expected = {i for i, p in points.items() if query_area.is_point_within_area(p)}
+    assert set(tree.query(query_area).tolist()) == expected
+
+    distances, ids = tree.query_knn((0.5, 0.5), k=5)
+    expected_distances = sorted(((x - 0.5) ** 2 + (y - 0.5) ** 2) ** 0.5 for x, y in points.values())[:5]
+    assert list(distances) == pytest.approx(expected_distances)
+    with pytest.raises(KeyError):
+        tree.delete(-1)
+
+
+def test_dynamic_kdtree_reuses_ids():
+    rng = np.random.default_rng(6)
+    tree = DynamicKDTree(dim=2, buffer_size=8, leaf_size=4)
+    points = {}
+    for step in range(5100):
+        if step >= 100:
+            point_id = list(points)[rng.integers(len(points))]
+            tree.delete(point_id)
+            del points[point_id]
+        point = tuple(rng.random(2))
+        points[tree.insert(point)] = point
+    assert len(tree) == len(points) == 100
+    # Pamięć zależy od liczby przechowywanych punktów, a nie od liczby wstawień
+    assert tree._next_id <= 512
+
+    query_area = Area(x_min=0.0, x_max=0.5, y_min=0.0, y_max=1.0)
+    expected = {i for i, p in points.items() if query_area.is_point_within_area(p)}
+    assert set(tree.query(query_area).tolist()) == expected
+
+
+def test_save_and_load_array_kdtree(tmpdir):
+    rng = np.random.default_rng(5)
+    tree = array_kdtree(rng.random((500, 3)), leaf_size=4, weights=rng.random(500))
+    path = str(tmpdir.join('tree.bin'))
+    save_array_kdtree(tree, path)
+    loaded_tree = load_array_kdtree(path)
+
+    assert loaded_tree.leaf_size == tree.leaf_size
+    for field in tree.ARRAY_FIELDS:
+        assert np.array_equal(getattr(loaded_tree, field), getattr(tree, field), equal_nan=field == 'split_value')
+    distances, indices = knn_array_kdtree(loaded_tree, (0.5, 0.5, 0.5), k=3)
+    assert np.array_equal(indices, knn_array_kdtree(tree, (0.5, 0.5, 0.5), k=3)[1])
+
+
+def test_load_array_kdtree_rejects_other_files(tmpdir):
+    path = tmpdir.join('not_a_tree.bin')
+    path.write_binary(b'x' * 64)
+    with pytest.raises(ValueError):
+        load_array_kdtree(str(path))
+
+
+@pytest.mark.parametrize('dim', [1, 3, 5])
+def test_query_kdtree_many_dimensions(dim):
+    rng = np.random.default_rng(dim)
+    points = [tuple(p) for p in rng.integers(0, 6, size=(300, dim)).tolist()]
+    tree = kdtree(*sort_points_by_axes(points))
+    array_tree = array_kdtree(np.array(points), leaf_size=4)
+    assert tree.count == len(points)
+
+    for _ in range(10):
+        bounds = np.sort(rng.integers(0, 6, size=(2, dim)), axis=0)
+        query_area = Area(mins=tuple(bounds[0].tolist()), maxs=tuple(bounds[1].tolist()))
+        expected = sorted(p for p in points if query_area.is_point_within_area(p))
+        assert sorted(r.point for r in query_kdtree(tree, query_area)) == expected
+        assert count_in_area(tree, query_area) == len(expected)
+        assert len(query_array_kdtree(array_tree, query_area)) == len(expected)
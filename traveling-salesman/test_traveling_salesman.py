@@ -0,0 +1,232 @@
+import itertools
+import math
+import random
+from collections import deque
+
+import numpy as np
+import pytest
+
+import traveling_salesman as traveling_salesman_module
+from traveling_salesman import (HOT_ROW_MISSES, CoordinateGraph, Graph, generate_asymmetrical_distance_matrix,
+                                generate_symmetrical_distance_matrix, held_karp, parallel_held_karp, traveling_salesman)
+from tsp_branch_and_bound import branch_and_bound_traveling_salesman
+from tsp_heuristic import (_Tour, _double_bridge, _local_search, _try_or_opt, heuristic_traveling_salesman,
+                           nearest_neighbour_tour, tour_length)
+
+
+def random_graph(vertices_count: int, seed: int) -> Graph:
+    random.seed(seed)
+    vertices = set(range(vertices_count))
+    return Graph(vertices, generate_asymmetrical_distance_matrix(vertices))
+
+
+def path_length(graph: Graph, path: list):
+    return sum(graph.get_distance(path[i], path[i + 1]) for i in range(len(path) - 1))
+
+
+def brute_force_length(graph: Graph):
+    vertices_count = len(graph.vertices)
+    return min(path_length(graph, [0, *permutation, 0])
+               for permutation in itertools.permutations(range(1, vertices_count)))
+
+
+def check_tour(graph: Graph, path: list, length):
+    assert path[0] == path[-1] == 0
+    assert sorted(path[:-1]) == list(range(len(graph.vertices)))
+    assert path_length(graph, path) == pytest.approx(length)
+
+
+# The baseline backtracks the path correctly only for at least 3 vertices
+@pytest.mark.parametrize('vertices_count', range(3, 8))
+@pytest.mark.parametrize('seed', range(5))
+def test_held_karp_matches_baseline_asymmetric(vertices_count, seed):
+    graph = random_graph(vertices_count, seed)
+    path, length = held_karp(graph)
+    baseline_path, baseline_length = traveling_salesman(graph)
+
+    check_tour(graph, path, length)
+    check_tour(graph, baseline_path, baseline_length)
+    assert length == baseline_length == brute_force_length(graph)
+
+
+@pytest.mark.parametrize('dtype', [np.int32, np.int64, np.float32])
+def test_held_karp_dtypes(dtype):
+    graph = random_graph(9, 0)
+    path, length = held_karp(graph, dtype)
+    check_tour(graph, path, length)
+    assert length == held_karp(graph)[1]
+
+
+def test_held_karp_rejects_overflowing_lengths():
+    vertices = set(range(6))
+    graph = Graph(vertices, [[0 if i == j else 2 ** 28 + i * 6 + j for j in vertices] for i in vertices])
+    with pytest.raises(ValueError):
+        held_karp(graph, np.int32)
+    path, length = held_karp(graph, np.int64)
+    check_tour(graph, path, length)
+    assert length == brute_force_length(graph)
+
+
+@pytest.mark.parametrize('vertices_count', [2, 6, 12])
+def test_parallel_held_karp_matches_held_karp(monkeypatch, vertices_count):
+    # Every layer with subsets is sent to the workers
+    monkeypatch.setattr(traveling_salesman_module, 'PARALLEL_MIN_VERTICES', 0)
+    monkeypatch.setattr(traveling_salesman_module, 'PARALLEL_MIN_LAYER_SIZE', 0)
+    graph = random_graph(vertices_count, 0)
+    path, length = parallel_held_karp(graph, processes=2)
+    check_tour(graph, path, length)
+    assert length == held_karp(graph)[1]
+
+
+def test_parallel_held_karp_releases_memory_on_error(monkeypatch):
+    def failing_relax(dp, backtrack, masks, distances):
+        raise RuntimeError('relax failed')
+
+    monkeypatch.setattr(traveling_salesman_module, 'PARALLEL_MIN_VERTICES', 0)
+    monkeypatch.setattr(traveling_salesman_module, '_held_karp_relax', failing_relax)
+    with pytest.raises(RuntimeError):
+        parallel_held_karp(random_graph(6, 0), processes=2)
+
+
+@pytest.mark.parametrize('vertices_count, processes', [(6, 2), (18, 1)])
+def test_parallel_held_karp_falls_back_to_held_karp(monkeypatch, vertices_count, processes):
+    def failing_pool(*args, **kwargs):
+        raise AssertionError('pool started')
+
+    monkeypatch.setattr(traveling_salesman_module, 'Pool', failing_pool)
+    graph = random_graph(vertices_count, 0)
+    assert parallel_held_karp(graph, processes=processes) == held_karp(graph)
+
+
+@pytest.mark.parametrize('metric', CoordinateGraph.METRICS)
+def test_coordinate_graph_distances(metric):
+    coordinates = np.random.default_rng(0).random((300, 2)) * (1 if metric == 'euclidean' else 60)
+    graph = CoordinateGraph(coordinates, metric, cache_size=4)
+    matrix = graph.distance_matrix(np.float64)
+    assert np.allclose(matrix, matrix.T)
+
+    # Vertex 0 becomes hot and its row is cached, then rows of the other vertices push it out of the cache
+    for i in [0] * 2 * HOT_ROW_MISSES + list(range(300)):
+        for j in range(300):
+            assert graph.get_distance(i, j) == pytest.approx(matrix[i, j], rel=1e-9, abs=1e-9)
+    assert 0 < len(graph._rows) <= 4
+    cached = next(iter(graph._rows))
+    assert graph.get_distance(7, cached) == pytest.approx(matrix[7, cached], rel=1e-9, abs=1e-9)
+    assert np.allclose(graph.distance_row(5), matrix[5])
+
+
+@pytest.mark.parametrize('distribution', ['uniform', 'line', 'duplicates', 'cluster'])
+def test_nearest_candidates(distribution):
+    rng = np.random.default_rng(0)
+    coordinates = {
+        'uniform': rng.random((2000, 2)),
+        'line': np.repeat(rng.random((2000, 1)), 2, axis=1),
+        'duplicates': np.r_[np.zeros((1500, 2)), rng.random((500, 2))],
+        'cluster': np.r_[rng.random((1000, 2)) * 1e-6, rng.random((1000, 2))],
+    }[distribution]
+    graph = CoordinateGraph(coordinates)
+    candidates = np.array(graph.nearest_candidates(8))
+    assert candidates.shape == (2000, 8)
+    assert (candidates != np.arange(2000)[:, None]).all()
+    assert all(len(set(row)) == 8 for row in candidates.tolist())
+
+    matrix = graph.distance_matrix(np.float64)
+    np.fill_diagonal(matrix, np.inf)
+    found = np.take_along_axis(matrix, candidates, axis=1)
+    assert (np.diff(found, axis=1) >= 0).all()
+    if distribution in ('uniform', 'line', 'duplicates'):
+        assert np.allclose(found, np.sort(matrix, axis=1)[:, :8])
+
+
+def random_coordinate_graph(vertices_count: int, seed: int) -> CoordinateGraph:
+    return CoordinateGraph(np.random.default_rng(seed).random((vertices_count, 2)))
+
+
+def check_tour_positions(tour: _Tour):
+    assert sorted(tour.order) == list(range(len(tour)))
+    assert all(tour.position[vertex] == index for index, vertex in enumerate(tour.order))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_local_search_delta_bookkeeping(seed):
+    graph = random_coordinate_graph(300, seed)
+    candidates = graph.nearest_candidates(8)
+    tour = _Tour(nearest_neighbour_tour(graph, candidates))
+    length = tour_length(graph, tour.order)
+    queued = [True] * len(tour)
+    length += _local_search(tour, deque(tour.order), queued, candidates, graph.get_distance, math.inf)
+    check_tour_positions(tour)
+    assert length == pytest.approx(tour_length(graph, tour.order))
+
+    generator = random.Random(seed)
+    for _ in range(50):
+        tour.log.clear()
+        order = list(tour.order)
+        delta, changed = _double_bridge(tour, graph.get_distance, generator)
+        assert length + delta == pytest.approx(tour_length(graph, tour.order))
+        queue = deque(changed)
+        for vertex in changed:
+            queued[vertex] = True
+        delta += _local_search(tour, queue, queued, candidates, graph.get_distance, math.inf)
+        check_tour_positions(tour)
+        assert length + delta == pytest.approx(tour_length(graph, tour.order))
+        tour.undo()
+        assert tour.order == order
+        check_tour_positions(tour)
+
+
+def test_or_opt_delta():
+    # Vertex 5 lies between 1 and 2, so moving it there shortens the tour
+    coordinates = [(0, 0), (1, 0), (2, 0), (3, 0), (3, 1), (1.5, 0.1), (2, 1), (1, 1), (0, 1)]
+    graph = CoordinateGraph(coordinates)
+    tour = _Tour(list(range(len(coordinates))))
+    length = tour_length(graph, tour.order)
+    move = _try_or_opt(tour, 5, graph.nearest_candidates(4), graph.get_distance)
+    assert move is not None and move[0] < 0
+    check_tour_positions(tour)
+    assert length + move[0] == pytest.approx(tour_length(graph, tour.order))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_heuristic_traveling_salesman_small(seed):
+    graph = random_coordinate_graph(9, seed)
+    path, length, history = heuristic_traveling_salesman(graph, time_limit=0.2, seed=seed)
+    check_tour(graph, path, length)
+    assert length == pytest.approx(held_karp(graph)[1])
+    lengths = [history_length for _, history_length in history]
+    assert lengths == sorted(lengths, reverse=True)
+
+
+def test_heuristic_traveling_salesman_graph():
+    random.seed(0)
+    vertices = set(range(200))
+    graph = Graph(vertices, generate_symmetrical_distance_matrix(vertices))
+    path, length, history = heuristic_traveling_salesman(graph, time_limit=0.5, seed=0)
+    check_tour(graph, path, length)
+    assert length == pytest.approx(history[-1][1])
+
+
+@pytest.mark.parametrize('generate_distance_matrix',
+                         [generate_symmetrical_distance_matrix, generate_asymmetrical_distance_matrix])
+@pytest.mark.parametrize('vertices_count', [4, 6, 8, 11])
+@pytest.mark.parametrize('seed', range(3))
+def test_branch_and_bound_matches_held_karp(generate_distance_matrix, vertices_count, seed):
+    random.seed(seed)
+    vertices = set(range(vertices_count))
+    graph = Graph(vertices, generate_distance_matrix(vertices))
+    path, length, gap = branch_and_bound_traveling_salesman(graph, warm_start_time=0.05)
+    check_tour(graph, path, length)
+    assert length == held_karp(graph)[1]
+    assert gap == 0
+
+
+def test_branch_and_bound_node_limit():
+    random.seed(0)
+    vertices = set(range(12))
+    graph = Graph(vertices, generate_asymmetrical_distance_matrix(vertices))
+    path, length, gap = branch_and_bound_traveling_salesman(graph, node_limit=1)
+    check_tour(graph, path, length)
+    optimal_length = held_karp(graph)[1]
+    assert length >= optimal_length
+    # The gap bounds the distance from the optimum
+    assert 0 <= gap and length * (1 - gap) <= optimal_length + 1e-9
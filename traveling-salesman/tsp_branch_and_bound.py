@@ -0,0 +1,213 @@
+import random
+import time
+
+import numpy as np
+
+from traveling_salesman import Graph, _distance_array, generate_asymmetrical_distance_matrix, \
+    generate_symmetrical_distance_matrix
+from tsp_heuristic import heuristic_traveling_salesman, nearest_candidates, nearest_neighbour_tour, tour_length
+
+# Number of subgradient iterations of the Lagrangian bound computed for one node
+SUBGRADIENT_ITERATIONS = 20
+# Differences of path lengths smaller than EPSILON are treated as rounding errors
+EPSILON = 1e-9
+
+
+def _minimum_spanning_tree(costs: np.ndarray):
+    """
+    Prim's algorithm with vectorised updates of distances to the tree. Time complexity: O(m^2).
+    :param costs: Symmetric array (m, m) of edge costs
+    :return: Tuple (weight of the minimum spanning tree, degrees of vertices in the tree)
+    """
+    vertices_count = len(costs)
+    in_tree = np.zeros(vertices_count, dtype=bool)
+    in_tree[0] = True
+    best = costs[0].copy()
+    best[0] = np.inf
+    parent = np.zeros(vertices_count, dtype=np.int64)
+    degrees = np.zeros(vertices_count, dtype=np.int64)
+    weight = 0.0
+    for _ in range(vertices_count - 1):
+        vertex = int(np.argmin(best))
+        weight += best[vertex]
+        degrees[vertex] += 1
+        degrees[parent[vertex]] += 1
+        in_tree[vertex] = True
+        best[vertex] = np.inf
+        closer = (costs[vertex] < best) & ~in_tree
+        best[closer] = costs[vertex][closer]
+        parent[closer] = vertex
+    return weight, degrees
+
+
+def _path_bound(distances: np.ndarray, path: list, remaining: list, penalties: np.ndarray, upper_bound: float):
+    """
+    Lower bound of the length of tours starting with path, for symmetric distances. The remaining part of the tour
+    is a Hamiltonian path from the last vertex of path through all remaining vertices to vertex 0, i.e. a spanning
+    tree in which the ends have degree 1 and the other vertices degree 2. Relaxing the degree constraints with
+    Lagrange multipliers (penalties) gives the Held-Karp bound: the minimum spanning tree for costs
+    d(i, j) + p(i) + p(j) minus the sum of target degrees times penalties. The penalties are improved by subgradient
+    optimisation, starting from penalties of the parent node.
+    :return: Tuple (lower bound, penalties giving that bound)
+    """
+    cost = sum(distances[path[i], path[i + 1]] for i in range(len(path) - 1))
+    vertices = np.array([path[-1], 0] + remaining)
+    costs = distances[np.ix_(vertices, vertices)]
+    # Symmetric tours are visited only in one direction - vertex 0 is entered from a vertex greater than path[1]
+    costs[1, 2:][np.array(remaining, dtype=np.int64) < path[1]] = np.inf
+    costs[2:, 1] = costs[1, 2:]
+    if not remaining and path[-1] < path[1]:
+        return np.inf, penalties
+    costs[0, 1] = costs[1, 0] = np.inf if remaining else distances[path[-1], 0]
+    if np.isinf(costs[1]).all():
+        return np.inf, penalties
+    target = np.full(len(vertices), 2)
+    target[:2] = 1
+
+    best_bound, best_penalties = -np.inf, penalties
+    step_scale = 2.0
+    for _ in range(SUBGRADIENT_ITERATIONS):
+        vertex_penalties = penalties[vertices]
+        weight, degrees = _minimum_spanning_tree(costs + vertex_penalties[:, None] + vertex_penalties[None, :])
+        bound = cost + weight - (target * vertex_penalties).sum()
+        if bound > best_bound:
+            best_bound, best_penalties = bound, penalties
+        subgradient = degrees - target
+        # The tree is a Hamiltonian path, so the bound is the length of the optimal completion
+        if not subgradient.any() or bound >= upper_bound - EPSILON:
+            break
+        penalties = penalties.copy()
+        penalties[vertices] += step_scale * (upper_bound - bound) / (subgradient @ subgradient) * subgradient
+        step_scale *= 0.9
+    return best_bound, best_penalties
+
+
+def _assignment_cost(costs: np.ndarray) -> float:
+    """
+    Hungarian algorithm (shortest augmenting paths with potentials), with the inner loop over columns vectorised.
+    Time complexity: O(m^3).
+    :param costs: Square array of assignment costs (forbidden assignments have a large finite cost)
+    :return: Cost of the optimal assignment of rows to columns
+    """
+    size = len(costs)
+    row_potential = np.zeros(size + 1)
+    column_potential = np.zeros(size + 1)
+    # Rows and columns are numbered from 1, column_row[j] = 0 means that column j is not assigned
+    column_row = np.zeros(size + 1, dtype=np.int64)
+    way = np.zeros(size + 1, dtype=np.int64)
+    for row in range(1, size + 1):
+        column_row[0] = row
+        column = 0
+        min_slack = np.full(size + 1, np.inf)
+        used = np.zeros(size + 1, dtype=bool)
+        while column_row[column]:
+            used[column] = True
+            current_row = column_row[column]
+            slack = costs[current_row - 1] - row_potential[current_row] - column_potential[1:]
+            free = ~used[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = column
+            masked_slack = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(masked_slack)) + 1
+            delta = masked_slack[next_column - 1]
+            row_potential[column_row[used]] += delta
+            column_potential[used] -= delta
+            min_slack[1:][free] -= delta
+            column = next_column
+        while column:
+            previous_column = way[column]
+            column_row[column] = column_row[previous_column]
+            column = previous_column
+    return float(costs[column_row[1:] - 1, np.arange(size)].sum())
+
+
+def _assignment_bound(distances: np.ndarray, path: list, remaining: list, forbidden_cost: float) -> float:
+    """
+    Lower bound of the length of tours starting with path, for asymmetric distances: every vertex of
+    [last vertex of path] + remaining needs a successor from remaining + [0], which is an assignment problem.
+    """
+    cost = sum(distances[path[i], path[i + 1]] for i in range(len(path) - 1))
+    if not remaining:
+        return cost + distances[path[-1], 0]
+    rows, columns = [path[-1]] + remaining, remaining + [0]
+    costs = distances[np.ix_(rows, columns)].copy()
+    costs[np.arange(1, len(rows)), np.arange(len(remaining))] = forbidden_cost
+    costs[0, -1] = forbidden_cost
+    return cost + _assignment_cost(costs)
+
+
+def branch_and_bound_traveling_salesman(graph: Graph, time_limit: float = 60.0, node_limit: int = None,
+                                        warm_start_time: float = 1.0):
+    """
+    Exact solution of the traveling salesman problem by depth-first branch and bound. A node is a path starting
+    in vertex 0; its children extend the path by one unvisited vertex and are pruned when their lower bound
+    is not smaller than the length of the best known tour. Bounds: Held-Karp (Lagrangian spanning tree) bound
+    for symmetric distances and assignment bound for asymmetric ones. The initial upper bound comes from
+    heuristic_traveling_salesman (symmetric) or the nearest neighbour tour (asymmetric).
+    :param graph: Graph for traveling salesman problem
+    :param time_limit: Time limit [s]
+    :param node_limit: Limit of expanded nodes
+    :param warm_start_time: Time budget of the heuristic computing the initial upper bound [s]
+    :return: Best path, its length and optimality gap - (length - lower bound) / length, 0 if the path is optimal
+    """
+    start = time.perf_counter()
+    vertices_count = len(graph.vertices)
+    if vertices_count <= 3:
+        path = list(range(vertices_count)) + [0]
+        return path, tour_length(graph, path[:-1]), 0.0
+
+    distances = _distance_array(graph)
+    symmetric = np.allclose(distances, distances.T)
+    if symmetric:
+        best_path, best_length, _ = heuristic_traveling_salesman(graph, time_limit=min(warm_start_time, time_limit))
+    else:
+        order = nearest_neighbour_tour(graph, nearest_candidates(graph, 8))
+        best_path, best_length = order + [0], tour_length(graph, order)
+    forbidden_cost = distances.sum() + 1
+
+    def bound(path: list, penalties: np.ndarray):
+        remaining = [vertex for vertex in range(1, vertices_count) if vertex not in path]
+        if symmetric:
+            return _path_bound(distances, path, remaining, penalties, best_length)
+        return _assignment_bound(distances, path, remaining, forbidden_cost), penalties
+
+    # Stack of nodes (lower bound, path, Lagrange multipliers), children with smaller bounds are examined first
+    stack = [(0.0, [0], np.zeros(vertices_count))]
+    expanded = 0
+    while stack:
+        if time.perf_counter() - start > time_limit or node_limit is not None and expanded >= node_limit:
+            break
+        node_bound, path, penalties = stack.pop()
+        if node_bound >= best_length - EPSILON:
+            continue
+        expanded += 1
+
+        if len(path) == vertices_count:
+            best_path, best_length = path + [0], node_bound
+            continue
+        children = []
+        for vertex in range(1, vertices_count):
+            if vertex in path:
+                continue
+            child_bound, child_penalties = bound(path + [vertex], penalties)
+            if child_bound < best_length - EPSILON:
+                children.append((child_bound, path + [vertex], child_penalties))
+        stack.extend(sorted(children, key=lambda node: -node[0]))
+
+    lower_bound = min([best_length] + [node_bound for node_bound, _, _ in stack])
+    best_length = tour_length(graph, best_path[:-1])
+    gap = (best_length - lower_bound) / best_length if best_length > 0 and stack else 0.0
+    return best_path, best_length, max(float(gap), 0.0)
+
+
+def main():
+    random.seed(0)
+    for generate_distance_matrix in (generate_symmetrical_distance_matrix, generate_asymmetrical_distance_matrix):
+        vertices = set(range(15))
+        graph = Graph(vertices, generate_distance_matrix(vertices))
+        print(branch_and_bound_traveling_salesman(graph, time_limit=10.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+from traveling_salesman import CoordinateGraph, Graph, generate_symmetrical_distance_matrix
+
+# Differences of tour lengths smaller than EPSILON are treated as rounding errors
+EPSILON = 1e-9
+# Maximal length of segments moved by Or-opt
+OR_OPT_SEGMENT_LENGTH = 3
+# Maximal number of vertices between the outermost cut points of the double-bridge perturbation
+DOUBLE_BRIDGE_WINDOW = 50
+
+
+def nearest_candidates(graph: Graph, candidates_count: int) -> list:
+    """
+    Candidate lists - for every vertex, candidates_count nearest other vertices sorted by distance.
+    Requires n^2 calls of get_distance.
+    :param graph: Graph for traveling salesman problem
+    :param candidates_count: Number of candidates of a vertex
+    :return: List of candidate lists
+    """
+    vertices_count = len(graph.vertices)
+    candidates_count = min(candidates_count, vertices_count - 1)
+    candidates = []
+    for i in range(vertices_count):
+        row = np.fromiter((graph.get_distance(i, j) for j in range(vertices_count)), dtype=np.float64,
+                          count=vertices_count)
+        row[i] = np.inf
+        nearest = np.argpartition(row, candidates_count - 1)[:candidates_count].tolist() if candidates_count > 0 else []
+        candidates.append(sorted(nearest, key=row.__getitem__))
+    return candidates
+
+
+class _Tour:
+    """
+    Tour stored as a list of vertices and a list of their positions. Segments are reversed on the shorter side,
+    so the orientation of the tour can change - moves are therefore described by vertices, not positions.
+    Changes of the list are recorded in an undo log, so a rejected sequence of moves is undone in time
+    proportional to the changed segments instead of copying the whole tour.
+    """
+    def __init__(self, order: list):
+        self.order = list(order)
+        self.position = [0] * len(order)
+        for index, vertex in enumerate(self.order):
+            self.position[vertex] = index
+        self.log = []
+
+    def __len__(self):
+        return len(self.order)
+
+    def succ(self, vertex: int) -> int:
+        index = self.position[vertex] + 1
+        return self.order[index if index < len(self.order) else 0]
+
+    def pred(self, vertex: int) -> int:
+        return self.order[self.position[vertex] - 1]
+
+    def _reverse(self, first: int, last: int):
+        """
+        Reverses the path between positions first and last (inclusive, possibly wrapping around the end of the list).
+        """
+        vertices_count = len(self.order)
+        length = (last - first) % vertices_count + 1
+        if 2 * length > vertices_count:
+            first, last = (last + 1) % vertices_count, (first - 1) % vertices_count
+            length = vertices_count - length
+        self.log.append((first, last, length))
+        self._reverse_positions(first, last, length)
+
+    def _reverse_positions(self, first: int, last: int, length: int):
+        order, position = self.order, self.position
+        vertices_count = len(order)
+        if first <= last:
+            order[first:last + 1] = order[first:last + 1][::-1]
+            for index in range(first, last + 1):
+                position[order[index]] = index
+            return
+        for _ in range(length // 2):
+            order[first], order[last] = order[last], order[first]
+            position[order[first]], position[order[last]] = first, last
+            first = first + 1 if first + 1 < vertices_count else 0
+            last = last - 1 if last > 0 else vertices_count - 1
+
+    def exchange(self, x1: int, x2: int, y1: int, y2: int):
+        """
+        2-opt move - replaces edges (x1, x2) and (y1, y2), where x2 follows x1 and y2 follows y1 in the same
+        direction, with edges (x1, y1) and (x2, y2).
+        """
+        if self.succ(x1) != x2:
+            x1, x2, y1, y2 = y2, y1, x2, x1
+        self._reverse(self.position[x2], self.position[y1])
+
+    def replace_window(self, first: int, vertices: list):
+        self.log.append((first, self.order[first:first + len(vertices)]))
+        self._replace_window(first, vertices)
+
+    def _replace_window(self, first: int, vertices: list):
+        self.order[first:first + len(vertices)] = vertices
+        for index in range(first, first + len(vertices)):
+            self.position[self.order[index]] = index
+
+    def undo(self):
+        """
+        Undoes all changes recorded in the log, in reverse order (a reversal is its own inverse).
+        """
+        while self.log:
+            change = self.log.pop()
+            if len(change) == 3:
+                self._reverse_positions(*change)
+            else:
+                self._replace_window(*change)
+
+
+def tour_length(graph: Graph, order: list):
+    return sum(graph.get_distance(order[i - 1], order[i]) for i in range(len(order)))
+
+
+def _nearest_unvisited(graph: Graph, current: int, candidates: list, visited: list, unvisited: set) -> int:
+    """
+    Breadth-first search of the candidate graph from vertex current - returns the unvisited vertex nearest to current
+    from the first layer containing unvisited vertices. The remaining vertices are scanned only if the candidate
+    graph is disconnected.
+    """
+    seen = {current}
+    layer = [current]
+    while layer:
+        next_layer = []
+        for vertex in layer:
+            for candidate in candidates[vertex]:
+                if candidate not in seen:
+                    seen.add(candidate)
+                    next_layer.append(candidate)
+        found = [vertex for vertex in next_layer if not visited[vertex]]
+        if found:
+            return min(found, key=lambda vertex: graph.get_distance(current, vertex))
+        layer = next_layer
+    return min(unvisited, key=lambda vertex: graph.get_distance(current, vertex))
+
+
+def nearest_neighbour_tour(graph: Graph, candidates: list) -> list:
+    """
+    Tour built by repeatedly moving to the nearest unvisited candidate vertex. When all candidates are visited,
+    the nearest unvisited vertex is searched among candidates of candidates (and so on).
+    """
+    vertices_count = len(graph.vertices)
+    visited = [False] * vertices_count
+    unvisited = set(range(1, vertices_count))
+    order = [0]
+    visited[0] = True
+    while unvisited:
+        current = order[-1]
+        following = next((c for c in candidates[current] if not visited[c]), None)
+        if following is None:
+            following = _nearest_unvisited(graph, current, candidates, visited, unvisited)
+        visited[following] = True
+        unvisited.discard(following)
+        order.append(following)
+    return order
+
+
+def _try_two_opt(tour: _Tour, a: int, candidates: list, distance):
+    """
+    :return: Tuple (change of the tour length, changed vertices) of an improving 2-opt move involving vertex a or None
+    """
+    for succ in (tour.succ, tour.pred):
+        b = succ(a)
+        distance_ab = distance(a, b)
+        for c in candidates[a]:
+            distance_ac = distance(a, c)
+            if distance_ac >= distance_ab:
+                break
+            d = succ(c)
+            if c == b or d == a:
+                continue
+            delta = distance_ac + distance(b, d) - distance_ab - distance(c, d)
+            if delta < -EPSILON:
+                if succ == tour.succ:
+                    tour.exchange(a, b, c, d)
+                else:
+                    tour.exchange(b, a, d, c)
+                return delta, (a, b, c, d)
+    return None
+
+
+def _try_or_opt(tour: _Tour, a: int, candidates: list, distance):
+    """
+    :return: Tuple (change of the tour length, changed vertices) of an improving move of a segment starting
+             in vertex a (Or-opt) or None
+    """
+    if len(tour) < OR_OPT_SEGMENT_LENGTH + 3:
+        return None
+    p = tour.pred(a)
+    segment = [a]
+    for _ in range(OR_OPT_SEGMENT_LENGTH):
+        e = segment[-1]
+        f = tour.succ(e)
+        removal_gain = distance(p, a) + distance(e, f) - distance(p, f)
+        if removal_gain > EPSILON:
+            for c in candidates[a] + candidates[e]:
+                for x, y in ((c, tour.succ(c)), (tour.pred(c), c)):
+                    if x in segment or y in segment or y == p:
+                        continue
+                    reversed_cost = distance(x, e) + distance(a, y)
+                    forward_cost = distance(x, a) + distance(e, y)
+                    delta = min(reversed_cost, forward_cost) - distance(x, y) - removal_gain
+                    if delta < -EPSILON:
+                        # p -> x ... f -> e ... a -> y, then p -> f ... x -> e ... a -> y
+                        tour.exchange(p, a, x, y)
+                        if x != f:
+                            tour.exchange(p, x, f, e)
+                        if forward_cost < reversed_cost:
+                            tour.exchange(x, e, a, y)
+                        return delta, (p, f, x, y, a, e)
+        segment.append(f)
+    return None
+
+
+def _local_search(tour: _Tour, queue: deque, queued: list, candidates: list, distance, deadline: float) -> float:
+    """
+    2-opt and Or-opt local search with don't-look bits - only vertices in queue are examined, and vertices whose
+    neighbourhood changed are added back to the queue.
+    :return: Change of the tour length
+    """
+    total_delta = 0
+    examined = 0
+    while queue:
+        examined += 1
+        if examined % 256 == 0 and time.perf_counter() > deadline:
+            break
+        a = queue.popleft()
+        queued[a] = False
+        move = _try_two_opt(tour, a, candidates, distance) or _try_or_opt(tour, a, candidates, distance)
+        if not move:
+            continue
+        delta, changed = move
+        total_delta += delta
+        for vertex in changed:
+            if not queued[vertex]:
+                queued[vertex] = True
+                queue.append(vertex)
+    return total_delta
+
+
+def _double_bridge(tour: _Tour, distance, generator: random.Random):
+    """
+    Double-bridge perturbation - two neighbouring segments of the tour are swapped (A B C D -> A C B D).
+    :return: Tuple (change of the tour length, vertices at the ends of the segments)
+    """
+    window = min(DOUBLE_BRIDGE_WINDOW, len(tour) - 1)
+    first = generator.randrange(len(tour) - window)
+    middle, last = sorted(generator.sample(range(first + 1, first + window + 1), 2))
+    order = tour.order
+    x, y = order[first], order[last]
+    left, right = order[first + 1:middle + 1], order[middle + 1:last + 1]
+    after = tour.succ(y)
+    delta = (distance(x, right[0]) + distance(right[-1], left[0]) + distance(left[-1], after)
+             - distance(x, left[0]) - distance(left[-1], right[0]) - distance(right[-1], after))
+    tour.replace_window(first + 1, right + left)
+    return delta, (x, after, left[0], left[-1], right[0], right[-1])
+
+
+def heuristic_traveling_salesman(graph: Graph, time_limit: float = 10.0, candidates_count: int = 8,
+                                 candidates: list = None, seed: int = None):
+    """
+    Heuristic solution of the traveling salesman problem for symmetric distances. The nearest neighbour tour is
+    improved by 2-opt and Or-opt local search restricted to candidate lists, and then by iterated local search:
+    the best tour is perturbed by a double-bridge move, improved locally and kept if it is shorter.
+    Vertices are examined only when their neighbourhood changed (don't-look bits) and moves of a rejected iteration
+    are undone in reverse order, so one iteration costs O(reversal length) instead of O(n^2).
+    :param graph: Graph for traveling salesman problem
+    :param time_limit: Time budget [s] counted from the call; the best tour found so far is returned when it runs
+                       out. Candidate lists and the nearest neighbour tour are always completed, so the call takes
+                       longer if they do not fit in the budget (nearest_candidates of a Graph evaluates n^2 distances)
+    :param candidates_count: Number of nearest vertices considered in local search moves
+    :param candidates: Precomputed candidate lists (by default CoordinateGraph.nearest_candidates or
+                       nearest_candidates for other graphs)
+    :param seed: Seed of the random number generator used for perturbations
+    :return: Best path, its length and history of improvements - list of pairs (elapsed time [s], path length)
+    """
+    start = time.perf_counter()
+    deadline = start + time_limit
+    vertices_count = len(graph.vertices)
+    if vertices_count <= 3:
+        path = list(range(vertices_count)) + [0]
+        length = tour_length(graph, path[:-1])
+        return path, length, [(time.perf_counter() - start, length)]
+
+    distance = graph.get_distance
+    generator = random.Random(seed)
+    if candidates is None and isinstance(graph, CoordinateGraph):
+        candidates = graph.nearest_candidates(candidates_count)
+    elif candidates is None:
+        candidates = nearest_candidates(graph, candidates_count)
+
+    tour = _Tour(nearest_neighbour_tour(graph, candidates))
+    length = tour_length(graph, tour.order)
+    history = [(time.perf_counter() - start, length)]
+
+    queued = [True] * vertices_count
+    length += _local_search(tour, deque(tour.order), queued, candidates, distance, deadline)
+    tour.log.clear()
+    history.append((time.perf_counter() - start, length))
+
+    # The tour is always the best one found - changes of a rejected iteration are undone
+    while time.perf_counter() < deadline:
+        delta, changed = _double_bridge(tour, distance, generator)
+        queue = deque(changed)
+        for vertex in changed:
+            queued[vertex] = True
+        delta += _local_search(tour, queue, queued, candidates, distance, deadline)
+        for vertex in queue:
+            queued[vertex] = False
+        if delta < -EPSILON:
+            length += delta
+            tour.log.clear()
+            history.append((time.perf_counter() - start, length))
+        else:
+            tour.undo()
+
+    best_order = tour.order
+    zero_position = best_order.index(0)
+    path = best_order[zero_position:] + best_order[:zero_position] + [0]
+    return path, tour_length(graph, best_order), history
+
+
+def main():
+    random.seed(0)
+    vertices = set(range(200))
+    graph = Graph(vertices, generate_symmetrical_distance_matrix(vertices))
+    path, length, history = heuristic_traveling_salesman(graph, time_limit=2.0, seed=0)
+    print(path, length)
+    for elapsed, history_length in history[:10]:
+        print(f'{elapsed:.3f} s: {history_length}')
+
+    graph = CoordinateGraph(np.random.default_rng(0).random((10000, 2)))
+    _, length, history = heuristic_traveling_salesman(graph, time_limit=10.0, seed=0)
+    print(f'{len(graph.vertices)} vertices: {length:.3f}, improvements: {len(history)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,376 @@
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from vertex_cover import Graph, linear_vertex_cover
+
+
+class _FoldedVertex:
+    """
+    Vertex replacing vertex of degree 2 and its two non-adjacent neighbours after folding.
+    """
+    __slots__ = ('vertex', 'first', 'second')
+
+    def __init__(self, vertex, first, second):
+        self.vertex = vertex
+        self.first = first
+        self.second = second
+
+    def __repr__(self):
+        return f'_FoldedVertex({self.vertex!r}, {self.first!r}, {self.second!r})'
+
+
+def _adjacency(edges) -> tuple:
+    """
+    :return: Tuple (adjacency - dictionary vertex -> set of neighbours, set of vertices with self-loops)
+    """
+    adjacency, loops = {}, set()
+    for u, v in edges:
+        if u == v:
+            loops.add(u)
+            continue
+        adjacency.setdefault(u, set()).add(v)
+        adjacency.setdefault(v, set()).add(u)
+    return adjacency, loops
+
+
+def _remove_vertex(adjacency: dict, vertex, changed: set):
+    for neighbour in adjacency.pop(vertex):
+        adjacency[neighbour].discard(vertex)
+        changed.add(neighbour)
+
+
+def _fold(adjacency: dict, vertex, changed: set) -> _FoldedVertex:
+    """
+    Degree-2 rule for a vertex with non-adjacent neighbours u and w - vertex, u and w are replaced with one vertex
+    adjacent to N(u) + N(w). The minimum cover of the new graph is smaller by exactly 1: if it contains the new vertex,
+    u and w belong to the cover of the original graph, otherwise vertex does.
+    """
+    first, second = adjacency[vertex]
+    folded = _FoldedVertex(vertex, first, second)
+    neighbours = (adjacency[first] | adjacency[second]) - {vertex}
+    for removed in (vertex, first, second):
+        _remove_vertex(adjacency, removed, changed)
+    adjacency[folded] = neighbours
+    for neighbour in neighbours:
+        adjacency[neighbour].add(folded)
+    changed.add(folded)
+    return folded
+
+
+def _reduce_degrees(adjacency: dict, cover: list, folds: list, limit: float) -> bool:
+    """
+    Kernelisation by degree rules, repeated until none of them applies:
+    - vertex of degree 0 is removed,
+    - neighbour of a vertex of degree 1 is added to the cover,
+    - neighbours of a vertex of degree 2 are added to the cover if they are adjacent, otherwise they are folded,
+    - Buss's rule - a vertex of degree greater than k, where k is the largest cover size of the reduced graph still
+      smaller than limit, belongs to every such cover (otherwise the cover would contain all its neighbours).
+    :param cover: List extended with vertices added to the cover
+    :param folds: List extended with folded vertices
+    :return: False if there is no cover smaller than limit
+    """
+    changed = set(adjacency)
+    while True:
+        while changed:
+            vertex = changed.pop()
+            if vertex not in adjacency:
+                continue
+            degree = len(adjacency[vertex])
+            if degree == 0:
+                del adjacency[vertex]
+            elif degree == 1:
+                neighbour = next(iter(adjacency[vertex]))
+                cover.append(neighbour)
+                _remove_vertex(adjacency, neighbour, changed)
+            elif degree == 2:
+                first, second = adjacency[vertex]
+                if second in adjacency[first]:
+                    cover.extend((first, second))
+                    _remove_vertex(adjacency, first, changed)
+                    _remove_vertex(adjacency, second, changed)
+                else:
+                    folds.append(_fold(adjacency, vertex, changed))
+
+        k = limit - 1 - len(cover) - len(folds)
+        if k < 0:
+            return False
+        high_degree = [vertex for vertex, neighbours in adjacency.items() if len(neighbours) > k]
+        if not high_degree:
+            return True
+        for vertex in high_degree:
+            if vertex in adjacency:
+                cover.append(vertex)
+                _remove_vertex(adjacency, vertex, changed)
+
+
+def _hopcroft_karp(neighbours: list) -> tuple:
+    """
+    Maximum matching of the bipartite double cover of a graph - both sides are copies of the vertex set and left
+    copy of u is adjacent to right copy of v if u and v are adjacent. Time complexity: O(E sqrt(V)).
+    :param neighbours: Lists of neighbours of vertices 0..n-1
+    :return: Tuple (right partners of left vertices, left partners of right vertices), -1 for unmatched vertices
+    """
+    vertices_count = len(neighbours)
+    match_left = [-1] * vertices_count
+    match_right = [-1] * vertices_count
+    # Greedy initial matching
+    for u in range(vertices_count):
+        for v in neighbours[u]:
+            if match_right[v] < 0:
+                match_left[u], match_right[v] = v, u
+                break
+
+    while True:
+        # Layers of left vertices by length of the shortest alternating path from an unmatched left vertex
+        layer = [-1] * vertices_count
+        queue = deque(u for u in range(vertices_count) if match_left[u] < 0)
+        for u in queue:
+            layer[u] = 0
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in neighbours[u]:
+                partner = match_right[v]
+                if partner < 0:
+                    found = True
+                elif layer[partner] < 0:
+                    layer[partner] = layer[u] + 1
+                    queue.append(partner)
+        if not found:
+            return match_left, match_right
+
+        # Vertex-disjoint shortest augmenting paths, searched depth-first along the layers
+        position = [0] * vertices_count
+        for root in range(vertices_count):
+            if match_left[root] >= 0:
+                continue
+            path = [root]
+            while path:
+                u = path[-1]
+                if position[u] == len(neighbours[u]):
+                    layer[u] = -1
+                    path.pop()
+                    continue
+                v = neighbours[u][position[u]]
+                position[u] += 1
+                partner = match_right[v]
+                if partner < 0:
+                    for left in reversed(path):
+                        match_left[left], v = v, match_left[left]
+                        match_right[match_left[left]] = left
+                    for left in path:
+                        layer[left] = -1
+                    break
+                if layer[partner] == layer[u] + 1:
+                    path.append(partner)
+
+
+def _lp_reduce(adjacency: dict, cover: list) -> int:
+    """
+    LP (crown) reduction by the Nemhauser-Trotter theorem. The optimal half-integral solution of the LP relaxation is
+    obtained from the minimum vertex cover of the bipartite double cover (König's theorem applied to the matching
+    found by Hopcroft-Karp): x(v) is the number of copies of v in that cover divided by 2. Vertices with x(v) = 1
+    belong to some minimum cover and are added to the cover, vertices with x(v) = 0 are removed.
+    :return: Lower bound of the cover size of the remaining graph - ceil(number of vertices with x(v) = 1/2 / 2)
+    """
+    vertices = list(adjacency)
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    neighbours = [[index[neighbour] for neighbour in adjacency[vertex]] for vertex in vertices]
+    match_left, match_right = _hopcroft_karp(neighbours)
+
+    # Left vertices reachable from unmatched left vertices by alternating paths are outside of the König cover,
+    # reachable right vertices are inside it
+    reached_left = [match < 0 for match in match_left]
+    reached_right = [False] * len(vertices)
+    stack = [u for u in range(len(vertices)) if reached_left[u]]
+    while stack:
+        u = stack.pop()
+        for v in neighbours[u]:
+            if not reached_right[v]:
+                reached_right[v] = True
+                partner = match_right[v]
+                if partner >= 0 and not reached_left[partner]:
+                    reached_left[partner] = True
+                    stack.append(partner)
+
+    changed = set()
+    half_count = 0
+    for i, vertex in enumerate(vertices):
+        copies_in_cover = (not reached_left[i]) + reached_right[i]
+        if copies_in_cover == 2:
+            cover.append(vertex)
+            _remove_vertex(adjacency, vertex, changed)
+        elif copies_in_cover == 1:
+            half_count += 1
+    # Neighbours of vertices with x(v) = 0 have x = 1, so these vertices are isolated now
+    for vertex in [vertex for vertex, neighbours in adjacency.items() if not neighbours]:
+        del adjacency[vertex]
+    return (half_count + 1) // 2
+
+
+def _components(adjacency: dict) -> list:
+    """
+    :return: List of adjacency dictionaries of connected components, the smallest first
+    """
+    components, seen = [], set()
+    for start in adjacency:
+        if start in seen:
+            continue
+        seen.add(start)
+        stack, component = [start], []
+        while stack:
+            vertex = stack.pop()
+            component.append(vertex)
+            for neighbour in adjacency[vertex]:
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        components.append({vertex: adjacency[vertex] for vertex in component})
+    return sorted(components, key=len)
+
+
+def _unfold(cover: list, folds: list) -> list:
+    """
+    Cover of the graph before folding, given cover (of the graph after folding) and list of folded vertices.
+    """
+    cover = set(cover)
+    for folded in reversed(folds):
+        if folded in cover:
+            cover.remove(folded)
+            cover.update((folded.first, folded.second))
+        else:
+            cover.add(folded.vertex)
+    return list(cover)
+
+
+def _lower_bound(adjacency: dict) -> int:
+    """
+    Lower bound of the cover size - maximum of the size of a greedy maximal matching and ceil(m / maximal degree).
+    """
+    matched = set()
+    matching_size = 0
+    for vertex, neighbours in adjacency.items():
+        if vertex in matched:
+            continue
+        for neighbour in neighbours:
+            if neighbour not in matched:
+                matched.update((vertex, neighbour))
+                matching_size += 1
+                break
+    degrees = [len(neighbours) for neighbours in adjacency.values()]
+    edges_count = sum(degrees) // 2
+    return max(matching_size, -(-edges_count // max(degrees, default=1)))
+
+
+def _solve(adjacency: dict, limit: float):
+    """
+    Minimum vertex cover by bounded search tree: after kernelisation and splitting into connected components, a vertex
+    v of maximal degree is chosen and two branches are examined - v belongs to the cover, or all neighbours of v
+    belong to it. Branches whose lower bound is not smaller than limit are pruned.
+    :param adjacency: Adjacency of the graph (modified by the function)
+    :param limit: Only covers smaller than limit are searched
+    :return: List of vertices of the minimum cover, if it is smaller than limit, or None
+    """
+    cover, folds = [], []
+    if not _reduce_degrees(adjacency, cover, folds, limit):
+        return None
+    if not adjacency:
+        return _unfold(cover, folds)
+    if len(cover) + len(folds) + _lp_reduce(adjacency, cover) >= limit:
+        return None
+    if not _reduce_degrees(adjacency, cover, folds, limit):
+        return None
+    if not adjacency:
+        return _unfold(cover, folds)
+    limit -= len(cover) + len(folds)
+
+    components = _components(adjacency)
+    if len(components) > 1:
+        lower_bounds = [_lower_bound(component) for component in components]
+        remaining_bound = sum(lower_bounds)
+        for component, lower_bound in zip(components, lower_bounds):
+            remaining_bound -= lower_bound
+            component_cover = _solve(component, limit - remaining_bound)
+            if component_cover is None:
+                return None
+            cover.extend(component_cover)
+            limit -= len(component_cover)
+        return _unfold(cover, folds)
+
+    if _lower_bound(adjacency) >= limit:
+        return None
+    vertex = max(adjacency, key=lambda v: len(adjacency[v]))
+    neighbours = adjacency[vertex]
+    best = None
+    # Branch 1 - vertex belongs to the cover
+    branch = {v: adjacency[v] - {vertex} for v in adjacency if v != vertex}
+    branch_cover = _solve(branch, limit - 1)
+    if branch_cover is not None:
+        best = branch_cover + [vertex]
+        limit = len(best)
+    # Branch 2 - all neighbours of vertex belong to the cover
+    if len(neighbours) < limit:
+        closed_neighbourhood = neighbours | {vertex}
+        branch = {v: adjacency[v] - neighbours for v in adjacency if v not in closed_neighbourhood}
+        branch_cover = _solve(branch, limit - len(neighbours))
+        if branch_cover is not None:
+            best = branch_cover + list(neighbours)
+    if best is None:
+        return None
+    return _unfold(cover + best, folds)
+
+
+def exact_vertex_cover(graph: Graph):
+    """
+    Minimum vertex cover. The graph is first kernelised - degree 0, 1 and 2 rules (with folding), Buss's high-degree
+    rule and LP (crown) reduction - and the kernel is solved by bounded search tree branching, separately for every
+    connected component, with LP and matching lower bounds. The initial upper bound is the size of the
+    2-approximation from linear_vertex_cover. Time complexity is exponential in the size of the cover of the kernel,
+    and polynomial in the size of the graph.
+    :param graph: Graph
+    :return: Tuple (size of the minimum cover, set of vertices of the cover)
+    """
+    adjacency, loops = _adjacency(graph.edges)
+    # Vertex with a self-loop belongs to every cover
+    changed = set()
+    for vertex in loops:
+        if vertex in adjacency:
+            _remove_vertex(adjacency, vertex, changed)
+    upper_bound = len(linear_vertex_cover(Graph([edge for edge in graph.edges if not loops.intersection(edge)])))
+
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, 10000))
+    try:
+        cover = _solve(adjacency, upper_bound + 1)
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+    cover = set(cover) | loops
+    return len(cover), cover
+
+
+def generate_planted_cover_graph(vertices_count: int, cover_size: int, edges_count: int, seed: int = 0) -> Graph:
+    """
+    Random sparse graph in which cover_size vertices (0..cover_size-1) cover all edges.
+    """
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, cover_size, size=edges_count)
+    targets = rng.integers(0, vertices_count, size=edges_count)
+    edges = np.unique(np.sort(np.stack([sources, targets], axis=1), axis=1), axis=0)
+    return Graph([tuple(edge) for edge in edges[edges[:, 0] != edges[:, 1]].tolist()])
+
+
+def main():
+    edges = [(0, 1), (0, 2), (0, 3), (1, 3), (1, 4), (2, 5), (3, 6), (3, 7), (4, 7), (5, 8)]
+    print(exact_vertex_cover(Graph(edges)))
+
+    graph = generate_planted_cover_graph(10 ** 5, 300, 3 * 10 ** 5)
+    start = time.perf_counter()
+    size, _ = exact_vertex_cover(graph)
+    print(f'Edges: {len(graph.edges)}, minimum cover: {size}, time: {time.perf_counter() - start:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+# Number of edges read from the file at once
+CHUNK_SIZE = 1 << 20
+# Number of bytes of a text file read at once
+TEXT_BLOCK_SIZE = 1 << 24
+# Priority of vertices without remaining edges in the current matching round - priorities are int32, so edges are
+# matched in parts of fewer than _NO_PRIORITY edges
+_NO_PRIORITY = np.iinfo(np.int32).max
+
+
+def _parse_text_edges(block: bytes) -> np.ndarray:
+    """
+    :param block: Complete lines of an edge list file - pairs of vertices separated by whitespace, lines starting
+                  with '#' or '%' are comments
+    :return: Array (k, 2) of edges
+    """
+    if b'#' in block or b'%' in block:
+        block = b'\n'.join(line for line in block.splitlines() if not line.lstrip().startswith((b'#', b'%')))
+    # Text mode of np.fromstring parses numbers in C, several times faster than int() of every token
+    values = np.fromstring(block, dtype=np.int64, sep=' ')
+    if len(values) % 2:
+        raise ValueError('Every line of the edge list must contain two vertices')
+    return values.reshape(-1, 2)
+
+
+def _read_text_edges(path: str):
+    with open(path, 'rb') as file:
+        rest = b''
+        while True:
+            block = file.read(TEXT_BLOCK_SIZE)
+            if not block:
+                break
+            block = rest + block
+            last_line_end = block.rfind(b'\n') + 1
+            rest = block[last_line_end:]
+            yield _parse_text_edges(block[:last_line_end])
+        if rest.strip():
+            yield _parse_text_edges(rest)
+
+
+def read_edge_chunks(path: str, chunk_size: int = CHUNK_SIZE, dtype=None):
+    """
+    Reading edges of a graph in chunks, without loading the whole edge list into memory.
+    Supported formats: .npy file with array (m, 2) and raw binary file of vertex pairs (both memory-mapped),
+    and text file with one edge per line.
+    :param path: Path of the edge list file
+    :param chunk_size: Maximal number of edges in a chunk
+    :param dtype: Type of vertex numbers of a raw binary file; without it the file (other than .npy) is read as text
+    :return: Generator of arrays (k, 2) of edges
+    """
+    if path.endswith('.npy'):
+        edges = np.load(path, mmap_mode='r')
+    elif dtype is not None:
+        edges = np.memmap(path, dtype=dtype, mode='r')
+        edges = edges.reshape(-1, 2)
+    else:
+        for edges in _read_text_edges(path):
+            for first in range(0, len(edges), chunk_size):
+                yield edges[first:first + chunk_size]
+        return
+
+    if edges.ndim != 2 or edges.shape[1] != 2:
+        raise ValueError(f'Edge array must have shape (m, 2), not {edges.shape}')
+    for first in range(0, len(edges), chunk_size):
+        yield np.asarray(edges[first:first + chunk_size], dtype=np.int64)
+
+
+class _CoverState:
+    """
+    Covered-vertex bitmap (bool, 1 B per vertex) and auxiliary array of matching priorities (int32, 4 B per vertex),
+    both growing with the largest vertex number seen.
+    """
+    def __init__(self):
+        self.covered = np.zeros(0, dtype=bool)
+        self.priority = np.zeros(0, dtype=np.int32)
+        self.vertices_count = 0
+
+    def reserve(self, vertices_count: int):
+        self.vertices_count = max(self.vertices_count, vertices_count)
+        if vertices_count <= len(self.covered):
+            return
+        capacity = max(vertices_count, 2 * len(self.covered))
+        covered = np.zeros(capacity, dtype=bool)
+        covered[:len(self.covered)] = self.covered
+        self.covered = covered
+        self.priority = np.full(capacity, _NO_PRIORITY, dtype=np.int32)
+
+
+def _match_chunk(state: _CoverState, edges: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Extends the matching with edges of a chunk whose both ends are not covered, so that every edge of the chunk has
+    a covered end. The edges are matched in rounds: every edge gets a random priority and an edge is added to the
+    matching if it has the smallest priority at both of its ends (the added edges are therefore disjoint).
+    Every round matches at least the edge with the smallest priority, and the expected number of rounds is
+    O(log k).
+    :return: Array of newly covered vertices
+    """
+    covered, priority = state.covered, state.priority
+    edges = edges[~(covered[edges[:, 0]] | covered[edges[:, 1]])]
+    # Self-loop can be covered only by its vertex
+    newly_covered = [np.unique(edges[edges[:, 0] == edges[:, 1], 0])]
+    covered[newly_covered[0]] = True
+    edges = edges[~(covered[edges[:, 0]] | covered[edges[:, 1]])]
+
+    while len(edges):
+        sources, targets = edges[:, 0], edges[:, 1]
+        edge_priority = rng.permutation(len(edges)).astype(np.int32)
+        np.minimum.at(priority, sources, edge_priority)
+        np.minimum.at(priority, targets, edge_priority)
+        matched = (priority[sources] == edge_priority) & (priority[targets] == edge_priority)
+        priority[sources] = priority[targets] = _NO_PRIORITY
+        matched_vertices = edges[matched].ravel()
+        covered[matched_vertices] = True
+        newly_covered.append(matched_vertices)
+        edges = edges[~(covered[edges[:, 0]] | covered[edges[:, 1]])]
+    return np.concatenate(newly_covered)
+
+
+def streaming_vertex_cover(edge_chunks, output=None, seed: int = 0) -> np.ndarray:
+    """
+    2-approximation of the minimum vertex cover for graphs whose edges do not fit in memory - both ends of every
+    edge of a maximal matching, built chunk by chunk in one pass over the edges. Only the covered-vertex bitmap and
+    the array of matching priorities (5 B per vertex) are kept between chunks, and every chunk is processed with
+    vectorised operations. Vertices must be numbered with non-negative integers.
+    :param edge_chunks: Iterable of arrays (k, 2) of edges, e.g. read_edge_chunks(path)
+    :param output: Binary file to which vertices of the cover are written (as np.int64) when they are covered
+    :param seed: Seed of the random number generator of matching priorities
+    :return: Covered-vertex bitmap - array of length (largest vertex number in the edges + 1)
+    """
+    rng = np.random.default_rng(seed)
+    state = _CoverState()
+    for edges in edge_chunks:
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if not len(edges):
+            continue
+        if edges.min() < 0:
+            raise ValueError('Vertices must be numbered with non-negative integers')
+        state.reserve(int(edges.max()) + 1)
+        for first in range(0, len(edges), _NO_PRIORITY - 1):
+            newly_covered = _match_chunk(state, edges[first:first + _NO_PRIORITY - 1], rng)
+            if output is not None and len(newly_covered):
+                output.write(newly_covered.tobytes())
+    return state.covered[:state.vertices_count].copy()
+
+
+def streaming_vertex_cover_file(edges_path: str, cover_path: str, chunk_size: int = CHUNK_SIZE, dtype=None,
+                                seed: int = 0) -> int:
+    """
+    Vertex cover of the graph from file edges_path (see read_edge_chunks), written to cover_path as np.int64
+    vertex numbers (readable by np.fromfile).
+    :return: Size of the cover
+    """
+    with open(cover_path, 'wb') as output:
+        covered = streaming_vertex_cover(read_edge_chunks(edges_path, chunk_size, dtype), output, seed)
+    return int(covered.sum())
+
+
+def main():
+    rng = np.random.default_rng(0)
+    vertices_count, edges_count = 10 ** 6, 10 ** 7
+    with tempfile.TemporaryDirectory() as directory:
+        edges_path = os.path.join(directory, 'edges.npy')
+        cover_path = os.path.join(directory, 'cover.bin')
+        np.save(edges_path, rng.integers(0, vertices_count, size=(edges_count, 2)))
+
+        start = time.perf_counter()
+        cover_size = streaming_vertex_cover_file(edges_path, cover_path)
+        elapsed = time.perf_counter() - start
+        print(f'Edges: {edges_count}, cover: {cover_size}, time: {elapsed:.3f} s '
+              f'({edges_count / elapsed / 1e6:.1f} M edges/s)')
+        print(np.fromfile(cover_path, dtype=np.int64)[:10])
+
+
+if __name__ == '__main__':
+    main()
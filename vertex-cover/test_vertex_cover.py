@@ -0,0 +1,209 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+import streaming_vertex_cover as streaming_vertex_cover_module
+from exact_vertex_cover import exact_vertex_cover, generate_planted_cover_graph
+from streaming_vertex_cover import read_edge_chunks, streaming_vertex_cover, streaming_vertex_cover_file
+from vertex_cover import Graph, approx_vertex_cover, csr_adjacency, linear_vertex_cover, weighted_vertex_cover
+
+
+def random_edges(vertices_count: int, edges_count: int, seed: int) -> list:
+    generator = random.Random(seed)
+    return [(generator.randrange(vertices_count), generator.randrange(vertices_count)) for _ in range(edges_count)]
+
+
+def is_vertex_cover(edges: list, cover) -> bool:
+    return all(u in cover or v in cover for u, v in edges)
+
+
+def brute_force_cover_size(edges: list) -> int:
+    vertices = sorted({vertex for edge in edges for vertex in edge})
+    for size in range(len(vertices) + 1):
+        if any(is_vertex_cover(edges, set(cover)) for cover in itertools.combinations(vertices, size)):
+            return size
+
+
+def test_csr_adjacency():
+    edges = random_edges(30, 100, 0)
+    labels, offsets, neighbours = csr_adjacency(edges)
+    assert labels.tolist() == sorted({vertex for edge in edges for vertex in edge})
+    for index, label in enumerate(labels.tolist()):
+        expected = sorted([v for u, v in edges if u == label] + [u for u, v in edges if v == label])
+        assert sorted(labels[neighbours[offsets[index]:offsets[index + 1]]].tolist()) == expected
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_linear_vertex_cover(seed):
+    edges = random_edges(12, random.Random(seed).randint(1, 30), seed)
+    optimal_size = brute_force_cover_size(edges)
+    for cover in (linear_vertex_cover(Graph(edges)), linear_vertex_cover(Graph(edges), seed=seed),
+                  approx_vertex_cover(Graph(edges))):
+        assert is_vertex_cover(edges, cover)
+        assert len(cover) <= 2 * optimal_size
+
+
+def test_linear_vertex_cover_labels():
+    edges = [('a', 'b'), ('b', 'c'), ('c', 'c')]
+    cover = linear_vertex_cover(Graph(edges))
+    assert is_vertex_cover(edges, cover)
+    assert linear_vertex_cover(Graph([])) == set()
+
+
+def brute_force_cover_weight(edges: list, weights) -> float:
+    vertices = sorted({vertex for edge in edges for vertex in edge})
+    return min(sum(weights[vertex] for vertex in cover)
+               for size in range(len(vertices) + 1) for cover in itertools.combinations(vertices, size)
+               if is_vertex_cover(edges, set(cover)))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_weighted_vertex_cover(seed):
+    generator = random.Random(seed)
+    edges = random_edges(10, generator.randint(1, 25), seed)
+    weights = [generator.randint(0, 10) for _ in range(10)]
+    optimal_weight = brute_force_cover_weight(edges, weights)
+    for graph_weights in (weights, dict(enumerate(weights))):
+        cover, weight, lower_bound = weighted_vertex_cover(Graph(edges, graph_weights))
+        assert is_vertex_cover(edges, cover)
+        assert weight == sum(weights[vertex] for vertex in cover)
+        assert lower_bound <= optimal_weight <= weight <= 2 * lower_bound
+
+
+def test_weighted_vertex_cover_unit_weights():
+    edges = random_edges(10, 20, 0)
+    cover, weight, lower_bound = weighted_vertex_cover(Graph(edges))
+    assert is_vertex_cover(edges, cover)
+    assert weight == len(cover) <= 2 * lower_bound
+    assert lower_bound <= brute_force_cover_size(edges)
+
+
+def test_weighted_vertex_cover_loops():
+    edges = [(0, 0), (0, 1), (2, 2), (1, 2), (3, 4)]
+    weights = [2, 3, 4, 1, 5]
+    cover, weight, lower_bound = weighted_vertex_cover(Graph(edges, weights))
+    assert {0, 2} <= cover and is_vertex_cover(edges, cover)
+    assert weight == sum(weights[vertex] for vertex in cover)
+    assert lower_bound == 2 + 4 + 1
+    assert weighted_vertex_cover(Graph([(0, 0)], [3])) == ({0}, 3.0, 3.0)
+
+
+@pytest.mark.parametrize('weights', [[1, 2], {0: 1, 1: 2}, [1, 2, -1]])
+def test_weighted_vertex_cover_rejects_wrong_weights(weights):
+    with pytest.raises(ValueError):
+        weighted_vertex_cover(Graph([(0, 1), (1, 2)], weights))
+
+
+@pytest.mark.parametrize('edges', [[('a', 'b')], [(0.5, 1)]])
+def test_weighted_vertex_cover_rejects_non_integer_labels(edges):
+    with pytest.raises(ValueError):
+        weighted_vertex_cover(Graph(edges, [1, 2, 3]))
+
+
+def read_all_chunks(path: str, **kwargs) -> np.ndarray:
+    chunks = list(read_edge_chunks(path, **kwargs))
+    assert all(chunk.dtype == np.int64 and chunk.ndim == 2 and chunk.shape[1] == 2 for chunk in chunks)
+    return np.concatenate(chunks)
+
+
+def test_read_edge_chunks(tmpdir, monkeypatch):
+    edges = np.random.default_rng(0).integers(0, 1000, size=(1000, 2))
+
+    npy_path = str(tmpdir.join('edges.npy'))
+    np.save(npy_path, edges)
+    assert np.array_equal(read_all_chunks(npy_path, chunk_size=64), edges)
+    assert [len(chunk) for chunk in read_edge_chunks(npy_path, chunk_size=300)] == [300, 300, 300, 100]
+
+    raw_path = str(tmpdir.join('edges.bin'))
+    edges.astype(np.int32).tofile(raw_path)
+    assert np.array_equal(read_all_chunks(raw_path, chunk_size=64, dtype=np.int32), edges)
+
+    text_path = tmpdir.join('edges.txt')
+    lines = ['# comment', '% another comment'] + [f'{u}\t{v}' for u, v in edges.tolist()]
+    text_path.write('\n'.join(lines))
+    # Small text blocks - lines are split between blocks and the last line has no newline
+    monkeypatch.setattr(streaming_vertex_cover_module, 'TEXT_BLOCK_SIZE', 100)
+    assert np.array_equal(read_all_chunks(str(text_path), chunk_size=64), edges)
+
+
+def test_read_edge_chunks_rejects_wrong_shape(tmpdir):
+    path = str(tmpdir.join('edges.npy'))
+    np.save(path, np.arange(9).reshape(3, 3))
+    with pytest.raises(ValueError):
+        list(read_edge_chunks(path))
+    text_path = tmpdir.join('edges.txt')
+    text_path.write('1 2\n3\n')
+    with pytest.raises(ValueError):
+        list(read_edge_chunks(str(text_path)))
+
+
+@pytest.mark.parametrize('chunk_size', [7, 100, 10000])
+def test_streaming_vertex_cover_file(tmpdir, chunk_size):
+    edges = random_edges(500, 2000, chunk_size) + [(3, 3), (499, 499)]
+    edges_path, cover_path = str(tmpdir.join('edges.npy')), str(tmpdir.join('cover.bin'))
+    np.save(edges_path, np.array(edges))
+    cover_size = streaming_vertex_cover_file(edges_path, cover_path, chunk_size=chunk_size)
+
+    cover = np.fromfile(cover_path, dtype=np.int64)
+    assert len(cover) == len(set(cover.tolist())) == cover_size
+    assert is_vertex_cover(edges, set(cover.tolist()))
+    assert {3, 499} <= set(cover.tolist())
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_streaming_vertex_cover_approximation(seed):
+    edges = random_edges(12, random.Random(seed).randint(1, 30), seed) + [(seed, seed)]
+    chunks = [np.array(edges[first:first + 5]) for first in range(0, len(edges), 5)]
+    covered = streaming_vertex_cover(chunks, seed=seed)
+    assert len(covered) == max(vertex for edge in edges for vertex in edge) + 1
+    cover = set(np.flatnonzero(covered).tolist())
+    assert is_vertex_cover(edges, cover)
+    assert len(cover) <= 2 * brute_force_cover_size(edges)
+
+
+def check_exact_vertex_cover(edges: list):
+    size, cover = exact_vertex_cover(Graph(edges))
+    assert size == len(cover) == brute_force_cover_size(edges)
+    assert is_vertex_cover(edges, cover)
+    assert cover <= {vertex for edge in edges for vertex in edge}
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_exact_vertex_cover_random(seed):
+    generator = random.Random(seed)
+    vertices_count = generator.randint(2, 14)
+    edges = random_edges(vertices_count, generator.randint(1, 3 * vertices_count), seed)
+    check_exact_vertex_cover(edges)
+
+
+@pytest.mark.parametrize('vertices_count', range(3, 13))
+def test_exact_vertex_cover_paths_and_cycles(vertices_count):
+    # Vertices of degree 2 - folded when their neighbours are not adjacent
+    path = [(i, i + 1) for i in range(vertices_count - 1)]
+    check_exact_vertex_cover(path)
+    check_exact_vertex_cover(path + [(vertices_count - 1, 0)])
+    # Cycle with pendant paths and triangles attached
+    check_exact_vertex_cover(path + [(vertices_count - 1, 0), (0, 20), (20, 21), (1, 22), (22, 23), (23, 1)])
+
+
+def test_exact_vertex_cover_self_loops():
+    check_exact_vertex_cover([(0, 0)])
+    check_exact_vertex_cover([(0, 0), (0, 1), (1, 2), (2, 2), (2, 3), (3, 4), (4, 0)])
+    check_exact_vertex_cover([(i, i) for i in range(5)] + [(i, i + 1) for i in range(5)])
+
+
+def test_exact_vertex_cover_dense_graphs():
+    complete = list(itertools.combinations(range(8), 2))
+    check_exact_vertex_cover(complete)
+    petersen = [(i, (i + 1) % 5) for i in range(5)] + [(i, i + 5) for i in range(5)] + \
+               [(5 + i, 5 + (i + 2) % 5) for i in range(5)]
+    check_exact_vertex_cover(petersen)
+
+
+def test_exact_vertex_cover_planted():
+    graph = generate_planted_cover_graph(2000, 30, 4000, seed=0)
+    size, cover = exact_vertex_cover(graph)
+    assert is_vertex_cover(graph.edges, cover)
+    assert size == len(cover) <= 30
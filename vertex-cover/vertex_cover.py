@@ -1,9 +1,18 @@
 import random
+import time
+
+import numpy as np
 
 
 class Graph:
-    def __init__(self, edges: list):
+    def __init__(self, edges: list, weights=None):
+        """
+        :param edges: List of edges (pairs of vertices)
+        :param weights: Non-negative weights of vertices - dictionary or sequence indexed by vertex (all weights
+                        are 1 by default)
+        """
         self.edges = edges
+        self.weights = weights
 
 
 def approx_vertex_cover(graph: Graph):
@@ -19,6 +28,134 @@ def approx_vertex_cover(graph: Graph):
     return vertex_cover
 
 
+def _edge_array(edges):
+    """
+    :return: Tuple (sorted vertex labels, array (m, 2) of edges with vertices numbered by positions in labels)
+    """
+    labels, edge_array = np.unique(np.asarray(edges).reshape(-1, 2), return_inverse=True)
+    return labels, edge_array.reshape(-1, 2)
+
+
+def csr_adjacency(edges):
+    """
+    Adjacency lists in CSR format - neighbours of vertex i are neighbours[offsets[i]:offsets[i + 1]].
+    Vertices are numbered 0..n-1 in the order of sorted labels. Time complexity: O(E log E).
+    :param edges: List of edges (pairs of vertex labels) or array (m, 2)
+    :return: Tuple (vertex labels, offsets, neighbours)
+    """
+    labels, edge_array = _edge_array(edges)
+    sources = np.concatenate([edge_array[:, 0], edge_array[:, 1]])
+    targets = np.concatenate([edge_array[:, 1], edge_array[:, 0]])
+    order = np.argsort(sources, kind='stable')
+    offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=len(labels)), out=offsets[1:])
+    return labels, offsets, targets[order]
+
+
+def linear_vertex_cover(graph: Graph, seed: int = None):
+    """
+    2-approximation of the minimum vertex cover - both ends of every edge of a maximal matching.
+    The matching is found in one O(V + E) pass over vertices: an uncovered vertex is matched with its first
+    uncovered neighbour, checked in the covered-vertex bitmap. Numbering of vertices and the CSR adjacency are
+    built with vectorised sorts, so the total time complexity is O(E log E).
+    :param graph: Graph
+    :param seed: Seed of the random number generator shuffling edges and vertices; without it edges are processed
+                 in the order of graph.edges
+    :return: Set of vertices of the cover
+    """
+    if not graph.edges:
+        return set()
+    edges = np.asarray(graph.edges).reshape(-1, 2)
+    rng = np.random.default_rng(seed) if seed is not None else None
+    if rng is not None:
+        edges = edges[rng.permutation(len(edges))]
+    labels, offsets, neighbours = csr_adjacency(edges)
+    vertices = rng.permutation(len(labels)).tolist() if rng is not None else range(len(labels))
+
+    covered = bytearray(len(labels))
+    offsets, neighbours = offsets.tolist(), neighbours.tolist()
+    for vertex in vertices:
+        if covered[vertex]:
+            continue
+        for index in range(offsets[vertex], offsets[vertex + 1]):
+            if not covered[neighbours[index]]:
+                covered[vertex] = covered[neighbours[index]] = True
+                break
+    return set(labels[np.frombuffer(covered, dtype=np.bool_)].tolist())
+
+
+def weighted_vertex_cover(graph: Graph):
+    """
+    2-approximation of the minimum weight vertex cover by the primal-dual pricing method of Bar-Yehuda and Even.
+    Edges are examined once, and every edge whose ends are not covered yet pays the price min(r(u), r(v)), where
+    r is the weight of a vertex minus prices paid by its edges. Vertices with r = 0 (tight) form the cover.
+    The prices are a feasible solution of the dual LP, so their sum is a lower bound of the optimal weight, and
+    every tight vertex is paid for by its edges, each of which is counted at most twice - the weight of the cover
+    is at most 2 times the lower bound. The pricing pass takes O(V + E) and numbering of vertices (vectorised sort)
+    O(E log E).
+    :param graph: Graph with vertex weights (unit weights if graph.weights is None)
+    :return: Tuple (set of vertices of the cover, weight of the cover, lower bound of the minimum weight)
+    """
+    if not graph.edges:
+        return set(), 0.0, 0.0
+    labels, edge_array = _edge_array(graph.edges)
+    if graph.weights is None:
+        weights = np.ones(len(labels))
+    elif isinstance(graph.weights, dict):
+        missing = [label for label in labels.tolist() if label not in graph.weights]
+        if missing:
+            raise ValueError(f'Missing weights of vertices: {missing[:10]}')
+        weights = np.array([graph.weights[label] for label in labels.tolist()], dtype=np.float64)
+    else:
+        if not np.issubdtype(labels.dtype, np.integer):
+            raise ValueError(f'Weights given as a sequence require vertices numbered with integers, but the graph has '
+                             f'vertices of type {labels.dtype}')
+        if labels[0] < 0 or labels[-1] >= len(graph.weights):
+            raise ValueError(f'Weights are given for vertices 0..{len(graph.weights) - 1}, but the graph has vertices '
+                             f'{labels[0]}..{labels[-1]}')
+        weights = np.asarray(graph.weights, dtype=np.float64)[labels]
+    if (weights < 0).any():
+        raise ValueError('Weights of vertices must be non-negative')
+
+    residual = weights.tolist()
+    lower_bound = 0
+    for u, v in edge_array.tolist():
+        if u == v:
+            # A loop is covered only by its vertex - it pays the whole residual weight once and the vertex is tight
+            lower_bound += residual[u]
+            residual[u] = 0
+            continue
+        price = min(residual[u], residual[v])
+        if price > 0:
+            residual[u] -= price
+            residual[v] -= price
+            lower_bound += price
+    tight = np.array(residual) <= 0
+    return set(labels[tight].tolist()), float(weights[tight].sum()), float(lower_bound)
+
+
+def benchmark_vertex_cover(edges_counts=(1000, 2000, 4000, 8000), seed: int = 0):
+    """
+    Comparison of approx_vertex_cover and linear_vertex_cover on random graphs with n = m / 4 vertices.
+    :return: List of dictionaries with number of edges, times [s] and sizes of covers
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for edges_count in edges_counts:
+        edges = [tuple(e) for e in rng.integers(0, max(edges_count // 4, 2), size=(edges_count, 2)).tolist()]
+        graph = Graph(edges=edges)
+        result = {'edges': edges_count}
+        for name, function in (('approx_vertex_cover', approx_vertex_cover), ('linear_vertex_cover',
+                                                                               linear_vertex_cover)):
+            random.seed(seed)
+            start = time.perf_counter()
+            cover = function(graph)
+            result[name] = time.perf_counter() - start
+            result[name + '_size'] = len(cover)
+        results.append(result)
+    return results
+
+
 if __name__ == '__main__':
     edges = [(0, 1), (0, 3), (0, 4),
              (1, 4), (1, 5), (1, 2),
@@ -51,3 +188,12 @@ if __name__ == '__main__':
 
     graph = Graph(edges=edges)
     print(approx_vertex_cover(graph))
+    print(linear_vertex_cover(graph, seed=0))
+
+    weights = {vertex: 1 + 7 * vertex % 5 for vertex in range(9)}
+    cover, weight, lower_bound = weighted_vertex_cover(Graph(edges=edges, weights=weights))
+    print(f'{cover}, weight: {weight}, lower bound: {lower_bound}')
+
+    for result in benchmark_vertex_cover():
+        print('edges: {edges}, approx_vertex_cover: {approx_vertex_cover:.4f} s ({approx_vertex_cover_size}), '
+              'linear_vertex_cover: {linear_vertex_cover:.4f} s ({linear_vertex_cover_size})'.format(**result))